@@ -8,10 +8,21 @@ Version: 1.1.0 - Added live charts and improved error handling
 
 import streamlit as st
 import requests
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
+import os
 import time
-from data_fetcher import get_bitcoin_data, get_current_bitcoin_price
+from data_fetcher import get_bitcoin_data, get_current_bitcoin_price, price_cache, kline_flight, CRYPTOCOMPARE_MAX_LIMIT
+from http_client import http_get
+from kline_stream import KlineStream
+from circuit_breaker import breaker_status
+from chart_warmer import ChartWarmer
+from health_monitor import HealthMonitor
+from chart_lod import LOD_MAX_BARS
+from chart_payload import measure_payload
+from price_chart import INDICATOR_TRACE_COLUMNS, create_price_chart, chart_fingerprint, update_last_candle
+from forecast_client import PredictionWorker
+from usage_tracker import UsageTracker
+from perf_trace import span, annotate, begin_rerun, end_rerun, current_rerun, histograms
 
 # Page config
 st.set_page_config(
@@ -21,21 +32,39 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Collect timing spans for this script run (see render_perf_panel)
+begin_rerun()
+
 # Constants
-API_URL = "https://btc-forecast-api.onrender.com"  # Your deployed Render API
+API_URL = os.getenv("FORECAST_API_URL", "https://btc-forecast-api.onrender.com").rstrip('/')  # Your deployed Render API
 CONTACT_EMAIL = "kevinroymaglaqui29@gmail.com"
+CHART_INTERVALS = ["1m", "5m", "15m", "1h", "4h"]
+CHART_LIMIT = 60
+# Every racing chart source can serve these (CryptoCompare histo stops at CRYPTOCOMPARE_MAX_LIMIT)
+CHART_HISTORY_OPTIONS = [60, 500, 1000, CRYPTOCOMPARE_MAX_LIMIT]
+GRID_SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT"]
+GRID_INTERVALS = ["1m", "5m", "15m", "1h"]
+KLINE_STREAM_ENABLED = os.getenv("KLINE_STREAM_ENABLED", "1") == "1"
+CHART_WARMER_ENABLED = os.getenv("CHART_WARMER_ENABLED", "1") == "1"
+PERF_PANEL_ENABLED = os.getenv("PERF_PANEL", "0") == "1"
 
 # Initialize session state
 if 'predictions_history' not in st.session_state:
     st.session_state.predictions_history = []
 if 'latest_prediction' not in st.session_state:
     st.session_state.latest_prediction = None
+if 'pending_prediction' not in st.session_state:
+    st.session_state.pending_prediction = None
+if 'last_prediction_outcome' not in st.session_state:
+    st.session_state.last_prediction_outcome = None
+if 'pending_batch' not in st.session_state:
+    st.session_state.pending_batch = None
+if 'batch_results' not in st.session_state:
+    st.session_state.batch_results = None
 if 'api_key' not in st.session_state:
     st.session_state.api_key = None
 if 'guest_usage_count' not in st.session_state:
     st.session_state.guest_usage_count = 0
-if 'usage_info' not in st.session_state:
-    st.session_state.usage_info = None
 if 'api_wake_log' not in st.session_state:
     st.session_state.api_wake_log = []
 if 'last_wake_attempt' not in st.session_state:
@@ -45,25 +74,17 @@ if 'wake_cooldown' not in st.session_state:
 
 
 # API Functions - Define early so they can be used anywhere
-def get_api_headers():
-    """Get headers with API key if available"""
-    headers = {"Content-Type": "application/json"}
-    if st.session_state.api_key:
-        headers["Authorization"] = f"Bearer {st.session_state.api_key}"
-    return headers
+@st.cache_resource
+def get_health_monitor():
+    """Start one background /health prober per process"""
+    return HealthMonitor(API_URL).start()
 
 def check_api_health():
-    try:
-        response = requests.get(f"{API_URL}/health", timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data
-    except requests.exceptions.Timeout:
-        return {"error": "API timeout - server may be slow or unavailable"}
-    except requests.exceptions.ConnectionError:
-        return {"error": "Cannot connect to API - check your internet connection"}
-    except Exception as e:
-        return {"error": f"API health check failed: {str(e)}"}
+    """Last known API health from the background monitor (None until the first probe finishes)"""
+    with span("check_api_health", source="health_monitor") as health_span:
+        result = get_health_monitor().last_result()
+        health_span.set(cache="hit" if result is not None else "miss")
+        return result
 
 def wake_api(max_retries: int = 3, base_delay: float = 2.0):
     """Attempt to wake the Render free-tier API by pinging /health multiple times.
@@ -82,12 +103,13 @@ def wake_api(max_retries: int = 3, base_delay: float = 2.0):
         try:
             start = time.time()
             timeout = 5 + attempt * 3  # progressively longer
-            r = requests.get(f"{API_URL}/health", timeout=timeout)
+            r = http_get(f"{API_URL}/health", timeout=timeout)
             elapsed = time.time() - start
             if r.status_code == 200:
                 data = r.json()
                 log.append(f"Attempt {attempt}: ✅ 200 OK in {elapsed:.2f}s (model_loaded={data.get('model_loaded')})")
                 st.session_state.api_wake_log = log
+                get_health_monitor().probe_now()
                 return {"status": "awake", "log": log, "model_loaded": data.get('model_loaded')}
             else:
                 log.append(f"Attempt {attempt}: ⚠️ {r.status_code} {r.text[:60]}")
@@ -100,23 +122,21 @@ def wake_api(max_retries: int = 3, base_delay: float = 2.0):
     st.session_state.api_wake_log = log
     return {"status": "failed", "log": log}
 
+@st.cache_resource
+def get_usage_tracker():
+    """One per-key usage cache per process"""
+    return UsageTracker(API_URL)
+
 def get_usage_info():
-    """Get current API usage information"""
-    try:
-        headers = {}
-        if st.session_state.api_key:
-            headers["Authorization"] = f"Bearer {st.session_state.api_key}"
-        response = requests.get(f"{API_URL}/api-keys/usage", headers=headers, timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except:
-        return None
+    """Get current API usage information (cached per key, reconciled in the background)"""
+    with span("get_usage_info", cache="hit", source="usage_tracker"):
+        return get_usage_tracker().get(st.session_state.api_key)
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_model_info():
+def fetch_model_info():
+    annotate(cache="miss")
     try:
-        response = requests.get(f"{API_URL}/model/info", timeout=15)
+        response = http_get(f"{API_URL}/model/info", endpoint="forecast.model_info")
         response.raise_for_status()
         return response.json()
     except requests.exceptions.Timeout:
@@ -126,68 +146,45 @@ def get_model_info():
     except Exception as e:
         return {"error": f"Failed to get model info: {str(e)}"}
 
-def make_prediction(symbol="BTCUSDT", interval="1m", use_v1_1=True):
-    try:
-        headers = get_api_headers()
-        
-        # Use v1.1 endpoint for enriched response, fallback to v1.0 if it fails
-        endpoint = "/v1.1/predict" if use_v1_1 else "/predict"
-        
-        response = requests.post(
-            f"{API_URL}{endpoint}",
-            json={
-                "symbol": symbol,
-                "interval": interval,
-                "use_live_data": True
-            },
-            headers=headers,
-            timeout=45
-        )
-        
-        # If v1.1 fails with validation error, try v1.0 fallback
-        if response.status_code == 500 and use_v1_1 and 'validation error' in response.text.lower():
-            st.warning("⚠️ v1.1 endpoint has a bug, falling back to v1.0...")
-            return make_prediction(symbol, interval, use_v1_1=False)
-        
-        # Check if this was a guest request (no API key)
-        # Backend increments guest usage automatically, so we track it here too
-        if not st.session_state.api_key:
-            # Only increment on success or rate limit (403)
-            if response.status_code in [200, 403]:
-                st.session_state.guest_usage_count += 1
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        # Refresh usage info after successful prediction
-        if st.session_state.api_key:
-            updated_usage = get_usage_info()
-            if updated_usage:
-                st.session_state.usage_info = updated_usage
-        
-        return result
+def get_model_info():
+    """Model info from the forecast API (cached for 5 minutes)"""
+    with span("get_model_info", cache="hit", source="forecast_api") as info_span:
+        info = fetch_model_info()
+        if 'error' in info:
+            info_span.set(error=info['error'][:80])
+        return info
+
+def apply_prediction_outcome(result, meta):
+    """Apply a finished prediction request to the session (guest count, usage, history)"""
+    if meta.get('guest_counted'):
+        st.session_state.guest_usage_count += 1
+    if result.get('guest_limit'):
+        st.session_state.guest_usage_count = 3  # Sync guest count
+    
+    if 'error' not in result:
+        st.session_state.predictions_history.append(result)
+        st.session_state.latest_prediction = result
         
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 429:
-            error_data = e.response.json() if e.response.headers.get('content-type') == 'application/json' else {}
-            return {"error": error_data.get('detail', 'Rate limit exceeded'), "rate_limit": True}
-        elif e.response.status_code == 403:
-            error_data = e.response.json() if e.response.headers.get('content-type') == 'application/json' else {}
-            error_msg = error_data.get('detail', 'Access denied')
-            # Check if it's guest limit or auth error
-            if 'Free trial limit' in error_msg or 'free predictions' in error_msg.lower():
-                st.session_state.guest_usage_count = 3  # Sync guest count
-                return {"error": error_msg, "guest_limit": True}
-            return {"error": error_msg, "auth_error": True}
-        elif e.response.status_code == 401:
-            return {"error": "Invalid API key", "auth_error": True}
-        return {"error": f"HTTP error: {e.response.status_code} - {e.response.text}"}
-    except requests.exceptions.Timeout:
-        return {"error": "Prediction timeout - API is taking too long to respond"}
-    except requests.exceptions.ConnectionError:
-        return {"error": "Cannot connect to API for prediction"}
-    except Exception as e:
-        return {"error": f"Prediction failed: {str(e)}"}
+        # Count the call locally; the tracker reconciles with the server later
+        if st.session_state.api_key and not meta.get('cached'):
+            get_usage_tracker().record_prediction(st.session_state.api_key, meta.get('quota'))
+    
+    st.session_state.last_prediction_outcome = (result, meta)
+
+@st.cache_resource
+def get_prediction_worker():
+    """One prediction thread pool (and candle-keyed result cache) per process"""
+    return PredictionWorker(API_URL)
+
+def submit_prediction(symbol="BTCUSDT", interval="1m", use_v1_1=True):
+    """Start a prediction in the background and keep its handle in the session"""
+    st.session_state.pending_prediction = get_prediction_worker().submit(
+        api_key=st.session_state.api_key,
+        symbol=symbol,
+        interval=interval,
+        use_v1_1=use_v1_1
+    )
+    st.session_state.last_prediction_outcome = None
 
 def get_model_age_warning():
     try:
@@ -219,247 +216,335 @@ def get_model_age_warning():
     except Exception as e:
         return f"Unable to verify model freshness. Contact support for current model status."
 
+# Prediction display functions
+def render_prediction_outcome(result, meta):
+    """Render a finished prediction (card, probabilities, reasoning) or its error"""
+    if meta.get('fell_back'):
+        st.warning("⚠️ v1.1 endpoint has a bug, fell back to v1.0")
+    
+    if 'error' in result:
+        if result.get('guest_limit') or result.get('auth_error'):
+            st.error(f"🔑 {result['error']}")
+            st.info("📧 Email **kevinroymaglaqui29@gmail.com** for API key")
+        elif result.get('rate_limit'):
+            st.error(f"⏱️ {result['error']}")
+        else:
+            st.error(f"❌ {result['error']}")
+    else:
+        st.markdown("---")
+        
+        # Check if v1.1 enriched
+        has_enriched = 'suggestion' in result and 'trend' in result
+        
+        if has_enriched:
+            suggestion = result.get('suggestion', {})
+            trend = result.get('trend', {})
+            tags = result.get('tags', [])
+            
+            # Determine color
+            action = suggestion.get('action', 'HOLD')
+            if action == 'BUY':
+                card_gradient = "linear-gradient(135deg, #10b981 0%, #059669 100%)"
+                indicator = "🟢"
+            elif action == 'SELL':
+                card_gradient = "linear-gradient(135deg, #ef4444 0%, #dc2626 100%)"
+                indicator = "🔴"
+            else:
+                card_gradient = "linear-gradient(135deg, #f59e0b 0%, #d97706 100%)"
+                indicator = "🟡"
+            
+            # Clean prediction card
+            st.markdown(f"""
+            <div style="background: {card_gradient}; 
+                        padding: 30px; border-radius: 16px; color: white; text-align: center;
+                        box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);">
+                <h1 style="margin: 0;">{indicator} {action}</h1>
+                <h3 style="margin: 12px 0;">Confidence: {result['confidence']:.1%} | Conviction: {suggestion.get('conviction', 'N/A')}</h3>
+                <p style="font-size: 20px; margin: 8px 0;">Current Price: ${result['current_price']:,.2f}</p>
+                <p style="font-size: 14px; opacity: 0.9; margin: 4px 0;">
+                    Trend: {trend.get('short_term', 'N/A')} (short) • {trend.get('long_term', 'N/A')} (long) • {trend.get('strength', 'N/A')}
+                </p>
+                <p style="font-size: 12px; opacity: 0.8;">Risk: {suggestion.get('risk_level', 'N/A')}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Tags
+            if tags:
+                st.markdown("<br>", unsafe_allow_html=True)
+                tag_html = " ".join([f'<span style="background: #3b82f6; color: white; padding: 6px 14px; border-radius: 12px; font-size: 12px; margin: 3px; display: inline-block;">{tag}</span>' for tag in tags])
+                st.markdown(f'<div style="text-align: center;">{tag_html}</div>', unsafe_allow_html=True)
+            
+            # Probabilities - compact
+            st.markdown("<br>", unsafe_allow_html=True)
+            prob_col1, prob_col2, prob_col3 = st.columns(3)
+            with prob_col1:
+                st.metric("No Move", f"{result['probabilities'].get('no_movement', 0):.0%}")
+            with prob_col2:
+                st.metric("⬆ Up", f"{result['probabilities'].get('large_up', 0):.0%}")
+            with prob_col3:
+                st.metric("⬇ Down", f"{result['probabilities'].get('large_down', 0):.0%}")
+            
+            # Reasoning - collapsible
+            with st.expander("💡 View AI Reasoning", expanded=False):
+                reasoning = suggestion.get('reasoning', [])
+                if reasoning:
+                    for i, reason in enumerate(reasoning, 1):
+                        st.markdown(f"{i}. {reason}")
+                
+                # Score breakdown
+                st.markdown("---")
+                st.markdown("**Score Breakdown:**")
+                breakdown = suggestion.get('score_breakdown', {})
+                col_s1, col_s2, col_s3 = st.columns(3)
+                with col_s1:
+                    st.metric("Confidence", f"{breakdown.get('confidence_boost', 0):.2f}")
+                with col_s2:
+                    st.metric("Trend", f"{breakdown.get('trend_score', 0):.2f}")
+                with col_s3:
+                    st.metric("Total", f"{breakdown.get('total_score', 0):.2f}")
+        
+        else:
+            # v1.0 fallback
+            label = result['prediction_label']
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #1f2937 0%, #374151 100%); 
+                        padding: 30px; border-radius: 16px; color: white; text-align: center;
+                        box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);">
+                <h1>{label}</h1>
+                <h3>Confidence: {result['confidence']:.1%}</h3>
+                <p style="font-size: 20px;">Price: ${result['current_price']:,.2f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.success("✅ Prediction generated! Scroll down to see it overlaid on the live chart.")
+        
+        if meta.get('cached') and meta.get('cached_at'):
+            cached_at = datetime.fromtimestamp(meta['cached_at']).strftime('%H:%M:%S')
+            st.caption(f"🗄️ Cached at {cached_at} for the current candle - a fresh prediction is made when the next candle opens")
+
+@st.fragment(run_every=1.0)
+def prediction_progress():
+    """Poll the pending prediction; reruns on its own every second until it finishes"""
+    pending = st.session_state.pending_prediction
+    if pending is None:
+        return
+    
+    if not pending['future'].done():
+        elapsed = time.time() - pending['submitted_at']
+        st.info(f"🤖 Analyzing market data... ({elapsed:.0f}s)")
+        if elapsed > 15:
+            st.caption("The API may be waking up from a cold start. The chart below stays live meanwhile.")
+        return
+    
+    result, meta = pending['future'].result()
+    st.session_state.pending_prediction = None
+    apply_prediction_outcome(result, meta)
+    # Full rerun so the chart picks up the new prediction overlay
+    st.rerun()
+
+def render_prediction_grid(results):
+    """Render a batch prediction table as one symbol x interval grid plus its errors"""
+    def cell(row):
+        if row['status'] != 'ok':
+            return "❌"
+        icon = {"BUY": "🟢", "SELL": "🔴", "HOLD": "🟡"}.get(row['signal'], "⚪")
+        return f"{icon} {row['signal']} {row['confidence']:.0%}"
+    
+    grid = results.assign(cell=results.apply(cell, axis=1)).pivot(index='symbol', columns='interval', values='cell')
+    grid = grid.reindex(index=results['symbol'].unique(), columns=results['interval'].unique())
+    st.dataframe(grid, use_container_width=True)
+    
+    ok = int((results['status'] == 'ok').sum())
+    st.caption(f"{ok}/{len(results)} predictions · {int(results['cached'].sum())} cached · "
+               f"slowest {results['seconds'].max():.1f}s")
+    errors = results[results['status'] != 'ok']
+    if not errors.empty:
+        with st.expander(f"⚠️ {len(errors)} failed", expanded=False):
+            st.dataframe(errors[['symbol', 'interval', 'attempts', 'error']], use_container_width=True, hide_index=True)
+
+@st.fragment(run_every=1.0)
+def batch_progress():
+    """Poll the pending prediction grid; reruns on its own every second until it finishes"""
+    pending = st.session_state.pending_batch
+    if pending is None:
+        return
+    
+    if not pending['future'].done():
+        st.info(f"🧮 Running {pending['pairs']} predictions... ({time.time() - pending['submitted_at']:.0f}s)")
+        return
+    
+    try:
+        st.session_state.batch_results = pending['future'].result()
+        results = st.session_state.batch_results
+        served = int(((results['status'] == 'ok') & ~results['cached']).sum())
+        if served:
+            get_usage_tracker().record_prediction(st.session_state.api_key, count=served)
+    except Exception as e:
+        st.session_state.batch_results = None
+        st.error(f"❌ Prediction grid failed: {str(e)}")
+    st.session_state.pending_batch = None
+    st.rerun()
+
 # Chart creation functions
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def fetch_chart_data(interval="5m", limit=60):
-    """Fetch data for the startup chart"""
+    """Fetch data for the startup chart; returns (df, source) or (None, error message)"""
+    annotate(cache="miss")
     try:
         df = get_bitcoin_data(interval=interval, limit=limit, with_indicators=True)
-        return df, "success"
+        return df, df.attrs.get('source', 'Binance')
     except Exception as e:
         error_msg = str(e)
         return None, error_msg
 
-def create_price_chart(df, show_indicators=True, data_source="Binance", prediction_result=None):
-    """Create an interactive price chart with technical indicators and optional prediction overlay"""
-    fig = go.Figure()
+@st.cache_resource
+def get_kline_stream():
+    """Start one live kline stream per process (None if streaming is unavailable)"""
+    if not KLINE_STREAM_ENABLED:
+        return None
+    try:
+        return KlineStream(symbol="BTCUSDT", intervals=CHART_INTERVALS, history=500).start()
+    except Exception as e:
+        print(f"Live kline stream disabled: {e}")
+        return None
+
+def get_live_chart_data(interval="5m", limit=60):
+    """Chart data from the live stream, or None if the stream has no data yet"""
+    stream = get_kline_stream()
+    if stream is None or not stream.is_ready(interval, min_candles=limit):
+        return None
+    # Indicators are maintained incrementally by the stream, no recomputation needed
+    return stream.frame(interval, limit, with_indicators=True)
+
+@st.cache_resource
+def get_chart_warmer():
+    """Start one background refresher for every chart timeframe per process"""
+    if not CHART_WARMER_ENABLED:
+        return None
+    stream = get_kline_stream()
     
-    # Candlestick chart
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
-        name='BTC Price',
-        increasing_line_color='#10b981',
-        decreasing_line_color='#ef4444'
-    ))
+    def stream_covers(interval, limit):
+        # The live stream already keeps this interval current while it is healthy
+        return stream is not None and stream.is_ready(interval, min_candles=limit)
     
-    if show_indicators and 'SMA_20' in df.columns:
-        # Add moving averages
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['SMA_20'],
-            mode='lines',
-            name='SMA 20',
-            line=dict(color='#3b82f6', width=1.5),
-            opacity=0.7
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['SMA_50'],
-            mode='lines',
-            name='SMA 50',
-            line=dict(color='#f59e0b', width=1.5),
-            opacity=0.7
-        ))
+    return ChartWarmer(intervals=CHART_INTERVALS, limit=CHART_LIMIT, max_limit=max(CHART_HISTORY_OPTIONS),
+                       skip=stream_covers).start()
+
+def load_chart_data(interval="5m", limit=60):
+    """Chart data from the fastest available path: live stream, warm cache, then REST"""
+    with span("load_chart_data", interval=interval, limit=limit, cache="hit") as load_span:
+        chart_data = get_live_chart_data(interval=interval, limit=limit)
+        if chart_data is not None:
+            load_span.set(path="stream", source="live")
+            return chart_data, "live"
+        warmer = get_chart_warmer()
+        if warmer is not None:
+            chart_data = warmer.get(interval, limit)
+            if chart_data is not None:
+                source = chart_data.attrs.get('source', 'Binance')
+                load_span.set(path="warmer", source=source)
+                return chart_data, source
+        with span("fetch_chart_data", cache="hit") as fetch_span:
+            chart_data, status = fetch_chart_data(interval=interval, limit=limit)
+            if chart_data is None:
+                fetch_span.set(error=status[:80])
+            else:
+                fetch_span.set(source=status)
+        load_span.set(path="rest", cache=fetch_span.attrs['cache'], source=fetch_span.attrs.get('source'))
+        return chart_data, status
+
+def get_price_chart(df, show_indicators=True, data_source="Binance", prediction_result=None):
+    """
+    create_price_chart with a per-session figure cache
+    
+    The cached figure is reused as-is when the candles and prediction are
+    unchanged, and patched in place when only the last candle moved. The
+    encoded payload size is measured only when the figure is rebuilt (a
+    second full encode on every patch would cost as much as the patch
+    saves); hit and patch reruns report the last measurement.
+    """
+    with span("get_price_chart", candles=len(df)) as chart_span:
+        cache = st.session_state.get('price_chart_cache')
+        fingerprint = chart_fingerprint(df)
+        settings = (show_indicators, data_source)
         
-        # Add Bollinger Bands
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['BB_upper'],
-            mode='lines',
-            name='BB Upper',
-            line=dict(color='#8b5cf6', width=1, dash='dash'),
-            opacity=0.5
-        ))
+        if cache and cache['settings'] == settings and cache['prediction'] is prediction_result:
+            if cache['fingerprint'] == fingerprint:
+                chart_span.set(cache="hit")
+                return cache['fig']
+            # Same candles (by open time), only the forming one changed
+            if cache['fingerprint'][:3] == fingerprint[:3]:
+                chart_span.set(cache="patch")
+                update_last_candle(cache['fig'], df, cache['n_base'], prediction_result)
+                cache['fingerprint'] = fingerprint
+                # A patch keeps the array lengths, so the last measurement still holds
+                return cache['fig']
         
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['BB_lower'],
-            mode='lines',
-            name='BB Lower',
-            line=dict(color='#8b5cf6', width=1, dash='dash'),
-            opacity=0.5,
-            fill='tonexty',
-            fillcolor='rgba(139, 92, 246, 0.1)'
-        ))
-    
-    # Add prediction overlay if provided
-    if prediction_result:
-        # Determine color and name based on prediction
-        suggestion = prediction_result.get('suggestion', {})
-        action = suggestion.get('action', None)
+        chart_span.set(cache="miss")
+        with span("create_price_chart", candles=len(df)):
+            fig = create_price_chart(df, show_indicators=show_indicators, data_source=data_source,
+                                     prediction_result=prediction_result)
+        n_base = 1 + (len(INDICATOR_TRACE_COLUMNS) if show_indicators and 'SMA_20' in df.columns else 0)
+        with span("measure_payload"):
+            payload = measure_payload(fig)
+        st.session_state.price_chart_cache = {
+            'fig': fig,
+            'fingerprint': fingerprint,
+            'settings': settings,
+            # Held by reference so the identity check stays valid
+            'prediction': prediction_result,
+            'n_base': n_base,
+            'payload': payload
+        }
+        return fig
+
+def render_perf_panel():
+    """Timing spans of this rerun and per-process stage histograms"""
+    rerun = current_rerun()
+    with st.expander("⏱️ Performance", expanded=False):
+        if rerun is None:
+            st.caption("Tracing is disabled (PERF_TRACE_ENABLED=0)")
+            return
         
-        if action == 'BUY':
-            pred_color = '#10b981'  # Green
-            pred_name = '▲ AI Prediction: BUY Signal'
-            pred_symbol = 'triangle-up'
-        elif action == 'SELL':
-            pred_color = '#ef4444'  # Red
-            pred_name = '▼ AI Prediction: SELL Signal'
-            pred_symbol = 'triangle-down'
-        elif action == 'HOLD':
-            pred_color = '#f59e0b'  # Orange
-            pred_name = '◯ AI Prediction: HOLD'
-            pred_symbol = 'diamond'
-        else:
-            # Fallback to legacy prediction_label
-            pred_label = prediction_result.get('prediction_label', '')
-            if 'Upward' in pred_label:
-                pred_color = '#10b981'
-                pred_name = '▲ AI Prediction: Upward'
-                pred_symbol = 'triangle-up'
-            elif 'Downward' in pred_label:
-                pred_color = '#ef4444'
-                pred_name = '▼ AI Prediction: Downward'
-                pred_symbol = 'triangle-down'
-            else:
-                pred_color = '#6b7280'
-                pred_name = '◯ AI Prediction: Neutral'
-                pred_symbol = 'circle'
+        st.caption(f"Rerun #{rerun.id} · {rerun.elapsed_ms():,.0f} ms so far")
+        st.dataframe([
+            {
+                'stage': "· " * s.depth + s.name,
+                'ms': round(s.duration_ms, 1),
+                'cache': s.attrs.get('cache', ''),
+                'source': s.attrs.get('source', '') or '',
+                'error': s.attrs.get('error', '')
+            }
+            for s in sorted(rerun.spans, key=lambda s: s.start)
+        ], hide_index=True, use_container_width=True)
         
-        # Build hover text
-        hover_extra = f"<br>Confidence: {prediction_result.get('confidence', 0):.1%}"
-        if suggestion:
-            hover_extra += f"<br>Action: {action} ({suggestion.get('conviction', 'N/A')})"
-            hover_extra += f"<br>Risk: {suggestion.get('risk_level', 'N/A')}"
-        trend = prediction_result.get('trend', {})
-        if trend:
-            hover_extra += f"<br>Trend: {trend.get('short_term', 'N/A')} / {trend.get('long_term', 'N/A')}"
+        st.markdown("**This process (all sessions):**")
+        st.dataframe([
+            {
+                'stage': row['name'],
+                'count': row['count'],
+                'p50 ms': round(row['p50_ms'], 1),
+                'p90 ms': round(row['p90_ms'], 1),
+                'p99 ms': round(row['p99_ms'], 1),
+                'max ms': round(row['max_ms'], 1),
+                'cache': ", ".join(f"{k} {v}" for k, v in row['cache'].items()),
+                'source': ", ".join(f"{k} {v}" for k, v in row['source'].items())
+            }
+            for row in histograms()
+        ], hide_index=True, use_container_width=True)
         
-        # Check if we have next_periods for full overlay
-        if 'next_periods' in prediction_result:
-            # FULL OVERLAY WITH PROJECTION LINE
-            current_price = prediction_result['current_price']
-            last_time = df.index[-1]
-            
-            # Calculate average time interval
-            if len(df) >= 2:
-                time_intervals = [(df.index[i] - df.index[i-1]) for i in range(1, min(6, len(df)))]
-                avg_interval = sum(time_intervals, timedelta(0)) / len(time_intervals)
-            else:
-                avg_interval = timedelta(minutes=5)
-            
-            # Get the last closing price from the chart
-            last_chart_price = float(df['close'].iloc[-1])
-            
-            # Create prediction line starting from the last chart point
-            prediction_times = [last_time]
-            prediction_prices = [last_chart_price]
-            
-            # Add predicted future points
-            for period in prediction_result['next_periods']:
-                future_time = last_time + (avg_interval * period['period'])
-                prediction_times.append(future_time)
-                prediction_prices.append(period['estimated_price'])
-            
-            # Add prediction line
-            fig.add_trace(go.Scatter(
-                x=prediction_times,
-                y=prediction_prices,
-                mode='lines+markers',
-                name=pred_name,
-                line=dict(color=pred_color, width=3, dash='dash'),
-                marker=dict(size=10, symbol='star', color=pred_color),
-                opacity=0.9,
-                hovertemplate=f'<b>Predicted Price</b><br>$%{{y:,.2f}}<br>%{{x}}{hover_extra}<extra></extra>'
-            ))
-            
-            # Add confidence band
-            confidence = prediction_result.get('confidence', 0)
-            upper_band = [p * (1 + (1 - confidence) * 0.02) for p in prediction_prices]
-            lower_band = [p * (1 - (1 - confidence) * 0.02) for p in prediction_prices]
-            
-            fig.add_trace(go.Scatter(
-                x=prediction_times,
-                y=upper_band,
-                mode='lines',
-                name='Confidence Upper',
-                line=dict(width=0),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=prediction_times,
-                y=lower_band,
-                mode='lines',
-                name='Confidence Lower',
-                line=dict(width=0),
-                fill='tonexty',
-                fillcolor=f'rgba({"16, 185, 129" if pred_color == "#10b981" else "239, 68, 68" if pred_color == "#ef4444" else "245, 158, 11" if pred_color == "#f59e0b" else "107, 114, 128"}, 0.1)',
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-        else:
-            # SIMPLE OVERLAY - Just show marker at current price point
-            last_time = df.index[-1]
-            last_price = float(df['close'].iloc[-1])
-            
-            # Add a single marker showing the prediction
-            fig.add_trace(go.Scatter(
-                x=[last_time],
-                y=[last_price],
-                mode='markers',
-                name=pred_name,
-                marker=dict(
-                    size=20,
-                    symbol=pred_symbol,
-                    color=pred_color,
-                    line=dict(width=2, color='white')
-                ),
-                opacity=0.9,
-                hovertemplate=f'<b>AI Prediction</b><br>${{y:,.2f}}<br>{{x}}{hover_extra}<extra></extra>'
-            ))
-            
-            # Add annotation
-            fig.add_annotation(
-                x=last_time,
-                y=last_price,
-                text=f"{pred_name.split(':')[1].strip()}",
-                showarrow=True,
-                arrowhead=2,
-                arrowsize=1,
-                arrowwidth=2,
-                arrowcolor=pred_color,
-                ax=50,
-                ay=-40,
-                bgcolor=pred_color,
-                font=dict(color='white', size=12),
-                bordercolor='white',
-                borderwidth=2,
-                borderpad=4,
-                opacity=0.9
-            )
-    
-    # Dynamic title based on data source
-    chart_title = f'Bitcoin Price Chart - Live Data ({data_source})'
-    if prediction_result:
-        chart_title += ' with AI Prediction Overlay'
-    
-    # Update layout
-    fig.update_layout(
-        title={
-            'text': chart_title,
-            'x': 0.5,
-            'xanchor': 'center'
-        },
-        xaxis_title='Time',
-        yaxis_title='Price (USD)',
-        template='plotly_white',
-        hovermode='x unified',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#374151', size=12),
-        xaxis_rangeslider_visible=False,
-        height=500,
-        margin=dict(l=50, r=50, t=80, b=50)
-    )
-    
-    return fig
+        price_stats = price_cache.stats()
+        lookups = price_stats['hits'] + price_stats['misses']
+        hit_rate = f" ({price_stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+        st.caption(
+            f"Price cache: {price_stats['hits']} hits / {price_stats['misses']} misses{hit_rate}"
+            f" · {price_stats['fetches']} upstream fetches, {price_stats['coalesced']} coalesced"
+        )
+        flight_stats = kline_flight.stats()
+        st.caption(
+            f"Kline fetches: {flight_stats['executions']} executed, {flight_stats['coalesced']} coalesced"
+            f" into an in-flight request, {flight_stats['in_flight']} in flight now"
+        )
 
 # Custom CSS
 st.markdown("""
@@ -554,7 +639,42 @@ with st.sidebar:
         st.caption(api_status['error'])
     else:
         st.warning("**API Status Unknown**")
+    
+    health_snapshot = get_health_monitor().snapshot()
+    if health_snapshot['checked_at']:
+        st.caption(
+            f"Checked {time.time() - health_snapshot['checked_at']:.0f}s ago · "
+            f"{health_snapshot['latency']:.2f}s response"
+        )
+    else:
+        st.caption("First health check in progress...")
+    
+    latency_history = get_health_monitor().latency_history()
+    if len(latency_history) > 1:
+        with st.expander("📈 API Latency History", expanded=False):
+            st.line_chart(
+                {
+                    "Latency (s)": [probe['latency'] for probe in latency_history]
+                },
+                height=150
+            )
+            failed = sum(1 for probe in latency_history if not probe['healthy'])
+            st.caption(f"{len(latency_history)} probes · {failed} failed · "
+                       f"max {max(probe['latency'] for probe in latency_history):.1f}s")
 
+    # Market data source health (circuit breakers)
+    source_states = breaker_status()
+    if source_states:
+        with st.expander("📡 Market Data Sources", expanded=False):
+            state_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+            for source in source_states:
+                line = f"{state_icons.get(source['state'], '⚪')} **{source['name']}**: {source['state'].replace('_', '-')}"
+                if source['state'] == 'open':
+                    line += f" (retry in {source['retry_in']:.0f}s)"
+                st.markdown(line)
+                if source['state'] != 'closed' and source['last_error']:
+                    st.caption(source['last_error'][:120])
+    
     # Wake API helper (for cold starts on free tier)
     with st.expander("🚀 Wake / Restart API Helper", expanded=False):
         st.caption("Free-tier hosting can spin down when idle. Use this to 'warm' the API.")
@@ -648,8 +768,8 @@ with st.sidebar:
             with col1:
                 if st.button("✅ Activate", use_container_width=True, disabled=not api_key_input):
                     st.session_state.api_key = api_key_input.strip()
-                    # Verify the key
-                    usage = get_usage_info()
+                    # Verify the key against the server
+                    usage = get_usage_tracker().refresh(st.session_state.api_key)
                     if usage:
                         st.success("API key activated!")
                         st.rerun()
@@ -705,7 +825,7 @@ with main_col:
     health = check_api_health()
     
     if health is None:
-        st.error("**API Service Unavailable**")
+        st.info("**Checking API status...** This can take up to a minute after a cold start.")
     elif "error" in health:
         st.error(f"**API Error:** {health['error']}")
     elif not health.get('model_loaded', False):
@@ -734,7 +854,7 @@ with main_col:
                 "🔮 Predict", 
                 use_container_width=True, 
                 type="primary",
-                disabled=not can_predict
+                disabled=not can_predict or st.session_state.pending_prediction is not None
             )
         
         with btn_col2:
@@ -746,108 +866,37 @@ with main_col:
                     st.caption("👉 Enter API key in sidebar")
         
         if predict_btn:
-            with st.spinner("🤖 Analyzing market data..."):
-                result = make_prediction()
+            submit_prediction()
+        
+        if st.session_state.pending_prediction is not None:
+            prediction_progress()
+        elif st.session_state.last_prediction_outcome is not None:
+            render_prediction_outcome(*st.session_state.last_prediction_outcome)
+        
+        # Multi-symbol / multi-interval grid (API key holders only)
+        with st.expander("🧮 Prediction Grid", expanded=st.session_state.pending_batch is not None):
+            if not st.session_state.api_key:
+                st.caption("🔑 The prediction grid needs an API key - enter one in the sidebar.")
+            else:
+                grid_col1, grid_col2 = st.columns(2)
+                with grid_col1:
+                    grid_symbols = st.multiselect("Symbols", GRID_SYMBOLS, default=["BTCUSDT"])
+                with grid_col2:
+                    grid_intervals = st.multiselect("Intervals", GRID_INTERVALS, default=GRID_INTERVALS)
                 
-                if 'error' in result:
-                    if result.get('guest_limit') or result.get('auth_error'):
-                        st.error(f"🔑 {result['error']}")
-                        st.info("📧 Email **kevinroymaglaqui29@gmail.com** for API key")
-                    elif result.get('rate_limit'):
-                        st.error(f"⏱️ {result['error']}")
-                    else:
-                        st.error(f"❌ {result['error']}")
-                else:
-                    # Store prediction
-                    st.session_state.predictions_history.append(result)
-                    st.session_state.latest_prediction = result
-                    
-                    st.markdown("---")
-                    
-                    # Check if v1.1 enriched
-                    has_enriched = 'suggestion' in result and 'trend' in result
-                    
-                    if has_enriched:
-                        suggestion = result.get('suggestion', {})
-                        trend = result.get('trend', {})
-                        tags = result.get('tags', [])
-                        
-                        # Determine color
-                        action = suggestion.get('action', 'HOLD')
-                        if action == 'BUY':
-                            card_gradient = "linear-gradient(135deg, #10b981 0%, #059669 100%)"
-                            indicator = "🟢"
-                        elif action == 'SELL':
-                            card_gradient = "linear-gradient(135deg, #ef4444 0%, #dc2626 100%)"
-                            indicator = "🔴"
-                        else:
-                            card_gradient = "linear-gradient(135deg, #f59e0b 0%, #d97706 100%)"
-                            indicator = "🟡"
-                        
-                        # Clean prediction card
-                        st.markdown(f"""
-                        <div style="background: {card_gradient}; 
-                                    padding: 30px; border-radius: 16px; color: white; text-align: center;
-                                    box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);">
-                            <h1 style="margin: 0;">{indicator} {action}</h1>
-                            <h3 style="margin: 12px 0;">Confidence: {result['confidence']:.1%} | Conviction: {suggestion.get('conviction', 'N/A')}</h3>
-                            <p style="font-size: 20px; margin: 8px 0;">Current Price: ${result['current_price']:,.2f}</p>
-                            <p style="font-size: 14px; opacity: 0.9; margin: 4px 0;">
-                                Trend: {trend.get('short_term', 'N/A')} (short) • {trend.get('long_term', 'N/A')} (long) • {trend.get('strength', 'N/A')}
-                            </p>
-                            <p style="font-size: 12px; opacity: 0.8;">Risk: {suggestion.get('risk_level', 'N/A')}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Tags
-                        if tags:
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            tag_html = " ".join([f'<span style="background: #3b82f6; color: white; padding: 6px 14px; border-radius: 12px; font-size: 12px; margin: 3px; display: inline-block;">{tag}</span>' for tag in tags])
-                            st.markdown(f'<div style="text-align: center;">{tag_html}</div>', unsafe_allow_html=True)
-                        
-                        # Probabilities - compact
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        prob_col1, prob_col2, prob_col3 = st.columns(3)
-                        with prob_col1:
-                            st.metric("No Move", f"{result['probabilities'].get('no_movement', 0):.0%}")
-                        with prob_col2:
-                            st.metric("⬆ Up", f"{result['probabilities'].get('large_up', 0):.0%}")
-                        with prob_col3:
-                            st.metric("⬇ Down", f"{result['probabilities'].get('large_down', 0):.0%}")
-                        
-                        # Reasoning - collapsible
-                        with st.expander("💡 View AI Reasoning", expanded=False):
-                            reasoning = suggestion.get('reasoning', [])
-                            if reasoning:
-                                for i, reason in enumerate(reasoning, 1):
-                                    st.markdown(f"{i}. {reason}")
-                            
-                            # Score breakdown
-                            st.markdown("---")
-                            st.markdown("**Score Breakdown:**")
-                            breakdown = suggestion.get('score_breakdown', {})
-                            col_s1, col_s2, col_s3 = st.columns(3)
-                            with col_s1:
-                                st.metric("Confidence", f"{breakdown.get('confidence_boost', 0):.2f}")
-                            with col_s2:
-                                st.metric("Trend", f"{breakdown.get('trend_score', 0):.2f}")
-                            with col_s3:
-                                st.metric("Total", f"{breakdown.get('total_score', 0):.2f}")
-                    
-                    else:
-                        # v1.0 fallback
-                        label = result['prediction_label']
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #1f2937 0%, #374151 100%); 
-                                    padding: 30px; border-radius: 16px; color: white; text-align: center;
-                                    box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);">
-                            <h1>{label}</h1>
-                            <h3>Confidence: {result['confidence']:.1%}</h3>
-                            <p style="font-size: 20px;">Price: ${result['current_price']:,.2f}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.success("✅ Prediction generated! Scroll down to see it overlaid on the live chart.")
+                grid_btn = st.button(
+                    f"🧮 Predict {len(grid_symbols) * len(grid_intervals)} combinations",
+                    disabled=not grid_symbols or not grid_intervals or st.session_state.pending_batch is not None
+                )
+                if grid_btn:
+                    st.session_state.pending_batch = get_prediction_worker().submit_batch(
+                        st.session_state.api_key, grid_symbols, grid_intervals
+                    )
+                
+                if st.session_state.pending_batch is not None:
+                    batch_progress()
+                elif st.session_state.batch_results is not None:
+                    render_prediction_grid(st.session_state.batch_results)
     
     # CHART SECTION - BELOW PREDICTION
     st.markdown("---")
@@ -857,12 +906,18 @@ with main_col:
     price_available = False
     data_source = "Unknown"
     try:
-        with st.spinner("Fetching current Bitcoin price..."):
-            current_data = get_current_bitcoin_price()
+        with span("get_current_bitcoin_price", cache="hit") as price_span:
+            kline_stream = get_kline_stream()
+            if kline_stream is not None and kline_stream.connected and kline_stream.ticker:
+                current_data = kline_stream.ticker
+            else:
+                with st.spinner("Fetching current Bitcoin price..."):
+                    current_data = get_current_bitcoin_price()
             data_source = current_data.get('source', 'Binance')
+            price_span.set(source=data_source)
         
         # Show data source
-        if data_source != 'Binance':
+        if not data_source.startswith('Binance'):
             st.info(f"📊 **Data Source:** {data_source} (Binance unavailable in this region)")
         
         col_price1, col_price2, col_price3, col_price4 = st.columns(4)
@@ -887,26 +942,54 @@ with main_col:
     
     # Interactive chart with timeframe selector (only show if we can fetch data)
     if price_available:
-        chart_interval = st.selectbox(
-            "Select Timeframe",
-            options=["1m", "5m", "15m", "1h", "4h"],
-            index=1,  # Default to 5m
-            help="Choose the candlestick timeframe"
-        )
+        tf_col, history_col = st.columns(2)
+        with tf_col:
+            chart_interval = st.selectbox(
+                "Select Timeframe",
+                options=CHART_INTERVALS,
+                index=1,  # Default to 5m
+                help="Choose the candlestick timeframe"
+            )
+        with history_col:
+            chart_history = st.selectbox(
+                "History",
+                options=CHART_HISTORY_OPTIONS,
+                index=0,
+                format_func=lambda n: f"{n:,} candles",
+                help="Long histories are drawn with merged candles; zoom in for full detail"
+            )
         
         # Fetch and display chart
         with st.spinner("Loading chart data..."):
-            chart_data, status = fetch_chart_data(interval=chart_interval, limit=60)
+            chart_data, status = load_chart_data(interval=chart_interval, limit=chart_history)
             
             if chart_data is not None and not chart_data.empty:
-                # Determine data source from error message or default to Binance
-                chart_source = "CryptoCompare" if "CryptoCompare" in status or "Binance" in status else "Binance"
-                if "CryptoCompare" in status:
+                chart_shows_latest = True
+                loaded_rows = len(chart_data)
+                # Zoom control: Streamlit can't see Plotly zoom events, so the visible
+                # window is chosen here and re-rendered at full detail once it is small enough
+                if len(chart_data) > LOD_MAX_BARS:
+                    zoom_start, zoom_end = st.slider(
+                        "Visible range (% of history)",
+                        min_value=0,
+                        max_value=100,
+                        value=(0, 100),
+                        key="chart_zoom"
+                    )
+                    total = len(chart_data)
+                    chart_shows_latest = zoom_end == 100
+                    chart_data = chart_data.iloc[total * zoom_start // 100:max(total * zoom_end // 100, total * zoom_start // 100 + 2)]
+                    if len(chart_data) > LOD_MAX_BARS:
+                        st.caption(f"🔍 {len(chart_data):,} candles merged into ≤{LOD_MAX_BARS} bars - narrow the range for full detail")
+                
+                # On success the status is the source that served the candles
+                chart_source = "Binance (live)" if status == "live" else status
+                if chart_source == "CryptoCompare":
                     st.info("📊 **Chart Data:** Using CryptoCompare (Binance unavailable in this region)")
                 
                 # Show toggle for prediction overlay if prediction exists
                 prediction_to_show = None
-                if st.session_state.latest_prediction:
+                if st.session_state.latest_prediction and chart_shows_latest:
                     # Check if we have full overlay data (next_periods) or just simple marker
                     has_full_overlay = 'next_periods' in st.session_state.latest_prediction
                     overlay_type = "with projection line" if has_full_overlay else "with prediction marker"
@@ -920,10 +1003,15 @@ with main_col:
                         prediction_to_show = st.session_state.latest_prediction
                 
                 # Create chart with or without prediction overlay
-                chart = create_price_chart(chart_data, show_indicators=True, 
-                                          data_source=chart_source, 
-                                          prediction_result=prediction_to_show)
-                st.plotly_chart(chart, use_container_width=True)
+                chart = get_price_chart(chart_data, show_indicators=True, 
+                                        data_source=chart_source, 
+                                        prediction_result=prediction_to_show)
+                with span("st.plotly_chart"):
+                    st.plotly_chart(chart, use_container_width=True)
+                payload = st.session_state.price_chart_cache['payload']
+                st.caption(f"{loaded_rows:,} of {chart_history:,} candles from {chart_source} · "
+                           f"Chart payload {payload['bytes'] / 1024:,.1f} KB · encoded in "
+                           f"{payload['seconds'] * 1000:.1f} ms ({payload['engine']}, last rebuild)")
             else:
                 st.error(f"⚠️ **Unable to load chart data**")
                 st.caption(f"Error: {status[:200]}")
@@ -943,7 +1031,7 @@ with sidebar_col:
     
     # Refresh button
     if st.button("🔄 Refresh Model Info", key="refresh_model_info"):
-        get_model_info.clear()
+        fetch_model_info.clear()
         st.rerun()
     
     # Get model info
@@ -1102,3 +1190,9 @@ with demo_col2:
 # Footer
 st.markdown("---")
 st.caption("Built by Kevin Roy Maglaqui | Bitcoin AI Price Predictor v1.1")
+
+# Performance debug panel (PERF_PANEL=1 or ?perf=1)
+if PERF_PANEL_ENABLED or st.query_params.get("perf") == "1":
+    with st.sidebar:
+        render_perf_panel()
+end_rerun()
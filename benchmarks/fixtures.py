@@ -0,0 +1,265 @@
+"""
+Benchmark Fixtures Module
+Deterministic upstream payloads in the exact Binance, CryptoCompare and CoinGecko formats
+
+Fixtures are generated from a seeded random walk (or recorded from the live
+APIs with --record) and written to benchmarks/fixtures/ as raw JSON bodies,
+so the benchmarks replay byte-for-byte what the parsers see in production.
+
+Usage:
+    python -m benchmarks.fixtures            # generate synthetic fixtures
+    python -m benchmarks.fixtures --record   # record live payloads instead
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Largest candle series stored per source; smaller sizes are its last N rows
+MAX_CANDLES = 100_000
+SIZES = [60, 500, 1000, 100_000]
+
+SEED = 20251006
+START_MS = 1_700_000_040_000  # A minute boundary
+STEP_MS = 60_000
+START_PRICE = 37_000.0
+
+
+def candle_walk(count=MAX_CANDLES, seed=SEED, start_ms=START_MS, step_ms=STEP_MS, periodic=False):
+    """
+    Seeded 1m OHLCV random walk
+
+    With periodic=True the walk ends where it started, so it can be
+    repeated end to end without a price jump.
+
+    Returns:
+        dict of NumPy arrays: open_ms, open, high, low, close, volume, trades
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.0008, count)
+    if periodic:
+        returns -= returns.mean()
+    close = START_PRICE * np.exp(np.cumsum(returns))
+    open_ = np.concatenate([[START_PRICE], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0005, count)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.gamma(2.0, 8.0, count)
+    trades = rng.integers(200, 5000, count)
+    return {
+        'open_ms': start_ms + np.arange(count, dtype=np.int64) * step_ms,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+        'trades': trades
+    }
+
+
+def binance_klines(walk, step_ms=STEP_MS):
+    """Binance /api/v3/klines rows (prices as strings, like the real API)"""
+    rows = []
+    for i in range(len(walk['open_ms'])):
+        open_ms = int(walk['open_ms'][i])
+        volume = walk['volume'][i]
+        quote = volume * walk['close'][i]
+        rows.append([
+            open_ms,
+            f"{walk['open'][i]:.2f}",
+            f"{walk['high'][i]:.2f}",
+            f"{walk['low'][i]:.2f}",
+            f"{walk['close'][i]:.2f}",
+            f"{volume:.5f}",
+            open_ms + step_ms - 1,
+            f"{quote:.8f}",
+            int(walk['trades'][i]),
+            f"{volume * 0.52:.5f}",
+            f"{quote * 0.52:.8f}",
+            "0"
+        ])
+    return rows
+
+
+def cryptocompare_histo(walk):
+    """CryptoCompare /data/v2/histo* response body"""
+    candles = [
+        {
+            'time': int(walk['open_ms'][i] // 1000),
+            'high': round(float(walk['high'][i]), 2),
+            'low': round(float(walk['low'][i]), 2),
+            'open': round(float(walk['open'][i]), 2),
+            'volumefrom': round(float(walk['volume'][i]), 4),
+            'volumeto': round(float(walk['volume'][i] * walk['close'][i]), 2),
+            'close': round(float(walk['close'][i]), 2),
+            'conversionType': 'direct',
+            'conversionSymbol': ''
+        }
+        for i in range(len(walk['open_ms']))
+    ]
+    return {
+        'Response': 'Success',
+        'Message': '',
+        'HasWarning': False,
+        'Type': 100,
+        'RateLimit': {},
+        'Data': {
+            'Aggregated': False,
+            'TimeFrom': candles[0]['time'],
+            'TimeTo': candles[-1]['time'],
+            'Data': candles
+        }
+    }
+
+
+def ticker_stats(walk, window=1440):
+    """24h statistics over the last `window` candles of a walk"""
+    close = walk['close'][-window:]
+    return {
+        'last': float(close[-1]),
+        'open': float(walk['open'][-window]),
+        'high': float(walk['high'][-window:].max()),
+        'low': float(walk['low'][-window:].min()),
+        'volume': float(walk['volume'][-window:].sum())
+    }
+
+
+def binance_ticker(stats, symbol="BTCUSDT"):
+    """Binance /api/v3/ticker/24hr response body"""
+    change = stats['last'] - stats['open']
+    return {
+        'symbol': symbol,
+        'priceChange': f"{change:.2f}",
+        'priceChangePercent': f"{change / stats['open'] * 100:.3f}",
+        'weightedAvgPrice': f"{(stats['high'] + stats['low']) / 2:.2f}",
+        'lastPrice': f"{stats['last']:.2f}",
+        'openPrice': f"{stats['open']:.2f}",
+        'highPrice': f"{stats['high']:.2f}",
+        'lowPrice': f"{stats['low']:.2f}",
+        'volume': f"{stats['volume']:.5f}",
+        'quoteVolume': f"{stats['volume'] * stats['last']:.2f}",
+        'count': 1_250_000
+    }
+
+
+def coingecko_price(stats):
+    """CoinGecko /api/v3/simple/price response body"""
+    return {
+        'bitcoin': {
+            'usd': round(stats['last'], 2),
+            'usd_24h_vol': round(stats['volume'] * stats['last'], 2),
+            'usd_24h_change': (stats['last'] - stats['open']) / stats['open'] * 100
+        }
+    }
+
+
+def cryptocompare_price(stats):
+    """CryptoCompare /data/pricemultifull response body (RAW section)"""
+    return {
+        'RAW': {
+            'BTC': {
+                'USD': {
+                    'PRICE': round(stats['last'], 2),
+                    'CHANGE24HOUR': round(stats['last'] - stats['open'], 2),
+                    'CHANGEPCT24HOUR': (stats['last'] - stats['open']) / stats['open'] * 100,
+                    'HIGH24HOUR': round(stats['high'], 2),
+                    'LOW24HOUR': round(stats['low'], 2),
+                    'VOLUME24HOUR': round(stats['volume'], 4)
+                }
+            }
+        }
+    }
+
+
+FIXTURE_FILES = {
+    'binance_klines': "binance_klines_1m.json",
+    'cryptocompare_histo': "cryptocompare_histominute.json",
+    'binance_ticker': "binance_ticker_24hr.json",
+    'coingecko_price': "coingecko_simple_price.json",
+    'cryptocompare_price': "cryptocompare_pricemultifull.json"
+}
+
+
+def generate(directory=FIXTURE_DIR, count=MAX_CANDLES):
+    """Write synthetic fixtures for every source to `directory`"""
+    os.makedirs(directory, exist_ok=True)
+    walk = candle_walk(count)
+    stats = ticker_stats(walk)
+    payloads = {
+        'binance_klines': binance_klines(walk),
+        'cryptocompare_histo': cryptocompare_histo(walk),
+        'binance_ticker': binance_ticker(stats),
+        'coingecko_price': coingecko_price(stats),
+        'cryptocompare_price': cryptocompare_price(stats)
+    }
+    for name, payload in payloads.items():
+        with open(os.path.join(directory, FIXTURE_FILES[name]), "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+    return directory
+
+
+def record(directory=FIXTURE_DIR, count=MAX_CANDLES):
+    """Record live payloads (klines are paged back `count` candles from now)"""
+    from data_fetcher import BINANCE_API_URL, CRYPTOCOMPARE_API_URL, COINGECKO_API_URL, INTERVAL_MS
+    from http_client import http_get
+    import time
+
+    os.makedirs(directory, exist_ok=True)
+    binance = BINANCE_API_URL
+    now_ms = int(time.time() * 1000)
+    start = now_ms - now_ms % INTERVAL_MS['1m'] - (count - 1) * INTERVAL_MS['1m']
+
+    rows = []
+    while start <= now_ms:
+        page = http_get(f"{binance}/klines", endpoint="binance.klines",
+                        params={"symbol": "BTCUSDT", "interval": "1m", "limit": 1000, "startTime": start}).json()
+        if not page:
+            break
+        rows.extend(page)
+        start = page[-1][0] + INTERVAL_MS['1m']
+
+    bodies = {
+        'binance_klines': json.dumps(rows, separators=(",", ":")),
+        'cryptocompare_histo': http_get(f"{CRYPTOCOMPARE_API_URL}/data/v2/histominute",
+                                        params={"fsym": "BTC", "tsym": "USD", "limit": 2000}).text,
+        'binance_ticker': http_get(f"{binance}/ticker/24hr", params={"symbol": "BTCUSDT"}).text,
+        'coingecko_price': http_get(f"{COINGECKO_API_URL}/simple/price",
+                                    params={"ids": "bitcoin", "vs_currencies": "usd",
+                                            "include_24hr_change": "true", "include_24hr_vol": "true"}).text,
+        'cryptocompare_price': http_get(f"{CRYPTOCOMPARE_API_URL}/data/pricemultifull",
+                                        params={"fsyms": "BTC", "tsyms": "USD"}).text
+    }
+    for name, body in bodies.items():
+        with open(os.path.join(directory, FIXTURE_FILES[name]), "w") as f:
+            f.write(body)
+    return directory
+
+
+def load_fixture(name, directory=FIXTURE_DIR):
+    """
+    Raw bytes of a fixture, generating the synthetic set on first use
+
+    Args:
+        name: Key of FIXTURE_FILES
+        directory: Fixture directory
+    """
+    path = os.path.join(directory, FIXTURE_FILES[name])
+    if not os.path.exists(path):
+        generate(directory)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create benchmark fixtures")
+    parser.add_argument("--record", action="store_true", help="Record live API payloads instead of generating")
+    parser.add_argument("--count", type=int, default=MAX_CANDLES, help="Candles per kline fixture")
+    parser.add_argument("--dir", default=FIXTURE_DIR, help="Output directory")
+    args = parser.parse_args()
+    path = (record if args.record else generate)(args.dir, args.count)
+    print(f"Fixtures written to {path}")
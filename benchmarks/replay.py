@@ -0,0 +1,124 @@
+"""
+Replay Module
+requests transport adapter that serves recorded fixtures instead of the live APIs
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+from requests.adapters import BaseAdapter
+
+import data_fetcher
+from http_client import get_session, close_sessions
+from rate_limiter import WeightRateLimiter
+from benchmarks.fixtures import FIXTURE_DIR, load_fixture
+
+
+def _encode_rows(rows):
+    """Pre-encode each row once so any slice is a cheap byte join"""
+    return [json.dumps(row, separators=(",", ":")).encode() for row in rows]
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers Binance, CryptoCompare and CoinGecko requests from fixtures
+
+    Kline and histo requests are sliced from the stored series like the real
+    APIs do (limit / startTime / endTime for Binance, the last limit + 1
+    candles for CryptoCompare), so paging code paths run unchanged.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR):
+        super().__init__()
+        self.requests = 0
+
+        klines = json.loads(load_fixture('binance_klines', directory))
+        self._kline_open = [row[0] for row in klines]
+        self._kline_rows = _encode_rows(klines)
+
+        histo = json.loads(load_fixture('cryptocompare_histo', directory))
+        self._histo_rows = _encode_rows(histo['Data']['Data'])
+
+        self._static = {
+            '/ticker/24hr': load_fixture('binance_ticker', directory),
+            '/simple/price': load_fixture('coingecko_price', directory),
+            '/pricemultifull': load_fixture('cryptocompare_price', directory)
+        }
+
+    def _klines(self, params):
+        limit = int(params.get('limit', 500))
+        if 'startTime' in params:
+            start = int(params['startTime'])
+            end = int(params.get('endTime', self._kline_open[-1]))
+            first = bisect_left(self._kline_open, start)
+            last = bisect_right(self._kline_open, end)
+            rows = self._kline_rows[first:min(first + limit, last)]
+        else:
+            rows = self._kline_rows[-limit:]
+        return b"[" + b",".join(rows) + b"]"
+
+    def _histo(self, params):
+        limit = int(params.get('limit', 1440))
+        rows = self._histo_rows[-(limit + 1):]
+        return (b'{"Response":"Success","Message":"","HasWarning":false,"Type":100,"RateLimit":{},'
+                b'"Data":{"Aggregated":false,"Data":[' + b",".join(rows) + b"]}}")
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        parts = urlsplit(request.url)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        body, status = None, 200
+        if parts.path.endswith('/klines'):
+            body = self._klines(params)
+        elif '/histo' in parts.path:
+            body = self._histo(params)
+        else:
+            for suffix, payload in self._static.items():
+                if parts.path.endswith(suffix):
+                    body = payload
+                    break
+        if body is None:
+            body, status = b'{"msg":"no fixture for this endpoint"}', 404
+
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers['Content-Type'] = 'application/json'
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def replay_upstreams(directory=FIXTURE_DIR):
+    """
+    Route every market data request to a ReplayAdapter for the duration
+
+    Rate limiters are swapped for unlimited ones so repeated runs measure
+    CPU cost rather than token-bucket waits.
+
+    Yields:
+        The ReplayAdapter (its `requests` counter shows calls served)
+    """
+    adapter = ReplayAdapter(directory)
+    for base in (data_fetcher.BINANCE_API_URL, data_fetcher.CRYPTOCOMPARE_API_URL, data_fetcher.COINGECKO_API_URL):
+        get_session(base).mount(base, adapter)
+
+    limiters = {name: getattr(data_fetcher, name)
+                for name in ('binance_limiter', 'cryptocompare_limiter', 'coingecko_limiter')}
+    for name in limiters:
+        setattr(data_fetcher, name, WeightRateLimiter(f"replay-{name}", capacity=1e12))
+    try:
+        yield adapter
+    finally:
+        for name, limiter in limiters.items():
+            setattr(data_fetcher, name, limiter)
+        close_sessions()
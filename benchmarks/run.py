@@ -0,0 +1,250 @@
+"""
+Benchmark Runner
+Times parse, indicator and end-to-end stages of data_fetcher against replayed fixtures
+
+Usage:
+    python -m benchmarks.run                       # run and compare with baseline.json
+    python -m benchmarks.run --filter indicators   # only matching cases
+    python -m benchmarks.run --update-baseline     # store this run as the new baseline
+
+Exits with status 1 when a case is slower (fastest of the timed runs) or
+hungrier (peak traced memory) than the baseline by more than --tolerance.
+Times are compared relative to a fixed calibration loop timed in the same
+run, so a baseline recorded on a faster or slower machine still applies.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import data_fetcher
+from data_fetcher import BinanceDataFetcher, parse_klines, json_loads, get_bitcoin_data
+from benchmarks.fixtures import SIZES, START_MS, STEP_MS, load_fixture
+from benchmarks.replay import replay_upstreams
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Differences below these floors are treated as noise: even the fastest of a
+# few runs of a millisecond-scale case moves by 1-3 ms on a busy machine, and
+# end-to-end cases also go through the transport adapter and thread pool.
+# Real slowdowns still show up proportionally in the 1,000 and 100k cases
+MIN_TIME_DELTA_MS = {'parse': 3.0, 'indicators': 3.0, 'end_to_end': 5.0}
+MIN_MEMORY_DELTA_KB = 64
+# Iterations of the pure-Python calibration loop
+CALIBRATION_LOOPS = 200_000
+
+
+def kline_body(size):
+    """Raw Binance klines payload holding the last `size` candles of the fixture"""
+    rows = json.loads(load_fixture('binance_klines'))[-size:]
+    return json.dumps(rows, separators=(",", ":")).encode()
+
+
+def build_cases(sizes):
+    """
+    Benchmark cases as (name, setup, fn) tuples
+
+    setup() runs outside the timed region and returns the arguments for fn.
+    """
+    cases = []
+    frames = {}
+
+    for size in sizes:
+        body = kline_body(size)
+        frames[size] = parse_klines(json_loads(body))
+
+        cases.append((f"parse/binance_klines/{size}", lambda body=body: (body,),
+                      lambda body: parse_klines(json_loads(body))))
+        cases.append((f"parse/cryptocompare_histo/{size}", lambda: (),
+                      lambda size=size: data_fetcher.fetch_cryptocompare_historical(interval="1m", limit=size - 1)))
+
+        ohlcv = frames[size][['open', 'high', 'low', 'close', 'volume']]
+        for backend in ("numpy", "pandas"):
+            cases.append((f"indicators/{backend}/{size}", lambda ohlcv=ohlcv: (ohlcv.copy(),),
+                          lambda df, backend=backend: BinanceDataFetcher.calculate_technical_indicators(
+                              df, backend=backend)))
+
+        if size <= BinanceDataFetcher.KLINES_MAX_LIMIT:
+            cases.append((f"end_to_end/binance_klines/{size}", lambda: (),
+                          lambda size=size: BinanceDataFetcher.fetch_historical_klines(
+                              symbol="BTCUSDT", interval="1m", limit=size)))
+            cases.append((f"end_to_end/get_bitcoin_data/{size}", lambda: (),
+                          lambda size=size: get_bitcoin_data(interval="1m", limit=size, with_indicators=True,
+                                                             use_store=False, hedge_delay=None, coalesce=False)))
+        else:
+            cases.append((f"end_to_end/binance_klines_range/{size}", lambda: (),
+                          lambda size=size: BinanceDataFetcher.fetch_klines_range(
+                              symbol="BTCUSDT", interval="1m", start=START_MS,
+                              end=START_MS + (size - 1) * STEP_MS)))
+
+    cases.append(("end_to_end/ticker/binance", lambda: (),
+                  lambda: BinanceDataFetcher.fetch_current_price("BTCUSDT")))
+    cases.append(("end_to_end/ticker/coingecko", lambda: (), data_fetcher.fetch_coingecko_price))
+    cases.append(("end_to_end/ticker/cryptocompare", lambda: (), data_fetcher.fetch_cryptocompare_price))
+    return cases
+
+
+def calibrate(repeat=5):
+    """
+    Fastest time of a fixed pure-Python loop, a yardstick for this machine's speed
+
+    Returns:
+        Milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(CALIBRATION_LOOPS):
+            total += i * i
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(min(timings), 3)
+
+
+def measure(setup, fn, repeat):
+    """
+    Time fn over `repeat` runs (after one warm-up) and trace one run's memory peak
+
+    Returns:
+        dict with median_ms, min_ms and peak_kb
+    """
+    fn(*setup())
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Tracing slows execution, so memory is measured in a separate run
+    args = setup()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+
+def compare(results, baseline, tolerance, scale=1.0):
+    """
+    Regressions of a run against a baseline
+
+    The fastest run (min_ms) is compared, since the median of a few runs
+    still moves with scheduler noise.
+
+    Args:
+        results: Case name -> measure() result for this run
+        baseline: Case name -> measure() result from the baseline
+        tolerance: Allowed relative slowdown / memory growth
+        scale: This run's calibration time over the baseline's (baseline
+            times are multiplied by it before comparing)
+
+    Returns:
+        List of (case, metric, baseline value, current value)
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        expected_ms = round(previous['min_ms'] * scale, 3)
+        floor_ms = MIN_TIME_DELTA_MS.get(name.split("/")[0], max(MIN_TIME_DELTA_MS.values()))
+        if current['min_ms'] > expected_ms * (1 + tolerance) and \
+                current['min_ms'] - expected_ms > floor_ms:
+            regressions.append((name, 'min_ms', expected_ms, current['min_ms']))
+        if current['peak_kb'] > previous['peak_kb'] * (1 + tolerance) and \
+                current['peak_kb'] - previous['peak_kb'] > MIN_MEMORY_DELTA_KB:
+            regressions.append((name, 'peak_kb', previous['peak_kb'], current['peak_kb']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="data_fetcher CPU/memory benchmarks")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Comma-separated candle counts")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case (100k cases use 3)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--output", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    calibration_ms = calibrate()
+    print(f"{'calibration':<45} {calibration_ms:>10.3f} ms")
+    results = {}
+    with replay_upstreams() as adapter:
+        for name, setup, fn in build_cases(sizes):
+            if args.filter not in name:
+                continue
+            repeat = 3 if name.endswith("/100000") else args.repeat
+            results[name] = measure(setup, fn, repeat)
+            stats = results[name]
+            print(f"{name:<45} {stats['median_ms']:>10.3f} ms  (min {stats['min_ms']:.3f})"
+                  f"  peak {stats['peak_kb']:>10.1f} KiB")
+        print(f"\n{adapter.requests} replayed requests")
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration_ms': calibration_ms,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            # Cases kept from the old baseline are rescaled to this run's calibration
+            scale = calibration_ms / previous.get('calibration_ms', calibration_ms)
+            baseline = {
+                name: dict(stats, median_ms=round(stats['median_ms'] * scale, 3),
+                           min_ms=round(stats['min_ms'] * scale, 3))
+                for name, stats in previous.get('results', {}).items()
+            }
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(dict(report, results=dict(sorted(baseline.items()))), f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    # Old baselines without a calibration are compared unscaled
+    scale = calibration_ms / baseline.get('calibration_ms', calibration_ms)
+    if abs(scale - 1) > 0.1:
+        print(f"Baseline times scaled by {scale:.2f} for this machine's calibration")
+    regressions = compare(results, baseline['results'], args.tolerance, scale)
+    if not regressions:
+        print(f"No regressions against {os.path.basename(args.baseline)} (tolerance {args.tolerance:.0%})")
+        return 0
+    print(f"\n{len(regressions)} regression(s):")
+    for name, metric, previous, current in regressions:
+        print(f"  {name} {metric}: {previous} -> {current} ({current / previous - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
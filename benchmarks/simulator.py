@@ -0,0 +1,959 @@
+"""
+Upstream Simulator Module
+Local stand-in for Binance, CryptoCompare, CoinGecko and the forecast API with fault injection
+
+One HTTP server answers every endpoint the app calls, under a path prefix
+per service. Point the app at it with the base URL variables it prints:
+
+    python -m benchmarks.simulator --port 8765 --scenario benchmarks/scenarios/geo_block.json
+    BINANCE_API_URL=http://127.0.0.1:8765/binance/api/v3 ... streamlit run app.py
+
+Scenarios are JSON documents of per-route rules. A rule set under a dotted
+prefix ("*", "binance", "forecast.predict", ...) applies to every route
+below it, and more specific keys override less specific ones:
+
+    {
+      "seed": 7,
+      "routes": {
+        "*": {"latency": {"dist": "lognormal", "median": 60, "p99": 900}},
+        "binance": {"outages": [{"start": 0, "status": 451}]},
+        "forecast": {"cold_start": {"idle": 900, "duration": 40, "at_start": true}},
+        "forecast.predict": {"errors": [{"rate": 0.2, "status": 429, "retry_after": 5}]}
+      }
+    }
+
+Rule fields:
+    latency     Milliseconds before answering: a number, or {"dist": "fixed" | "uniform" |
+                "normal" | "lognormal" | "mixture", ...} (see sample_latency)
+    errors      [{"rate": p, "status": code | "fault": "reset" | "hang", "retry_after": s,
+                "detail": text}] drawn independently per request
+    outages     [{"start": s, "end": s, "every": s, "status": code | "fault": ...}] windows in
+                seconds since the scenario was loaded; "every" repeats the window
+    cold_start  {"idle": s, "duration": s, "at_start": bool} (forecast only) holds requests
+                like a sleeping Render instance while it boots
+    weight_limit  Binance request weight per minute before answering 429 (default 6000)
+
+    ws_push_interval  Seconds between kline/ticker frames on the WebSocket (default 1)
+    ws_drop_after  Seconds after which the simulator drops each WebSocket connection
+
+Routes: binance.klines, binance.ticker, binance.ws, cryptocompare.histo,
+cryptocompare.price, coingecko.price, forecast.health, forecast.model_info,
+forecast.usage, forecast.predict and forecast.predict.v1_1.
+
+binance.ws is the combined kline/ticker WebSocket stream
+(/binance-ws/stream?streams=btcusdt@kline_1m/btcusdt@ticker). Its latency,
+errors and outages apply to the upgrade handshake, so an outage makes the
+client's reconnects fail until the window ends.
+
+GET /_simulator/stats returns per-route counters; POST /_simulator/scenario
+replaces the scenario while the server runs and POST /_simulator/ws/drop
+drops every open WebSocket connection.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from benchmarks.fixtures import (candle_walk, binance_klines, cryptocompare_histo, ticker_stats,
+                                 binance_ticker, coingecko_price, cryptocompare_price)
+
+
+# One periodic walk of 70 days of minutes divides evenly into every chart interval
+WALK_MINUTES = 70 * 1440
+MINUTE_MS = 60_000
+
+BINANCE_INTERVALS = {'1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '2h': 120,
+                     '4h': 240, '6h': 360, '12h': 720, '1d': 1440}
+HISTO_UNITS = {'histominute': 1, 'histohour': 60, 'histoday': 1440}
+
+# Binance request weights (GET /api/v3/klines costs 2 whatever the limit)
+KLINES_WEIGHT = 2
+TICKER_WEIGHT = 2
+DEFAULT_WEIGHT_LIMIT = 6000
+
+# Numbers the forecast API's /predict and /api-keys/usage use
+GUEST_LIMIT = 3
+DEFAULT_API_KEYS = {
+    'sim-admin': {'user_type': 'admin', 'name': 'Simulator Admin'},
+    'sim-user': {'user_type': 'authenticated', 'name': 'Simulator User', 'rate_limit': 10}
+}
+
+# Default seconds a "hang" fault holds the connection (longer than any client timeout)
+HANG_SECONDS = 120
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def sample_latency(spec, rng):
+    """
+    Draw one latency in seconds from a scenario latency spec
+
+    Args:
+        spec: Milliseconds as a number, or a dict with "dist" and its parameters:
+              fixed (ms), uniform (min, max), normal (mean, std),
+              lognormal (median, p99) or mixture (components: [{weight, ...spec}])
+        rng: random.Random instance
+
+    Returns:
+        Seconds (>= 0)
+    """
+    if not spec:
+        return 0.0
+    if isinstance(spec, (int, float)):
+        return max(0.0, spec / 1000)
+
+    dist = spec.get('dist', 'fixed')
+    if dist == 'fixed':
+        ms = spec.get('ms', 0)
+    elif dist == 'uniform':
+        ms = rng.uniform(spec.get('min', 0), spec['max'])
+    elif dist == 'normal':
+        ms = rng.gauss(spec['mean'], spec.get('std', 0))
+    elif dist == 'lognormal':
+        # p99 of a lognormal is median * exp(2.326 sigma)
+        sigma = math.log(spec.get('p99', spec['median']) / spec['median']) / 2.326
+        ms = spec['median'] * math.exp(rng.gauss(0, sigma))
+    elif dist == 'mixture':
+        components = spec['components']
+        pick = rng.uniform(0, sum(component.get('weight', 1) for component in components))
+        for component in components:
+            pick -= component.get('weight', 1)
+            if pick <= 0:
+                break
+        return sample_latency(component, rng)
+    else:
+        raise ValueError(f"Unknown latency distribution: {dist}")
+    return max(0.0, ms / 1000)
+
+
+def outage_active(window, elapsed):
+    """Whether an outage window covers `elapsed` seconds since the scenario started"""
+    start = window.get('start', 0)
+    end = window.get('end')
+    if elapsed < start:
+        return False
+    if window.get('every'):
+        elapsed = start + (elapsed - start) % window['every']
+    return end is None or elapsed < end
+
+
+class Scenario:
+    """
+    Parsed scenario with per-route rule lookup
+
+    Args:
+        config: Scenario dict ({"seed": int, "routes": {prefix: rules}})
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.config = config
+        self.routes = config.get('routes', {})
+        self.rng = random.Random(config.get('seed'))
+        self.started = time.time()
+        self._cache = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def rules(self, route):
+        """Merged rules for a route ("*", then each dotted prefix, most specific last)"""
+        rules = self._cache.get(route)
+        if rules is None:
+            rules = dict(self.routes.get('*', {}))
+            parts = route.split('.')
+            for i in range(1, len(parts) + 1):
+                rules.update(self.routes.get('.'.join(parts[:i]), {}))
+            self._cache[route] = rules
+        return rules
+
+    def draw(self, route):
+        """
+        Decide latency and injected failure for one request
+
+        Returns:
+            (latency seconds, failure dict or None)
+        """
+        rules = self.rules(route)
+        latency = sample_latency(rules.get('latency'), self.rng)
+
+        elapsed = time.time() - self.started
+        for window in rules.get('outages', []):
+            if outage_active(window, elapsed):
+                return latency, window
+        for error in rules.get('errors', []):
+            if self.rng.random() < error.get('rate', 0):
+                return latency, error
+        return latency, None
+
+
+class MarketData:
+    """
+    Candles, tickers and prices derived from one periodic 1m random walk
+
+    Time maps onto the walk by epoch minute, so every interval, the ticker
+    and the forecast price agree with each other and move with the clock.
+    """
+
+    def __init__(self, seed=None):
+        walk = candle_walk(WALK_MINUTES, seed=seed or 20251006, periodic=True)
+        del walk['open_ms']
+        self._walk = walk
+        self._frames = {1: walk}
+        self._lock = threading.Lock()
+
+    def frame(self, minutes):
+        """Walk aggregated into bars of `minutes` (cyclic, WALK_MINUTES / minutes bars)"""
+        with self._lock:
+            frame = self._frames.get(minutes)
+            if frame is None:
+                if WALK_MINUTES % minutes:
+                    raise ValueError(f"{minutes}m bars do not divide the simulated walk")
+                shaped = {key: values.reshape(-1, minutes) for key, values in self._walk.items()}
+                frame = {
+                    'open': shaped['open'][:, 0],
+                    'high': shaped['high'].max(axis=1),
+                    'low': shaped['low'].min(axis=1),
+                    'close': shaped['close'][:, -1],
+                    'volume': shaped['volume'].sum(axis=1),
+                    'trades': shaped['trades'].sum(axis=1)
+                }
+                self._frames[minutes] = frame
+        return frame
+
+    def candles(self, minutes, open_ms, now_ms=None):
+        """
+        Walk slice for bars opening at `open_ms` (array of epoch ms) in fixtures format
+
+        A bar still forming at `now_ms` only aggregates the minutes up to
+        now, like a live exchange's current candle.
+        """
+        frame = self.frame(minutes)
+        step = minutes * MINUTE_MS
+        index = (open_ms // step) % len(frame['close'])
+        candles = {key: values[index] for key, values in frame.items()}
+        candles['open_ms'] = open_ms
+
+        if minutes > 1 and now_ms is not None and len(open_ms) and open_ms[-1] + step > now_ms:
+            first = int(open_ms[-1] // MINUTE_MS)
+            span = np.arange(first, now_ms // MINUTE_MS + 1) % WALK_MINUTES
+            walk = self._walk
+            candles = {key: values.copy() for key, values in candles.items()}
+            candles['open'][-1] = walk['open'][span[0]]
+            candles['high'][-1] = walk['high'][span].max()
+            candles['low'][-1] = walk['low'][span].min()
+            candles['close'][-1] = walk['close'][span[-1]]
+            candles['volume'][-1] = walk['volume'][span].sum()
+            candles['trades'][-1] = walk['trades'][span].sum()
+        return candles
+
+    def stats(self, now_ms):
+        """24h ticker statistics ending at the current minute"""
+        current = now_ms - now_ms % MINUTE_MS
+        return ticker_stats(self.candles(1, current - np.arange(1439, -1, -1, dtype=np.int64) * MINUTE_MS))
+
+    def price(self, now_ms):
+        return float(self.stats(now_ms)['last'])
+
+
+def _binance_error(status, detail=None):
+    messages = {
+        451: "Service unavailable from a restricted location according to 'b. Eligibility' "
+             "in https://www.binance.com/en/terms. Please contact customer service if you "
+             "believe you received this message in error.",
+        429: "Too many requests; current limit of IP is 6000 request weight per 1 MINUTE.",
+        418: "Way too many requests; IP banned until further notice."
+    }
+    return {'code': -1003 if status in (418, 429) else 0,
+            'msg': detail or messages.get(status, f"Simulated upstream error {status}")}
+
+
+def _cryptocompare_error(status, detail=None):
+    return {'Response': 'Error', 'Message': detail or f"Simulated upstream error {status}",
+            'HasWarning': False, 'Type': 1, 'RateLimit': {}, 'Data': {}}
+
+
+def _coingecko_error(status, detail=None):
+    return {'status': {'error_code': status,
+                       'error_message': detail or f"Simulated upstream error {status}"}}
+
+
+def _forecast_error(status, detail=None):
+    return {'detail': detail or f"Simulated upstream error {status}"}
+
+
+ERROR_BODIES = {
+    'binance': _binance_error,
+    'cryptocompare': _cryptocompare_error,
+    'coingecko': _coingecko_error,
+    'forecast': _forecast_error
+}
+
+
+class UpstreamSimulator:
+    """
+    Threaded HTTP server impersonating every upstream service
+
+    Args:
+        scenario: Scenario, scenario dict or None (healthy, no latency)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(self, scenario=None, host="127.0.0.1", port=0):
+        self.scenario = scenario if isinstance(scenario, Scenario) else Scenario(scenario)
+        self.market = MarketData(self.scenario.config.get('seed'))
+        self.api_keys = dict(self.scenario.config.get('api_keys', DEFAULT_API_KEYS))
+
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._weight = {}  # client -> (minute, used weight)
+        self._guest_usage = {}  # client -> predictions
+        self._key_calls = {}  # api key -> (minute, calls)
+        self._forecast_last_seen = None
+        self._forecast_awake_at = 0.0
+        self._ws_sessions = set()
+
+        simulator = self
+
+        class Handler(_SimulatorHandler):
+            pass
+
+        Handler.simulator = simulator
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self):
+        """Base URL of the simulated Binance WebSocket (the client appends /stream?streams=...)"""
+        host, port = self.server.server_address[:2]
+        return f"ws://{host}:{port}/binance-ws"
+
+    def env(self):
+        """Base URL environment variables that point the app (REST and live stream) at this server"""
+        return {
+            'BINANCE_API_URL': f"{self.base_url}/binance/api/v3",
+            'BINANCE_WS_URL': self.ws_url,
+            'CRYPTOCOMPARE_API_URL': f"{self.base_url}/cryptocompare",
+            'COINGECKO_API_URL': f"{self.base_url}/coingecko/api/v3",
+            'FORECAST_API_URL': f"{self.base_url}/forecast"
+        }
+
+    def start(self):
+        """Serve on a daemon thread; returns self"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="upstream-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.drop_streams()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def drop_streams(self):
+        """Cut every open WebSocket connection without a close frame; returns how many"""
+        with self._lock:
+            sessions = list(self._ws_sessions)
+        for session in sessions:
+            session.drop()
+        return len(sessions)
+
+    def stream_count(self):
+        """Open WebSocket connections"""
+        with self._lock:
+            return len(self._ws_sessions)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def set_scenario(self, scenario):
+        """Replace the scenario (outage windows restart from now)"""
+        scenario = scenario if isinstance(scenario, Scenario) else Scenario(scenario)
+        with self._lock:
+            self.scenario = scenario
+            if 'api_keys' in scenario.config:
+                self.api_keys = dict(scenario.config['api_keys'])
+
+    def stats(self):
+        """Per-route counters: requests, status codes, injected faults and latency"""
+        with self._lock:
+            return {route: dict(counters, statuses=dict(counters['statuses']))
+                    for route, counters in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def record(self, route, status, seconds, injected):
+        with self._lock:
+            counters = self._stats.setdefault(route, {'requests': 0, 'injected': 0, 'seconds': 0.0,
+                                                      'max_seconds': 0.0, 'statuses': {}})
+            counters['requests'] += 1
+            counters['injected'] += int(injected)
+            counters['seconds'] += seconds
+            counters['max_seconds'] = max(counters['max_seconds'], seconds)
+            counters['statuses'][str(status)] = counters['statuses'].get(str(status), 0) + 1
+
+    def wait_for_forecast(self, rules):
+        """Hold a forecast request while a simulated cold start is in progress"""
+        cold_start = rules.get('cold_start')
+        now = time.time()
+        with self._lock:
+            if cold_start:
+                idle = cold_start.get('idle', 900)
+                first = self._forecast_last_seen is None
+                if (first and cold_start.get('at_start')) or \
+                        (not first and now - self._forecast_last_seen > idle and now >= self._forecast_awake_at):
+                    self._forecast_awake_at = now + cold_start.get('duration', 30)
+            self._forecast_last_seen = now
+            wait = self._forecast_awake_at - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def binance_weight(self, client, weight, limit):
+        """Add request weight for a client; returns (used weight this minute, allowed)"""
+        minute = int(time.time() // 60)
+        with self._lock:
+            current, used = self._weight.get(client, (minute, 0))
+            if current != minute:
+                used = 0
+            used += weight
+            self._weight[client] = (minute, used)
+        return used, used <= limit
+
+    def key_call(self, api_key, limit):
+        """Count a keyed prediction; returns (allowed, remaining, seconds to reset)"""
+        now = time.time()
+        minute = int(now // 60)
+        with self._lock:
+            current, calls = self._key_calls.get(api_key, (minute, 0))
+            if current != minute:
+                calls = 0
+            allowed = limit is None or calls < limit
+            if allowed:
+                calls += 1
+            self._key_calls[api_key] = (minute, calls)
+        remaining = None if limit is None else max(0, limit - calls)
+        return allowed, remaining, int(60 - now % 60) + 1
+
+    def guest_call(self, client):
+        """Count a guest prediction; returns whether it is within the free limit"""
+        with self._lock:
+            used = self._guest_usage.get(client, 0)
+            if used >= GUEST_LIMIT:
+                return False
+            self._guest_usage[client] = used + 1
+            return True
+
+    def key_usage(self, api_key):
+        with self._lock:
+            minute, calls = self._key_calls.get(api_key, (None, 0))
+        if minute != int(time.time() // 60):
+            calls = 0
+        return calls
+
+
+class _StreamSession:
+    """
+    One combined-stream WebSocket connection
+
+    Pushes each subscribed interval's forming candle (plus the final frame
+    of a candle when it closes) and the 24hr ticker every push interval,
+    and answers the client's pings from a reader thread.
+    """
+
+    def __init__(self, connection, rfile, streams, market):
+        self.connection = connection
+        self.rfile = rfile
+        self.streams = streams
+        self.market = market
+        self.closed = threading.Event()
+        self._send_lock = threading.Lock()
+        self._last_open = {}
+
+    def drop(self):
+        """Abort the TCP connection like a network failure would"""
+        self.closed.set()
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def send(self, opcode, payload=b""):
+        length = len(payload)
+        if length < 126:
+            header = bytes([0x80 | opcode, length])
+        elif length < 1 << 16:
+            header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, 'big')
+        else:
+            header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, 'big')
+        with self._send_lock:
+            self.connection.sendall(header + payload)
+
+    def _read_frame(self):
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None, None
+        opcode, length = header[0] & 0x0F, header[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(self.rfile.read(2), 'big')
+        elif length == 127:
+            length = int.from_bytes(self.rfile.read(8), 'big')
+        mask = self.rfile.read(4) if header[1] & 0x80 else b"\0\0\0\0"
+        data = self.rfile.read(length)
+        return opcode, bytes(byte ^ mask[i % 4] for i, byte in enumerate(data))
+
+    def _read_loop(self):
+        try:
+            while not self.closed.is_set():
+                opcode, data = self._read_frame()
+                if opcode is None:
+                    break
+                if opcode == WS_PING:
+                    self.send(WS_PONG, data)
+                elif opcode == WS_CLOSE:
+                    self.send(WS_CLOSE, data[:2])
+                    break
+        except OSError:
+            pass
+        self.closed.set()
+
+    def frames(self, now_ms):
+        """Messages due now, in the combined-stream envelope"""
+        messages = []
+        for name in self.streams:
+            symbol, _, kind = name.partition('@')
+            if kind == 'ticker':
+                stats = self.market.stats(now_ms)
+                change = stats['last'] - stats['open']
+                data = {'e': '24hrTicker', 'E': now_ms, 's': symbol.upper(), 'p': f"{change:.2f}",
+                        'P': f"{change / stats['open'] * 100:.3f}", 'c': f"{stats['last']:.2f}",
+                        'o': f"{stats['open']:.2f}", 'h': f"{stats['high']:.2f}",
+                        'l': f"{stats['low']:.2f}", 'v': f"{stats['volume']:.5f}"}
+                messages.append({'stream': name, 'data': data})
+                continue
+            interval = kind.partition('_')[2]
+            minutes = BINANCE_INTERVALS.get(interval)
+            if minutes is None:
+                continue
+            step = minutes * MINUTE_MS
+            current = now_ms - now_ms % step
+            opens = [current]
+            previous = self._last_open.get(name)
+            if previous is not None and previous < current:
+                # Final frame of the candle that just closed
+                opens.insert(0, previous)
+            self._last_open[name] = current
+            for open_ms in opens:
+                row = binance_klines(self.market.candles(minutes, np.array([open_ms], dtype=np.int64), now_ms),
+                                     step_ms=step)[0]
+                data = {'e': 'kline', 'E': now_ms, 's': symbol.upper(), 'k': {
+                    't': row[0], 'T': row[6], 's': symbol.upper(), 'i': interval, 'o': row[1], 'h': row[2],
+                    'l': row[3], 'c': row[4], 'v': row[5], 'n': row[8], 'x': open_ms < current,
+                    'q': row[7], 'V': row[9], 'Q': row[10], 'B': "0"}}
+                messages.append({'stream': name, 'data': data})
+        return messages
+
+    def run(self, push_interval, drop_after=None):
+        reader = threading.Thread(target=self._read_loop, name="simulator-ws-reader", daemon=True)
+        reader.start()
+        started = time.time()
+        try:
+            while not self.closed.is_set():
+                if drop_after is not None and time.time() - started >= drop_after:
+                    self.drop()
+                    break
+                for message in self.frames(int(time.time() * 1000)):
+                    self.send(WS_TEXT, json.dumps(message, separators=(",", ":")).encode())
+                self.closed.wait(push_interval)
+        except OSError:
+            pass
+        finally:
+            self.closed.set()
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    """Routes requests to UpstreamSimulator endpoints and applies the scenario"""
+
+    simulator = None
+    protocol_version = "HTTP/1.1"
+
+    # (method, path prefix) -> (route, handler name); longest prefix wins
+    ROUTES = [
+        ('GET', '/binance/api/v3/klines', 'binance.klines', 'binance_klines'),
+        ('GET', '/binance/api/v3/ticker/24hr', 'binance.ticker', 'binance_ticker'),
+        ('GET', '/binance-ws/', 'binance.ws', 'binance_ws'),
+        ('GET', '/cryptocompare/data/v2/histo', 'cryptocompare.histo', 'cryptocompare_histo'),
+        ('GET', '/cryptocompare/data/pricemultifull', 'cryptocompare.price', 'cryptocompare_price'),
+        ('GET', '/coingecko/api/v3/simple/price', 'coingecko.price', 'coingecko_price'),
+        ('GET', '/forecast/health', 'forecast.health', 'forecast_health'),
+        ('GET', '/forecast/model/info', 'forecast.model_info', 'forecast_model_info'),
+        ('GET', '/forecast/api-keys/usage', 'forecast.usage', 'forecast_usage'),
+        ('POST', '/forecast/v1.1/predict', 'forecast.predict.v1_1', 'forecast_predict'),
+        ('POST', '/forecast/predict', 'forecast.predict', 'forecast_predict')
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def dispatch(self, method):
+        parts = urlsplit(self.path)
+        self.params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b""
+
+        if parts.path.startswith('/_simulator/'):
+            return self.control(method, parts.path)
+
+        for route_method, prefix, route, handler in self.ROUTES:
+            if method == route_method and parts.path.startswith(prefix):
+                break
+        else:
+            return self.send_json(404, {'detail': f"Not simulated: {method} {parts.path}"})
+
+        simulator = self.simulator
+        scenario = simulator.scenario
+        service = route.split('.')[0]
+        rules = scenario.rules(route)
+        started = time.perf_counter()
+
+        if service == 'forecast':
+            simulator.wait_for_forecast(rules)
+        latency, failure = scenario.draw(route)
+        if latency:
+            time.sleep(latency)
+
+        if failure is None:
+            status = getattr(self, handler)(route, rules)
+        else:
+            status = self.fail(service, failure)
+        simulator.record(route, status, time.perf_counter() - started, failure is not None)
+
+    def fail(self, service, failure):
+        """Answer with an injected error status, a dropped connection or a hang"""
+        fault = failure.get('fault')
+        if fault == 'hang':
+            time.sleep(failure.get('seconds', HANG_SECONDS))
+            fault = 'reset'
+        if fault == 'reset':
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return 'reset'
+
+        status = failure.get('status', 503)
+        headers = {}
+        if failure.get('retry_after') is not None:
+            headers['Retry-After'] = str(failure['retry_after'])
+        self.send_json(status, ERROR_BODIES[service](status, failure.get('detail')), headers)
+        return status
+
+    def control(self, method, path):
+        simulator = self.simulator
+        if method == 'GET' and path == '/_simulator/stats':
+            return self.send_json(200, simulator.stats())
+        if method == 'POST' and path == '/_simulator/scenario':
+            try:
+                simulator.set_scenario(json.loads(self.body or b"{}"))
+            except (ValueError, TypeError) as e:
+                return self.send_json(400, {'detail': f"Invalid scenario: {e}"})
+            return self.send_json(200, {'status': 'ok'})
+        if method == 'POST' and path == '/_simulator/ws/drop':
+            return self.send_json(200, {'dropped': simulator.drop_streams()})
+        if method == 'POST' and path == '/_simulator/reset':
+            simulator.reset_stats()
+            return self.send_json(200, {'status': 'ok'})
+        return self.send_json(404, {'detail': f"Unknown control endpoint: {path}"})
+
+    def send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, separators=(",", ":")).encode()
+        try:
+            self.send_response(status)
+            # forecast_client compares the content type exactly, like the real API sends it
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up first (its timeout was shorter than the injected delay)
+            self.close_connection = True
+            return 'client_closed'
+        return status
+
+    @property
+    def client(self):
+        return self.client_address[0]
+
+    # Binance
+
+    def binance_weighted(self, weight, rules, build):
+        used, allowed = self.simulator.binance_weight(self.client, weight,
+                                                      rules.get('weight_limit', DEFAULT_WEIGHT_LIMIT))
+        headers = {'X-MBX-USED-WEIGHT-1M': str(used)}
+        if not allowed:
+            headers['Retry-After'] = str(int(60 - time.time() % 60) + 1)
+            return self.send_json(429, _binance_error(429), headers)
+        status, payload = build()
+        return self.send_json(status, payload, headers)
+
+    def binance_klines(self, route, rules):
+        interval = self.params.get('interval')
+        if interval not in BINANCE_INTERVALS:
+            return self.send_json(400, {'code': -1120, 'msg': "Invalid interval."})
+        limit = min(int(self.params.get('limit', 500)), 1000)
+
+        def build():
+            minutes = BINANCE_INTERVALS[interval]
+            step = minutes * MINUTE_MS
+            now_ms = int(time.time() * 1000)
+            current = now_ms - now_ms % step
+            end = min(int(self.params.get('endTime', current)), current)
+            end -= end % step
+            if 'startTime' in self.params:
+                start = -(-int(self.params['startTime']) // step) * step
+                last = min(end, start + (limit - 1) * step)
+            else:
+                last = end
+                start = last - (limit - 1) * step
+            if last < start:
+                return 200, b"[]"
+            open_ms = np.arange(start, last + 1, step, dtype=np.int64)
+            return 200, binance_klines(self.simulator.market.candles(minutes, open_ms, now_ms), step_ms=step)
+
+        return self.binance_weighted(KLINES_WEIGHT, rules, build)
+
+    def binance_ticker(self, route, rules):
+        def build():
+            stats = self.simulator.market.stats(int(time.time() * 1000))
+            return 200, binance_ticker(stats, symbol=self.params.get('symbol', 'BTCUSDT'))
+
+        return self.binance_weighted(TICKER_WEIGHT, rules, build)
+
+    def binance_ws(self, route, rules):
+        """Upgrade to a WebSocket and push kline/ticker frames until the client or a drop ends it"""
+        key = self.headers.get('Sec-WebSocket-Key')
+        if self.headers.get('Upgrade', '').lower() != 'websocket' or not key:
+            return self.send_json(400, _binance_error(400, "Expected a WebSocket upgrade"))
+        streams = [name for name in self.params.get('streams', '').split('/') if name]
+        if not streams:
+            return self.send_json(400, _binance_error(400, "No streams requested"))
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        session = _StreamSession(self.connection, self.rfile, streams, self.simulator.market)
+        simulator = self.simulator
+        with simulator._lock:
+            simulator._ws_sessions.add(session)
+        try:
+            session.run(rules.get('ws_push_interval', 1.0), rules.get('ws_drop_after'))
+        finally:
+            with simulator._lock:
+                simulator._ws_sessions.discard(session)
+        return 101
+
+    # CryptoCompare and CoinGecko
+
+    def cryptocompare_histo(self, route, rules):
+        unit = HISTO_UNITS.get(urlsplit(self.path).path.rsplit('/', 1)[-1])
+        if unit is None:
+            return self.send_json(200, _cryptocompare_error(200, "Unknown histo endpoint"))
+        minutes = unit * int(self.params.get('aggregate', 1))
+        limit = min(int(self.params.get('limit', 30)), 2000)
+        step = minutes * MINUTE_MS
+        now_ms = int(time.time() * 1000)
+        end = int(self.params['toTs']) * 1000 if 'toTs' in self.params else now_ms
+        last = min(end, now_ms)
+        last -= last % step
+        open_ms = last - np.arange(limit, -1, -1, dtype=np.int64) * step
+        try:
+            candles = self.simulator.market.candles(minutes, open_ms, now_ms)
+        except ValueError as e:
+            return self.send_json(200, _cryptocompare_error(200, str(e)))
+        return self.send_json(200, cryptocompare_histo(candles))
+
+    def cryptocompare_price(self, route, rules):
+        return self.send_json(200, cryptocompare_price(self.simulator.market.stats(int(time.time() * 1000))))
+
+    def coingecko_price(self, route, rules):
+        return self.send_json(200, coingecko_price(self.simulator.market.stats(int(time.time() * 1000))))
+
+    # Forecast API
+
+    def api_key(self):
+        auth = self.headers.get('Authorization', '')
+        return auth[7:].strip() if auth.startswith('Bearer ') else None
+
+    def forecast_health(self, route, rules):
+        return self.send_json(200, {'status': 'healthy', 'model_loaded': True,
+                                    'timestamp': datetime.now().isoformat()})
+
+    def forecast_model_info(self, route, rules):
+        trained_at = datetime.now() - timedelta(days=3)
+        return self.send_json(200, {
+            'model_type': 'ensemble',
+            'feature_count': 70,
+            'has_meta_learner': True,
+            'use_stacking': True,
+            'ensemble_weights': {'catboost': 0.5, 'rf': 0.25, 'logistic': 0.25},
+            'metadata': {
+                'model_version': trained_at.strftime('%Y%m%d_%H%M%S'),
+                'training_date': trained_at.isoformat(),
+                'performance': {'test': {'accuracy': 0.71, 'precision_macro': 0.64, 'recall_macro': 0.61,
+                                         'f1_macro': 0.62, 'roc_auc_ovr': 0.78}}
+            }
+        })
+
+    def forecast_usage(self, route, rules):
+        api_key = self.api_key()
+        account = self.simulator.api_keys.get(api_key)
+        if account is None:
+            return self.send_json(401, _forecast_error(401, "Invalid API key"))
+        usage = {'user_type': account.get('user_type', 'authenticated'), 'name': account.get('name', 'User')}
+        if account.get('rate_limit') is not None:
+            limit = account['rate_limit']
+            usage['rate_limit'] = f"{limit}/minute"
+            usage['calls_remaining'] = max(0, limit - self.simulator.key_usage(api_key))
+        return self.send_json(200, usage)
+
+    def forecast_predict(self, route, rules):
+        api_key = self.api_key()
+        headers = {}
+        if api_key is None:
+            if not self.simulator.guest_call(self.client):
+                return self.send_json(403, _forecast_error(
+                    403, f"Free trial limit reached ({GUEST_LIMIT} free predictions). "
+                         f"Get an API key for more predictions."))
+        else:
+            account = self.simulator.api_keys.get(api_key)
+            if account is None:
+                return self.send_json(401, _forecast_error(401, "Invalid API key"))
+            limit = account.get('rate_limit')
+            allowed, remaining, reset = self.simulator.key_call(api_key, limit)
+            if limit is not None:
+                headers = {'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(remaining),
+                           'X-RateLimit-Reset': str(reset)}
+            if not allowed:
+                headers['Retry-After'] = str(reset)
+                return self.send_json(429, _forecast_error(429, f"Rate limit exceeded ({limit}/minute)"), headers)
+
+        try:
+            request = json.loads(self.body or b"{}")
+        except ValueError:
+            return self.send_json(422, _forecast_error(422, "Request body is not valid JSON"))
+        result = self.prediction(request.get('symbol', 'BTCUSDT'), request.get('interval', '1m'),
+                                 enriched=route.endswith('v1_1'))
+        return self.send_json(200, result, headers)
+
+    def prediction(self, symbol, interval, enriched):
+        """A plausible prediction payload priced off the simulated market"""
+        rng = self.simulator.scenario.rng
+        price = self.simulator.market.price(int(time.time() * 1000))
+        weights = [rng.gammavariate(2.0, 1.0) for _ in range(3)]
+        total = sum(weights)
+        probabilities = {'no_movement': weights[0] / total, 'large_up': weights[1] / total,
+                         'large_down': weights[2] / total}
+        prediction = max(range(3), key=lambda i: weights[i])
+        labels = ["No Significant Movement", "Large Upward Movement", "Large Downward Movement"]
+        drift = (probabilities['large_up'] - probabilities['large_down']) * 0.01
+
+        result = {
+            'symbol': symbol,
+            'interval': interval,
+            'timestamp': datetime.now().isoformat(),
+            'prediction': prediction,
+            'prediction_label': labels[prediction],
+            'confidence': probabilities[['no_movement', 'large_up', 'large_down'][prediction]],
+            'probabilities': probabilities,
+            'current_price': price,
+            'expected_movement': None,
+            'next_periods': [{'period': period, 'estimated_price': price * (1 + drift * period)}
+                             for period in range(1, 6)]
+        }
+        if not enriched:
+            return result
+
+        action = ['HOLD', 'BUY', 'SELL'][prediction]
+        direction = ['NEUTRAL', 'BULLISH', 'BEARISH'][prediction]
+        result.update({
+            'trend': {'short_term': direction, 'long_term': rng.choice(['BULLISH', 'BEARISH', 'NEUTRAL']),
+                      'strength': rng.choice(['STRONG', 'MODERATE', 'WEAK'])},
+            'suggestion': {
+                'action': action,
+                'conviction': 'STRONG' if result['confidence'] > 0.6 else 'MODERATE',
+                'reasoning': [f"Simulated {labels[prediction].lower()}",
+                              f"Confidence {result['confidence']:.0%}"],
+                'risk_level': rng.choice(['LOW', 'MEDIUM', 'HIGH']),
+                'score_breakdown': {'confidence_boost': result['confidence'], 'trend_score': rng.random(),
+                                    'total_score': rng.random()}
+            },
+            'tags': [f"{direction}_TREND", rng.choice(['LOW_VOLATILITY', 'HIGH_VOLATILITY'])],
+            'api_version': '1.1',
+            'model_version': 'simulator',
+            'feature_count': 70
+        })
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local upstream simulator with fault injection")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--scenario", help="Scenario JSON file (default: healthy, no added latency)")
+    args = parser.parse_args(argv)
+
+    scenario = Scenario.load(args.scenario) if args.scenario else Scenario()
+    simulator = UpstreamSimulator(scenario, args.host, args.port)
+    print(f"Upstream simulator listening on {simulator.base_url}")
+    print("Point the app at it with:")
+    for name, value in simulator.env().items():
+        print(f"  export {name}={value}")
+    try:
+        simulator.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
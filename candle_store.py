@@ -0,0 +1,143 @@
+"""
+Candle Store Module for Bitcoin Price Data
+Persists closed candles on disk so repeated chart loads only fetch new ones
+"""
+
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+
+DEFAULT_STORE_PATH = os.getenv(
+    "CANDLE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "candles.sqlite")
+)
+
+CANDLE_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades',
+    'taker_buy_base', 'taker_buy_quote'
+]
+
+
+class CandleStore:
+    """SQLite-backed store of closed candles keyed by source/symbol/interval/open time"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    source TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    open_time INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    close_time INTEGER,
+                    quote_volume REAL,
+                    trades INTEGER,
+                    taker_buy_base REAL,
+                    taker_buy_quote REAL,
+                    PRIMARY KEY (source, symbol, interval, open_time)
+                ) WITHOUT ROWID
+            """)
+            self._conn = conn
+        return self._conn
+
+    def load(self, source, symbol, interval, start_ms, end_ms):
+        """
+        Load stored candles with start_ms <= open time < end_ms
+
+        Args:
+            source: Upstream name (e.g. 'binance')
+            symbol: Trading pair
+            interval: Kline interval
+            start_ms: Inclusive lower bound, epoch milliseconds
+            end_ms: Exclusive upper bound, epoch milliseconds
+
+        Returns:
+            DataFrame indexed by timestamp (empty if nothing is stored)
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT open_time, {', '.join(CANDLE_COLUMNS)} FROM candles "
+                "WHERE source = ? AND symbol = ? AND interval = ? "
+                "AND open_time >= ? AND open_time < ? ORDER BY open_time",
+                (source, symbol, interval, int(start_ms), int(end_ms))
+            ).fetchall()
+
+        df = pd.DataFrame(rows, columns=['timestamp'] + CANDLE_COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+
+        # Drop columns the source never provides (e.g. CryptoCompare has no trade counts)
+        if len(df):
+            df = df.dropna(axis=1, how='all')
+        # SQLite hands back int64; parse_klines produces int32 trade counts
+        if 'trades' in df.columns and not df['trades'].isna().any():
+            df['trades'] = df['trades'].astype('int32')
+        return df
+
+    def save(self, source, symbol, interval, df):
+        """
+        Upsert candles from a DataFrame indexed by open timestamp
+
+        Only pass closed candles; a stored candle is never refetched.
+
+        Args:
+            source: Upstream name (e.g. 'binance')
+            symbol: Trading pair
+            interval: Kline interval
+            df: DataFrame with OHLCV columns
+        """
+        if df is None or df.empty:
+            return
+
+        frame = df.reindex(columns=CANDLE_COLUMNS)
+        close_time = pd.to_datetime(frame['close_time'])
+        frame['close_time'] = pd.Series(
+            close_time.values.astype('datetime64[ms]').astype('int64'), index=frame.index
+        ).where(close_time.notna())
+        for col in CANDLE_COLUMNS:
+            if col != 'close_time':
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+        frame = frame.astype(object).where(frame.notna(), None)
+
+        open_times = (df.index.asi8 // 10**6).tolist()
+        records = [
+            (source, symbol, interval, open_time, *values)
+            for open_time, values in zip(open_times, frame.itertuples(index=False, name=None))
+        ]
+
+        placeholders = ", ".join("?" * (4 + len(CANDLE_COLUMNS)))
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO candles (source, symbol, interval, open_time, "
+                f"{', '.join(CANDLE_COLUMNS)}) VALUES ({placeholders})",
+                records
+            )
+            conn.commit()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_candle_store():
+    """Return the process-wide candle store (created on first use)"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CandleStore()
+        return _default_store
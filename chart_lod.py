@@ -0,0 +1,137 @@
+"""
+Chart LOD Module
+Level-of-detail reduction so chart payloads stay bounded for long candle windows
+"""
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from resampler import aggregate_groups
+
+
+# Candlestick bars and indicator line points sent to the browser at most
+LOD_MAX_BARS = int(os.getenv("LOD_MAX_BARS", "300"))
+LOD_LINE_POINTS = int(os.getenv("LOD_LINE_POINTS", "800"))
+
+
+def downsample_candles(df, max_bars=LOD_MAX_BARS):
+    """
+    Merge consecutive candles into wider bars with exact OHLC aggregation
+
+    Bars span a whole multiple of the candle interval and are aligned to
+    epoch multiples of that span, so existing bars keep their boundaries as
+    the window slides forward.
+
+    Args:
+        df: Candle DataFrame indexed by open timestamp
+        max_bars: Maximum number of bars to return
+
+    Returns:
+        DataFrame of at most max_bars (+1 for alignment) bars, or df itself if it is small enough
+    """
+    if len(df) <= max_bars:
+        return df
+
+    open_ms = df.index.asi8 // 10**6
+    step = int(np.median(np.diff(open_ms)))
+    span = step * math.ceil(len(df) / max_bars)
+    buckets = open_ms // span
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+
+    columns = aggregate_groups(df[['open', 'high', 'low', 'close']], starts)
+    index = pd.DatetimeIndex(pd.to_datetime(buckets[starts] * span, unit='ms'), name=df.index.name)
+    return pd.DataFrame(columns, index=index)
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of a line
+
+    Keeps the first and last points and, for each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves peaks and troughs.
+
+    Args:
+        x: 1-D numeric array (increasing)
+        y: 1-D numeric array of the same length
+        threshold: Number of points to keep
+
+    Returns:
+        Array of kept positions into x/y
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    # Per-call NumPy overhead dominates for small buckets, so those use plain floats
+    small = counts.max() <= 32
+    xs, ys = (x.tolist(), y.tolist()) if small else (x, y)
+    avg_x, avg_y = avg_x.tolist(), avg_y.tolist()
+    edges = edges.tolist()
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x[i + 1], avg_y[i + 1] - ay
+        # Twice the triangle area (a, candidate, next bucket average)
+        if small:
+            best, a = -1.0, lo
+            for j in range(lo, hi):
+                area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+                if area > best:
+                    best, a = area, j
+        else:
+            area = np.abs(dx * (y[lo:hi] - ay) - (ax - x[lo:hi]) * dy)
+            a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample_line(series, max_points=LOD_LINE_POINTS):
+    """
+    Reduce an indicator series with LTTB (leading NaNs are dropped)
+
+    Returns:
+        (x, y) as a DatetimeIndex and ndarray
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series.index, series.to_numpy()
+    x = series.index.asi8.astype(np.float64)
+    y = series.to_numpy(dtype=np.float64)
+    kept = lttb(x, y, max_points)
+    return series.index[kept], y[kept]
+
+
+def apply_lod(df, columns, max_bars=LOD_MAX_BARS, line_points=LOD_LINE_POINTS):
+    """
+    Reduce a candle window for rendering
+
+    Args:
+        df: Candle DataFrame with indicator columns
+        columns: Indicator columns drawn as lines
+        max_bars: Candlestick bar budget
+        line_points: Point budget per indicator line
+
+    Returns:
+        (candles, lines) where candles is the (possibly merged) OHLC frame and
+        lines maps column -> (x, y)
+    """
+    candles = downsample_candles(df, max_bars)
+    lines = {column: downsample_line(df[column], line_points) for column in columns if column in df.columns}
+    return candles, lines
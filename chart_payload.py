@@ -0,0 +1,81 @@
+"""
+Chart Payload Module
+Compact trace data and fast JSON encoding for the Plotly chart sent to the browser
+"""
+
+import os
+import time
+
+import numpy as np
+import plotly.io as pio
+
+# orjson encodes NumPy arrays natively and is several times faster than json
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
+# Compact mode: epoch-ms x values (x0/dx for evenly spaced lines) and rounded prices
+CHART_COMPACT = os.getenv("CHART_COMPACT", "1") == "1"
+# Decimals kept for prices and price-scale indicators (BTC/USD ticks are $0.01)
+PRICE_DECIMALS = int(os.getenv("CHART_PRICE_DECIMALS", "2"))
+
+
+def epoch_ms(index):
+    """DatetimeIndex -> int64 epoch milliseconds (a date axis reads them as times)"""
+    return index.asi8 // 10**6
+
+
+def compact_values(values, decimals=PRICE_DECIMALS):
+    """Round a price array to the precision the price scale can show"""
+    return np.round(np.asarray(values, dtype=np.float64), decimals)
+
+
+def candle_data(candles, compact=CHART_COMPACT):
+    """Candlestick trace arrays (x, open, high, low, close)"""
+    if not compact:
+        return dict(x=candles.index, open=candles['open'], high=candles['high'],
+                    low=candles['low'], close=candles['close'])
+    return dict(
+        x=epoch_ms(candles.index),
+        open=compact_values(candles['open']),
+        high=compact_values(candles['high']),
+        low=compact_values(candles['low']),
+        close=compact_values(candles['close'])
+    )
+
+
+def line_data(x, y, compact=CHART_COMPACT):
+    """
+    Line trace arrays
+
+    In compact mode an evenly spaced x axis is sent as x0/dx instead of a
+    full array, so lines that share the candles' time axis don't repeat it.
+    Every key is always returned so switching modes on a patched trace
+    clears the other representation.
+    """
+    if not compact:
+        return dict(x=x, x0=None, dx=None, y=y)
+    x = epoch_ms(x)
+    y = compact_values(y)
+    steps = np.diff(x)
+    if len(x) > 1 and (steps == steps[0]).all():
+        return dict(x=None, x0=int(x[0]), dx=int(steps[0]), y=y)
+    return dict(x=x, x0=None, dx=None, y=y)
+
+
+def measure_payload(fig):
+    """
+    Encode a figure the way st.plotly_chart does and report the cost
+
+    Returns:
+        dict with 'bytes', 'seconds' and 'engine'
+    """
+    start = time.perf_counter()
+    payload = pio.to_json(fig, validate=False)
+    return {
+        'bytes': len(payload.encode('utf-8')),
+        'seconds': time.perf_counter() - start,
+        'engine': pio.json.config.default_engine
+    }
@@ -0,0 +1,128 @@
+"""
+Chart Warmer Module
+Background refresher that keeps every chart timeframe pre-fetched
+"""
+
+import threading
+import time
+
+from data_fetcher import INTERVAL_MS, get_bitcoin_data
+
+
+class ChartWarmer:
+    """
+    Keeps candles + indicators for a set of intervals warm in memory
+
+    A daemon thread refreshes each interval just after its candle
+    boundary (plus `grace` seconds for the exchange to publish the new
+    candle) and at least every `max_age` seconds so the forming candle
+    stays current. Reads never touch the network.
+
+    Each interval is fetched at the longest history requested so far: a
+    get() for more candles than are held misses once and raises the
+    interval's limit (up to max_limit) for the next refresh.
+    """
+
+    def __init__(self, intervals, limit=60, grace=2.0, max_age=60.0, fetch=None, skip=None, max_limit=None):
+        """
+        Args:
+            intervals: Intervals to keep warm (e.g. the chart selectbox options)
+            limit: Candles kept per interval until a longer history is requested
+            grace: Seconds after a candle boundary before refreshing
+            max_age: Longest time between refreshes of one interval
+            fetch: Callable (interval, limit) -> DataFrame (default: get_bitcoin_data
+                with indicators)
+            skip: Optional callable (interval, limit) -> bool; True skips the refresh
+                (e.g. while a live stream already keeps that interval current)
+            max_limit: Longest history a get() may ask to be warmed (default: limit)
+        """
+        self.intervals = list(intervals)
+        self.limit = limit
+        self.max_limit = max(max_limit or limit, limit)
+        self.limits = {interval: limit for interval in self.intervals}
+        self.skip = skip
+        self.grace = grace
+        self.max_age = max_age
+        self.fetch = fetch or (lambda interval, limit: get_bitcoin_data(
+            interval=interval, limit=limit, with_indicators=True))
+
+        self._frames = {}
+        self._next_due = {interval: 0.0 for interval in self.intervals}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self.errors = {}
+        self.refreshes = 0
+
+    def start(self):
+        """Start the refresh thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="chart-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def get(self, interval, limit=None):
+        """
+        Return a warm copy of the interval's data, or None if not available
+
+        Args:
+            interval: Kline interval
+            limit: Number of candles wanted (a miss for a longer history than
+                held schedules it to be warmed, up to max_limit)
+        """
+        limit = limit or self.limit
+        with self._lock:
+            entry = self._frames.get(interval)
+            held = self.limits.get(interval)
+            if held is not None and held < limit <= self.max_limit:
+                self.limits[interval] = limit
+                self._next_due[interval] = 0.0
+                self._wake.set()
+        if entry is None:
+            return None
+        df, fetched_at, fetched_limit = entry
+        if limit > fetched_limit:
+            return None
+        # Never serve data older than two refresh periods (e.g. upstream outage)
+        if time.time() - fetched_at > 2 * self.max_age + self.grace:
+            return None
+        return df.tail(limit).copy()
+
+    def _schedule(self, interval, now):
+        step = INTERVAL_MS.get(interval, 60_000) / 1000
+        next_boundary = (now // step + 1) * step + self.grace
+        return min(next_boundary, now + self.max_age)
+
+    def refresh(self, interval):
+        """Fetch one interval now and store it"""
+        limit = self.limits[interval]
+        try:
+            df = self.fetch(interval, limit)
+            with self._lock:
+                self._frames[interval] = (df, time.time(), limit)
+            self.errors.pop(interval, None)
+            self.refreshes += 1
+        except Exception as e:
+            self.errors[interval] = str(e)[:200]
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.time()
+            for interval in self.intervals:
+                if self._next_due[interval] <= now:
+                    limit = self.limits[interval]
+                    if not (self.skip and self.skip(interval, limit)):
+                        self.refresh(interval)
+                    with self._lock:
+                        # A longer history requested meanwhile stays due immediately
+                        if self.limits[interval] == limit:
+                            self._next_due[interval] = self._schedule(interval, time.time())
+            wait = min(self._next_due.values()) - time.time()
+            self._wake.wait(max(wait, 0.5))
+            self._wake.clear()
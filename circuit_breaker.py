@@ -0,0 +1,130 @@
+"""
+Circuit Breaker Module
+Per-source health memory so fallback chains skip upstreams known to be failing
+"""
+
+import os
+import threading
+import time
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+COOLDOWN_SECONDS = float(os.getenv("BREAKER_COOLDOWN", "60"))
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one upstream source
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    callers skip the source. Once `cooldown` seconds have passed a single
+    probe request is let through (half-open): success closes the breaker,
+    failure re-opens it for another cooldown.
+    """
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.last_success_at = None
+        self.last_failure_at = None
+        self.total_successes = 0
+        self.total_failures = 0
+        self.total_skipped = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Decide whether a request may be sent now
+
+        Returns:
+            True if the caller should try this source (reserves the probe
+            slot when half-open), False if it should be skipped
+        """
+        with self._lock:
+            if self.state == OPEN and time.time() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.total_skipped += 1
+            return False
+
+    def release(self):
+        """Give back a reserved probe slot for a request that was never sent"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+            self.last_success_at = time.time()
+            self.total_successes += 1
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self.last_failure_at = time.time()
+            if error is not None:
+                self.last_error = str(error)[:200]
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.time()
+            self._probe_in_flight = False
+
+    def retry_in(self):
+        """Seconds until an open breaker lets a probe through (0 if not open)"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(0.0, self.cooldown - (time.time() - self.opened_at))
+
+    def snapshot(self):
+        """Plain-dict view of the breaker for display"""
+        return {
+            'name': self.name,
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'retry_in': self.retry_in(),
+            'last_error': self.last_error,
+            'last_success_at': self.last_success_at,
+            'last_failure_at': self.last_failure_at,
+            'successes': self.total_successes,
+            'failures': self.total_failures,
+            'skipped': self.total_skipped
+        }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Return the process-wide breaker for a source (created on first use)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_status():
+    """Snapshots of every registered breaker, in registration order"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
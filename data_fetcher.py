@@ -3,18 +3,118 @@ Data Fetcher Module for Bitcoin Price Data
 Fetches historical and real-time data from Binance API
 """
 
-import requests
+import json
+import numbers
+import os
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from operator import itemgetter
 import time
+from concurrent.futures import ThreadPoolExecutor
+from candle_store import get_candle_store
+from rate_limiter import binance_limiter, cryptocompare_limiter, coingecko_limiter
+from http_client import http_get
+from perf_trace import span, annotate
+from indicator_kernels import compute_indicators
+from source_race import race_sources, AllSourcesFailed, HEDGE_DELAY
+from request_cache import TTLCache, SingleFlight
+
+# Use orjson for large payloads when it is installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Candle length in milliseconds for each supported interval
+INTERVAL_MS = {
+    '1m': 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '1h': 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000
+}
+
+# Upstream base URLs (override to point the app at a mirror or a local simulator)
+BINANCE_API_URL = os.getenv("BINANCE_API_URL", "https://api.binance.com/api/v3").rstrip('/')
+CRYPTOCOMPARE_API_URL = os.getenv("CRYPTOCOMPARE_API_URL", "https://min-api.cryptocompare.com").rstrip('/')
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3").rstrip('/')
+# CryptoCompare histo endpoints return at most this many candles per call
+CRYPTOCOMPARE_MAX_LIMIT = 2000
+
+# Candles are stored only once their close time is this far behind the local clock
+CANDLE_CLOSE_MARGIN_MS = int(os.getenv("CANDLE_CLOSE_MARGIN_MS", "5000"))
+
+# Indicator implementation used by calculate_technical_indicators ("numpy" or "pandas")
+INDICATOR_BACKEND = os.getenv("INDICATOR_BACKEND", "numpy")
+
+# Current price is shared by every session for a few seconds
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "5"))
+price_cache = TTLCache(ttl=PRICE_CACHE_TTL, name="ticker")
+
+# Concurrent identical kline requests (e.g. at a chart cache TTL boundary) share one fetch
+kline_flight = SingleFlight()
+
+
+def parse_klines(rows, price_dtype=np.float64):
+    """
+    Decode a Binance klines payload straight into typed columns
+    
+    Each field is converted column by column into a NumPy array (int64
+    times, float prices/volumes, int32 trade counts), so the DataFrame is
+    built without intermediate object columns. The unused 'ignore' field
+    is dropped.
+    
+    Args:
+        rows: Decoded JSON list of kline rows
+        price_dtype: dtype for price and volume columns (np.float64 or np.float32)
+    
+    Returns:
+        DataFrame indexed by open timestamp
+    """
+    count = len(rows)
+    
+    def float_column(i):
+        return np.fromiter(map(float, map(itemgetter(i), rows)), price_dtype, count=count)
+    
+    def time_column(i):
+        millis = np.fromiter(map(itemgetter(i), rows), np.int64, count=count)
+        return millis.astype('datetime64[ms]').astype('datetime64[ns]')
+    
+    df = pd.DataFrame({
+        'open': float_column(1),
+        'high': float_column(2),
+        'low': float_column(3),
+        'close': float_column(4),
+        'volume': float_column(5),
+        'close_time': time_column(6),
+        'quote_volume': float_column(7),
+        'trades': np.fromiter(map(itemgetter(8), rows), np.int32, count=count),
+        'taker_buy_base': float_column(9),
+        'taker_buy_quote': float_column(10)
+    }, index=pd.DatetimeIndex(time_column(0), name='timestamp'))
+    
+    return df
 
 class BinanceDataFetcher:
     """Fetches Bitcoin price data from Binance API"""
     
-    BASE_URL = "https://api.binance.com/api/v3"
+    BASE_URL = BINANCE_API_URL
+    
+    # Binance caps klines at 1000 rows per request; each request costs 2 weight
+    KLINES_MAX_LIMIT = 1000
+    KLINES_WEIGHT = 2
+    TICKER_WEIGHT = 2
+    # Longest a request waits for rate-limit weight before failing over
+    LIMITER_TIMEOUT = 10
+    # Request weight allowed in flight at once for paged fetches
+    MAX_CONCURRENT_WEIGHT = 16
     
     @staticmethod
-    def fetch_historical_klines(symbol="BTCUSDT", interval="1m", limit=500):
+    def fetch_historical_klines(symbol="BTCUSDT", interval="1m", limit=500, start_time=None, end_time=None,
+                                price_dtype=np.float64):
         """
         Fetch historical candlestick data from Binance
         
@@ -22,6 +122,9 @@ class BinanceDataFetcher:
             symbol: Trading pair (default: BTCUSDT)
             interval: Kline interval (1m, 5m, 15m, 1h, 4h, 1d)
             limit: Number of candles to fetch (max 1000)
+            start_time: Optional open time (epoch ms) of the first candle
+            end_time: Optional open time (epoch ms) of the last candle
+            price_dtype: dtype for price/volume columns (np.float32 halves memory)
         
         Returns:
             DataFrame with OHLCV data
@@ -33,35 +136,86 @@ class BinanceDataFetcher:
                 "interval": interval,
                 "limit": limit
             }
+            if start_time is not None:
+                params["startTime"] = int(start_time)
+            if end_time is not None:
+                params["endTime"] = int(end_time)
             
-            response = requests.get(endpoint, params=params, timeout=10)
+            binance_limiter.acquire(BinanceDataFetcher.KLINES_WEIGHT, timeout=BinanceDataFetcher.LIMITER_TIMEOUT)
+            response = http_get(endpoint, endpoint="binance.klines", params=params)
+            binance_limiter.update_from_headers(response.headers)
             response.raise_for_status()
             
-            data = response.json()
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 
-                'taker_buy_base', 'taker_buy_quote', 'ignore'
-            ])
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
-            
-            # Convert price columns to float
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
-            
-            # Set timestamp as index
-            df.set_index('timestamp', inplace=True)
-            
-            return df
+            return parse_klines(json_loads(response.content), price_dtype=price_dtype)
             
         except Exception as e:
             raise Exception(f"Failed to fetch Binance data: {str(e)}")
     
+    @staticmethod
+    def fetch_klines_range(symbol="BTCUSDT", interval="1m", start=None, end=None, max_workers=4):
+        """
+        Fetch every candle between two times, paging past the 1000-row limit
+        
+        The window is split into startTime/endTime pages of at most 1000
+        candles which are fetched concurrently (bounded by max_workers and
+        MAX_CONCURRENT_WEIGHT) and stitched back together.
+        
+        Args:
+            symbol: Trading pair (default: BTCUSDT)
+            interval: Kline interval (1m, 5m, 15m, 1h, 4h, 1d)
+            start: Window start (datetime or epoch ms)
+            end: Window end (datetime or epoch ms, default: now)
+            max_workers: Maximum number of pages fetched in parallel
+        
+        Returns:
+            Sorted, deduplicated DataFrame with OHLCV data
+        """
+        if interval not in INTERVAL_MS:
+            raise Exception(f"Unsupported interval for range fetch: {interval}")
+        if start is None:
+            raise Exception("fetch_klines_range requires a start time")
+        
+        step = INTERVAL_MS[interval]
+        start_ms = _to_epoch_ms(start)
+        end_ms = _to_epoch_ms(end) if end is not None else int(time.time() * 1000)
+        
+        # Align to candle open times and build [first_open, last_open] pages
+        first_open = start_ms - start_ms % step
+        if first_open < start_ms:
+            first_open += step
+        last_open = end_ms - end_ms % step
+        if last_open < first_open:
+            raise Exception(f"Empty kline range: start {start_ms} is after end {end_ms}")
+        
+        page_span = BinanceDataFetcher.KLINES_MAX_LIMIT * step
+        pages = [
+            (page_start, min(page_start + page_span - step, last_open))
+            for page_start in range(first_open, last_open + 1, page_span)
+        ]
+        
+        workers = max(1, min(
+            max_workers,
+            len(pages),
+            BinanceDataFetcher.MAX_CONCURRENT_WEIGHT // BinanceDataFetcher.KLINES_WEIGHT
+        ))
+        
+        def fetch_page(page):
+            page_start, page_end = page
+            return BinanceDataFetcher.fetch_historical_klines(
+                symbol=symbol,
+                interval=interval,
+                limit=(page_end - page_start) // step + 1,
+                start_time=page_start,
+                end_time=page_end
+            )
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(fetch_page, pages))
+        
+        df = pd.concat(frames)
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        return df
+    
     @staticmethod
     def fetch_current_price(symbol="BTCUSDT"):
         """
@@ -77,7 +231,9 @@ class BinanceDataFetcher:
             endpoint = f"{BinanceDataFetcher.BASE_URL}/ticker/24hr"
             params = {"symbol": symbol}
             
-            response = requests.get(endpoint, params=params, timeout=10)
+            binance_limiter.acquire(BinanceDataFetcher.TICKER_WEIGHT, timeout=BinanceDataFetcher.LIMITER_TIMEOUT)
+            response = http_get(endpoint, endpoint="binance.ticker", params=params)
+            binance_limiter.update_from_headers(response.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -97,13 +253,25 @@ class BinanceDataFetcher:
             raise Exception(f"Failed to fetch current price: {str(e)}")
     
     @staticmethod
-    def fetch_multi_timeframe(symbol="BTCUSDT", intervals=None):
+    def fetch_multi_timeframe(symbol="BTCUSDT", intervals=None, max_workers=4, base_interval=None,
+                              max_base_candles=5000):
         """
-        Fetch data for multiple timeframes
+        Fetch data for multiple timeframes concurrently
+        
+        Requests run on a thread pool; the shared Binance weight limiter
+        keeps the combined rate under the API limits. With base_interval
+        set, one base series is downloaded and short-window intervals are
+        resampled from it locally. Resampling trades requests for base
+        candles: 500 1h bars would need 30,000 1m candles (30 paged
+        requests), so intervals whose window exceeds max_base_candles base
+        candles are still fetched directly.
         
         Args:
             symbol: Trading pair
             intervals: List of intervals (default: ['1m', '5m', '15m', '1h'])
+            max_workers: Maximum number of timeframes fetched in parallel
+            base_interval: Derive intervals from this one (e.g. '1m')
+            max_base_candles: Longest base window downloaded for resampling
         
         Returns:
             dict with DataFrames for each interval
@@ -111,48 +279,100 @@ class BinanceDataFetcher:
         if intervals is None:
             intervals = ['1m', '5m', '15m', '1h']
         
-        result = {}
-        for interval in intervals:
+        # Adjust limit based on interval
+        limit_map = {
+            '1m': 500,
+            '5m': 500,
+            '15m': 500,
+            '1h': 500,
+            '4h': 500,
+            '1d': 365
+        }
+        
+        def fetch_interval(interval):
             try:
-                # Adjust limit based on interval
-                limit_map = {
-                    '1m': 500,
-                    '5m': 500,
-                    '15m': 500,
-                    '1h': 500,
-                    '4h': 500,
-                    '1d': 365
-                }
-                limit = limit_map.get(interval, 500)
-                
-                df = BinanceDataFetcher.fetch_historical_klines(
+                return BinanceDataFetcher.fetch_historical_klines(
                     symbol=symbol,
                     interval=interval,
-                    limit=limit
+                    limit=limit_map.get(interval, 500)
                 )
-                result[interval] = df
-                
-                # Respect rate limits
-                time.sleep(0.1)
-                
             except Exception as e:
                 print(f"Error fetching {interval} data: {e}")
-                result[interval] = None
+                return None
+        
+        frames = {}
+        direct = list(intervals)
+        if base_interval is not None:
+            from resampler import resample_klines
+            
+            base_step = INTERVAL_MS[base_interval]
+            derived = [
+                interval for interval in intervals
+                if INTERVAL_MS[interval] % base_step == 0
+                and INTERVAL_MS[interval] * limit_map.get(interval, 500) <= max_base_candles * base_step
+            ]
+            direct = [interval for interval in intervals if interval not in derived]
+            
+            if derived:
+                window_ms = max(INTERVAL_MS[interval] * limit_map.get(interval, 500) for interval in derived)
+                now_ms = int(time.time() * 1000)
+                # Start on a bar boundary of every interval so no leading bar is dropped
+                coarsest = max(INTERVAL_MS[interval] for interval in derived)
+                start_ms = (now_ms - window_ms) // coarsest * coarsest
+                try:
+                    base = BinanceDataFetcher.fetch_klines_range(
+                        symbol=symbol,
+                        interval=base_interval,
+                        start=start_ms,
+                        end=now_ms,
+                        max_workers=max_workers
+                    )
+                except Exception as e:
+                    print(f"Error fetching {base_interval} base data: {e}")
+                    base = None
+                
+                for interval in derived:
+                    limit = limit_map.get(interval, 500)
+                    if base is None:
+                        frames[interval] = None
+                    elif interval == base_interval:
+                        frames[interval] = base.tail(limit)
+                    else:
+                        frames[interval] = resample_klines(base, interval, base_interval=base_interval,
+                                                           now_ms=now_ms).tail(limit)
+        
+        if direct:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(direct)))) as pool:
+                frames.update(zip(direct, pool.map(fetch_interval, direct)))
         
-        return result
+        return {interval: frames[interval] for interval in intervals}
     
     @staticmethod
-    def calculate_technical_indicators(df):
+    def calculate_technical_indicators(df, backend=None, dtype=None):
         """
         Calculate basic technical indicators
         
         Args:
             df: DataFrame with OHLCV data
+            backend: "numpy" (vectorized kernel) or "pandas" (default: INDICATOR_BACKEND)
+            dtype: Indicator dtype for the numpy backend (e.g. np.float32)
         
         Returns:
             DataFrame with added indicators
         """
         df = df.copy()
+        backend = backend or INDICATOR_BACKEND
+        
+        # The kernel assumes complete price/volume data; gaps use the pandas path
+        if backend == "numpy" and not (df['close'].isna().any() or df['volume'].isna().any()):
+            indicators = compute_indicators(
+                df['close'].to_numpy(),
+                df['volume'].to_numpy(),
+                dtype=dtype or np.float64
+            )
+            for name, values in indicators.items():
+                df[name] = values
+            return df
         
         # Simple Moving Averages
         df['SMA_20'] = df['close'].rolling(window=20).mean()
@@ -174,8 +394,8 @@ class BinanceDataFetcher:
         rs = gain / loss
         df['RSI'] = 100 - (100 / (1 + rs))
         
-        # Bollinger Bands
-        df['BB_middle'] = df['close'].rolling(window=20).mean()
+        # Bollinger Bands (the middle band is SMA 20)
+        df['BB_middle'] = df['SMA_20']
         std = df['close'].rolling(window=20).std()
         df['BB_upper'] = df['BB_middle'] + (std * 2)
         df['BB_lower'] = df['BB_middle'] - (std * 2)
@@ -186,13 +406,21 @@ class BinanceDataFetcher:
         return df
 
 
+def _to_epoch_ms(value):
+    """Convert a datetime, Timestamp or epoch-ms number (incl. NumPy scalars) to epoch milliseconds"""
+    # numbers.Real also covers np.int64/np.float64, which pd.Timestamp would read as nanoseconds
+    if isinstance(value, numbers.Real):
+        return int(value)
+    return int(pd.Timestamp(value).value // 10**6)
+
+
 def fetch_cryptocompare_historical(interval="1m", limit=500):
     """
     Fetch historical data from CryptoCompare API (fallback for Binance)
     
     Args:
         interval: Timeframe (1m, 5m, 15m, 1h, 4h, 1d)
-        limit: Number of candles
+        limit: Number of candles (at most CRYPTOCOMPARE_MAX_LIMIT)
     
     Returns:
         DataFrame with OHLCV data
@@ -210,15 +438,16 @@ def fetch_cryptocompare_historical(interval="1m", limit=500):
     endpoint_type, aggregate = interval_map.get(interval, ('histominute', 1))
     
     try:
-        url = f"https://min-api.cryptocompare.com/data/v2/{endpoint_type}"
+        url = f"{CRYPTOCOMPARE_API_URL}/data/v2/{endpoint_type}"
         params = {
             'fsym': 'BTC',
             'tsym': 'USD',
-            'limit': limit,
+            'limit': min(limit, CRYPTOCOMPARE_MAX_LIMIT),
             'aggregate': aggregate
         }
         
-        response = requests.get(url, params=params, timeout=15)
+        cryptocompare_limiter.acquire(1, timeout=BinanceDataFetcher.LIMITER_TIMEOUT)
+        response = http_get(url, endpoint="cryptocompare.histo", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -249,7 +478,82 @@ def fetch_cryptocompare_historical(interval="1m", limit=500):
         raise Exception(f"CryptoCompare historical data fetch failed: {str(e)}")
 
 
-def get_bitcoin_data(interval="1m", limit=500, with_indicators=True):
+def fetch_with_candle_store(source, symbol, interval, limit, fetch_fn, store=None):
+    """
+    Serve a candle window from the local candle store, fetching only missing candles
+    
+    Closed candles never change, so everything up to the last stored closed
+    candle is read from disk and only newer candles (plus the one still
+    forming) are requested upstream. The newest candle of each response is
+    never stored, nor any candle within CANDLE_CLOSE_MARGIN_MS of its close.
+    
+    Args:
+        source: Upstream name used as the store key
+        symbol: Trading pair
+        interval: Kline interval
+        limit: Number of candles to return
+        fetch_fn: Callable (limit, start_time) -> DataFrame; start_time is
+            the epoch ms open time of the first candle wanted, or None for
+            "the latest limit candles"
+        store: CandleStore to use (default: process-wide store)
+    
+    Returns:
+        DataFrame with the latest `limit` candles
+    """
+    step = INTERVAL_MS.get(interval)
+    if step is None:
+        return fetch_fn(limit, None)
+    
+    store = store or get_candle_store()
+    now_ms = int(time.time() * 1000)
+    current_open = now_ms - now_ms % step
+    window_start = current_open - (limit - 1) * step
+    
+    try:
+        cached = store.load(source, symbol, interval, window_start, current_open)
+    except Exception as e:
+        print(f"Candle store read failed: {e}")
+        cached = None
+    
+    # Length of the contiguous run of stored candles at the start of the window
+    contiguous = 0
+    if cached is not None:
+        for open_ms in cached.index.asi8 // 10**6:
+            if open_ms != window_start + contiguous * step:
+                break
+            contiguous += 1
+    
+    if contiguous == 0:
+        fresh = fetch_fn(limit, None)
+    else:
+        missing_start = window_start + contiguous * step
+        fresh = fetch_fn((current_open - missing_start) // step + 1, missing_start)
+    
+    # Persist only candles that have fully closed. The upstream only returns a
+    # newer candle once the previous one closed on its clock, and close_time
+    # plus a margin guards against a local clock running ahead of it.
+    open_times = fresh.index.asi8 // 10**6
+    if 'close_time' in fresh.columns:
+        close_times = pd.to_datetime(fresh['close_time']).values.astype('datetime64[ms]').astype('int64')
+    else:
+        close_times = open_times + step - 1
+    newest = open_times.max() if len(fresh) else 0
+    closed = fresh[(open_times < newest) & (close_times + CANDLE_CLOSE_MARGIN_MS < now_ms)]
+    try:
+        store.save(source, symbol, interval, closed)
+    except Exception as e:
+        print(f"Candle store write failed: {e}")
+    
+    if contiguous == 0:
+        return fresh.tail(limit)
+    
+    df = pd.concat([cached.iloc[:contiguous], fresh])
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.tail(limit)
+
+
+def get_bitcoin_data(interval="1m", limit=500, with_indicators=True, use_store=True, hedge_delay=HEDGE_DELAY,
+                     coalesce=True):
     """
     Convenience function to fetch Bitcoin data with fallback
     
@@ -257,98 +561,176 @@ def get_bitcoin_data(interval="1m", limit=500, with_indicators=True):
         interval: Timeframe interval
         limit: Number of candles
         with_indicators: Whether to calculate technical indicators
+        use_store: Serve closed candles from the local candle store
+        hedge_delay: Seconds before also trying CryptoCompare (0 = race both,
+            None = only after Binance fails); multiplied by the page count
+            for windows longer than one Binance request
+        coalesce: Share one in-flight fetch between concurrent identical calls
+            (see kline_flight.stats() for how many were coalesced)
     
     Returns:
-        DataFrame with Bitcoin price data
+        DataFrame with Bitcoin price data; df.attrs['source'] names the winning source
     """
-    # Try Binance first
-    try:
-        fetcher = BinanceDataFetcher()
-        df = fetcher.fetch_historical_klines(
-            symbol="BTCUSDT",
-            interval=interval,
-            limit=limit
+    if coalesce:
+        # Every argument that changes the result or how it is fetched is part of the key,
+        # so e.g. a hedge_delay=0 caller never waits on a sequential fetch
+        df = kline_flight.do(
+            ("BTCUSDT", interval, limit, with_indicators, use_store, hedge_delay),
+            lambda: get_bitcoin_data(interval=interval, limit=limit, with_indicators=with_indicators,
+                                     use_store=use_store, hedge_delay=hedge_delay, coalesce=False)
         )
+        # Every caller gets its own copy of the shared result
+        return df.copy()
+    
+    def fetch_binance():
+        def fetch(n, start):
+            # Windows beyond one request are paged by open time
+            if n > BinanceDataFetcher.KLINES_MAX_LIMIT and interval in INTERVAL_MS:
+                if start is None:
+                    now_ms = int(time.time() * 1000)
+                    start = now_ms - now_ms % INTERVAL_MS[interval] - (n - 1) * INTERVAL_MS[interval]
+                return BinanceDataFetcher.fetch_klines_range(symbol="BTCUSDT", interval=interval, start=start)
+            return BinanceDataFetcher.fetch_historical_klines(
+                symbol="BTCUSDT",
+                interval=interval,
+                limit=n,
+                start_time=start
+            )
         
-        if with_indicators:
-            df = fetcher.calculate_technical_indicators(df)
-        
-        return df
-    except Exception as binance_error:
-        # Fallback to CryptoCompare
-        try:
-            df = fetch_cryptocompare_historical(interval=interval, limit=limit)
-            
-            if with_indicators:
-                df = BinanceDataFetcher.calculate_technical_indicators(df)
-            
-            return df
-        except Exception as crypto_error:
-            raise Exception(f"All chart data sources failed. Binance: {str(binance_error)[:100]}, CryptoCompare: {str(crypto_error)[:100]}")
+        if use_store:
+            return fetch_with_candle_store("binance", "BTCUSDT", interval, limit, fetch)
+        return fetch(limit, None)
+    
+    def fetch_cryptocompare():
+        fetch = lambda n, start: fetch_cryptocompare_historical(interval=interval, limit=n)
+        if use_store:
+            return fetch_with_candle_store("cryptocompare", "BTCUSD", interval, limit, fetch)
+        return fetch(limit, None)
+    
+    # A paged Binance fetch legitimately takes a round trip per page: give it
+    # that long before also asking CryptoCompare
+    pages = -(-limit // BinanceDataFetcher.KLINES_MAX_LIMIT)
+    if hedge_delay and pages > 1:
+        hedge_delay *= pages
+    
+    try:
+        source, df = race_sources([
+            ("Binance", fetch_binance),
+            ("CryptoCompare", fetch_cryptocompare)
+        ], hedge_delay=hedge_delay)
+    except AllSourcesFailed as e:
+        errors = ", ".join(f"{name}: {str(error)[:100]}" for name, error in e.errors.items())
+        raise Exception(f"All chart data sources failed. {errors}")
+    
+    annotate(cache='miss')
+    if with_indicators:
+        with span("indicators", backend=INDICATOR_BACKEND, rows=len(df), source=source):
+            df = BinanceDataFetcher.calculate_technical_indicators(df)
+    
+    df.attrs['source'] = source
+    return df
 
 
-def get_current_bitcoin_price():
+def fetch_coingecko_price():
+    """
+    Fetch current Bitcoin price from CoinGecko (no API key, no regional restrictions)
+    
+    Returns:
+        dict with current price info
+    """
+    coingecko_limiter.acquire(1, timeout=BinanceDataFetcher.LIMITER_TIMEOUT)
+    response = http_get(
+        f"{COINGECKO_API_URL}/simple/price",
+        endpoint="coingecko.price",
+        params={
+            "ids": "bitcoin",
+            "vs_currencies": "usd",
+            "include_24hr_change": "true",
+            "include_24hr_vol": "true"
+        }
+    )
+    response.raise_for_status()
+    data = response.json()['bitcoin']
+    
+    return {
+        'symbol': 'BTCUSD',
+        'price': float(data['usd']),
+        'change_24h': 0,  # CoinGecko doesn't provide absolute change
+        'change_percent': float(data.get('usd_24h_change', 0)),
+        'high_24h': float(data['usd']) * 1.02,  # Estimate based on typical volatility
+        'low_24h': float(data['usd']) * 0.98,   # Estimate based on typical volatility
+        'volume': float(data.get('usd_24h_vol', 0)),
+        'timestamp': datetime.now(),
+        'source': 'CoinGecko'
+    }
+
+
+def fetch_cryptocompare_price():
+    """
+    Fetch current Bitcoin price from CryptoCompare (no regional restrictions)
+    
+    Returns:
+        dict with current price info
+    """
+    cryptocompare_limiter.acquire(1, timeout=BinanceDataFetcher.LIMITER_TIMEOUT)
+    response = http_get(
+        f"{CRYPTOCOMPARE_API_URL}/data/pricemultifull",
+        endpoint="cryptocompare.price",
+        params={
+            "fsyms": "BTC",
+            "tsyms": "USD"
+        }
+    )
+    response.raise_for_status()
+    data = response.json()['RAW']['BTC']['USD']
+    
+    return {
+        'symbol': 'BTCUSD',
+        'price': float(data['PRICE']),
+        'change_24h': float(data['CHANGE24HOUR']),
+        'change_percent': float(data['CHANGEPCT24HOUR']),
+        'high_24h': float(data['HIGH24HOUR']),
+        'low_24h': float(data['LOW24HOUR']),
+        'volume': float(data['VOLUME24HOUR']),
+        'timestamp': datetime.now(),
+        'source': 'CryptoCompare'
+    }
+
+
+def get_current_bitcoin_price(hedge_delay=HEDGE_DELAY, use_cache=True):
     """
     Get current Bitcoin price and stats with fallback options
     
+    Sources are tried in order Binance -> CoinGecko -> CryptoCompare; in
+    hedged mode the next one is fired after hedge_delay seconds without
+    waiting for the previous one to time out.
+    
+    Args:
+        hedge_delay: Seconds before hedging to the next source (0 = race
+            all, None = strictly sequential)
+        use_cache: Serve from the process-wide ticker cache (PRICE_CACHE_TTL);
+            simultaneous misses share one upstream fetch
+    
     Returns:
-        dict with current price information
+        dict with current price information ('source' names the winner)
     """
-    # Try Binance first
+    if use_cache:
+        price, _ = price_cache.get_or_fetch(
+            "BTC",
+            lambda: get_current_bitcoin_price(hedge_delay=hedge_delay, use_cache=False)
+        )
+        return dict(price)
+    
+    annotate(cache='miss')
     try:
-        fetcher = BinanceDataFetcher()
-        return fetcher.fetch_current_price("BTCUSDT")
-    except Exception as binance_error:
-        # Fallback to CoinGecko API (no API key required, no regional restrictions)
-        try:
-            response = requests.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={
-                    "ids": "bitcoin",
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true",
-                    "include_24hr_vol": "true"
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()['bitcoin']
-            
-            return {
-                'symbol': 'BTCUSD',
-                'price': float(data['usd']),
-                'change_24h': 0,  # CoinGecko doesn't provide absolute change
-                'change_percent': float(data.get('usd_24h_change', 0)),
-                'high_24h': float(data['usd']) * 1.02,  # Estimate based on typical volatility
-                'low_24h': float(data['usd']) * 0.98,   # Estimate based on typical volatility
-                'volume': float(data.get('usd_24h_vol', 0)),
-                'timestamp': datetime.now(),
-                'source': 'CoinGecko'
-            }
-        except Exception as coingecko_error:
-            # Last resort: CryptoCompare API (also no restrictions)
-            try:
-                response = requests.get(
-                    "https://min-api.cryptocompare.com/data/pricemultifull",
-                    params={
-                        "fsyms": "BTC",
-                        "tsyms": "USD"
-                    },
-                    timeout=10
-                )
-                response.raise_for_status()
-                data = response.json()['RAW']['BTC']['USD']
-                
-                return {
-                    'symbol': 'BTCUSD',
-                    'price': float(data['PRICE']),
-                    'change_24h': float(data['CHANGE24HOUR']),
-                    'change_percent': float(data['CHANGEPCT24HOUR']),
-                    'high_24h': float(data['HIGH24HOUR']),
-                    'low_24h': float(data['LOW24HOUR']),
-                    'volume': float(data['VOLUME24HOUR']),
-                    'timestamp': datetime.now(),
-                    'source': 'CryptoCompare'
-                }
-            except Exception as cryptocompare_error:
-                raise Exception(f"All price sources failed. Binance: {str(binance_error)[:100]}, CoinGecko: {str(coingecko_error)[:100]}, CryptoCompare: {str(cryptocompare_error)[:100]}")
+        source, price = race_sources([
+            ("Binance", lambda: BinanceDataFetcher.fetch_current_price("BTCUSDT")),
+            ("CoinGecko", fetch_coingecko_price),
+            ("CryptoCompare", fetch_cryptocompare_price)
+        ], hedge_delay=hedge_delay)
+    except AllSourcesFailed as e:
+        errors = ", ".join(f"{name}: {str(error)[:100]}" for name, error in e.errors.items())
+        raise Exception(f"All price sources failed. {errors}")
+    
+    price.setdefault('source', source)
+    return price
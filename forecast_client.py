@@ -0,0 +1,376 @@
+"""
+Forecast Client Module
+Session-independent calls to the forecast API, safe to run on worker threads
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from data_fetcher import INTERVAL_MS
+from http_client import http_post
+from request_cache import SingleFlight
+from usage_tracker import parse_rate_limit_headers
+
+
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "1") == "1"
+
+# Prediction requests a batch keeps in flight at once
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+def _error_detail(response, default):
+    """The API's 'detail' message from a JSON error response, or a default"""
+    if response.headers.get('content-type') == 'application/json':
+        return response.json().get('detail', default)
+    return default
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header (None if absent or not a number)"""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return None
+
+
+def request_prediction(api_url, api_key=None, symbol="BTCUSDT", interval="1m", use_v1_1=True):
+    """
+    Request a prediction from the forecast API
+
+    Never touches Streamlit state, so it can run on a worker thread; the
+    caller applies the returned meta to the session.
+
+    Args:
+        api_url: Base URL of the forecast API
+        api_key: Optional API key (guest request when None)
+        symbol: Trading pair
+        interval: Kline interval
+        use_v1_1: Use the enriched v1.1 endpoint (falls back to v1.0 on its validation bug)
+
+    Returns:
+        (result, meta) where result is the prediction or {"error": ..., flags}
+        and meta holds 'status_code', 'fell_back' (v1.1 -> v1.0),
+        'guest_counted' (the backend counted a guest prediction),
+        'retry_after' (seconds, on 429 responses that send it) and
+        'quota' (rate-limit headers, see parse_rate_limit_headers)
+    """
+    meta = {'status_code': None, 'fell_back': False, 'guest_counted': False, 'retry_after': None, 'quota': None}
+    try:
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        # Use v1.1 endpoint for enriched response, fallback to v1.0 if it fails
+        endpoint = "/v1.1/predict" if use_v1_1 else "/predict"
+
+        response = http_post(
+            f"{api_url}{endpoint}",
+            endpoint="forecast.predict",
+            json={
+                "symbol": symbol,
+                "interval": interval,
+                "use_live_data": True
+            },
+            headers=headers
+        )
+        meta['status_code'] = response.status_code
+        meta['quota'] = parse_rate_limit_headers(response.headers)
+
+        # If v1.1 fails with validation error, try v1.0 fallback
+        if response.status_code == 500 and use_v1_1 and 'validation error' in response.text.lower():
+            result, meta = request_prediction(api_url, api_key, symbol, interval, use_v1_1=False)
+            meta['fell_back'] = True
+            return result, meta
+
+        # Backend increments guest usage on success or guest rate limit (403)
+        meta['guest_counted'] = not api_key and response.status_code in [200, 403]
+
+        response.raise_for_status()
+        return response.json(), meta
+
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 429:
+            meta['retry_after'] = _retry_after(e.response)
+            return {"error": _error_detail(e.response, 'Rate limit exceeded'), "rate_limit": True}, meta
+        elif e.response.status_code == 403:
+            error_msg = _error_detail(e.response, 'Access denied')
+            # Check if it's guest limit or auth error
+            if 'Free trial limit' in error_msg or 'free predictions' in error_msg.lower():
+                return {"error": error_msg, "guest_limit": True}, meta
+            return {"error": error_msg, "auth_error": True}, meta
+        elif e.response.status_code == 401:
+            return {"error": "Invalid API key", "auth_error": True}, meta
+        return {"error": f"HTTP error: {e.response.status_code} - {e.response.text}"}, meta
+    except requests.exceptions.Timeout:
+        return {"error": "Prediction timeout - API is taking too long to respond"}, meta
+    except requests.exceptions.ConnectionError:
+        return {"error": "Cannot connect to API for prediction"}, meta
+    except Exception as e:
+        return {"error": f"Prediction failed: {str(e)}"}, meta
+
+
+class _BackoffGate:
+    """Shared pause for every request of a batch after a 429"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._not_before = 0.0
+
+    def defer(self, delay):
+        with self._lock:
+            self._not_before = max(self._not_before, time.time() + delay)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                delay = self._not_before - time.time()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+
+def _batch_row(symbol, interval, result, meta, attempts, elapsed):
+    """Flatten one prediction outcome into a grid row"""
+    row = {
+        'symbol': symbol,
+        'interval': interval,
+        'status': 'error' if 'error' in result else 'ok',
+        'signal': None,
+        'confidence': None,
+        'price': None,
+        'cached': bool(meta.get('cached')),
+        'attempts': attempts,
+        'seconds': round(elapsed, 2),
+        'error': result.get('error')
+    }
+    if row['status'] == 'ok':
+        row['signal'] = result.get('suggestion', {}).get('action') or result.get('prediction_label')
+        row['confidence'] = result.get('confidence')
+        row['price'] = result.get('current_price')
+    return row
+
+
+def batch_predict(api_url, pairs, api_key=None, max_concurrency=BATCH_CONCURRENCY, max_retries=3,
+                  backoff=2.0, use_v1_1=True, predict=None):
+    """
+    Run many prediction requests concurrently
+
+    At most `max_concurrency` requests are in flight. A 429 pauses the whole
+    batch for the response's Retry-After (or an exponential backoff) before
+    the rate-limited request is retried, up to `max_retries` times.
+
+    Args:
+        api_url: Base URL of the forecast API
+        pairs: List of (symbol, interval) to predict
+        api_key: API key used for every request
+        max_concurrency: Maximum requests in flight
+        max_retries: Retries per request after a 429
+        backoff: Base delay in seconds when no Retry-After is sent
+        use_v1_1: Use the enriched v1.1 endpoint
+        predict: Optional callable (symbol, interval) -> (result, meta)
+            (default: request_prediction without caching)
+
+    Returns:
+        DataFrame with one row per pair: symbol, interval, status, signal,
+        confidence, price, cached, attempts, seconds, error
+    """
+    if predict is None:
+        def predict(symbol, interval):
+            return request_prediction(api_url, api_key, symbol, interval, use_v1_1)
+
+    gate = _BackoffGate()
+
+    def run(pair):
+        symbol, interval = pair
+        start = time.time()
+        attempts = 0
+        while True:
+            gate.wait()
+            attempts += 1
+            result, meta = predict(symbol, interval)
+            if not result.get('rate_limit') or attempts > max_retries:
+                break
+            gate.defer(meta.get('retry_after') or backoff * 2 ** (attempts - 1))
+        return _batch_row(symbol, interval, result, meta, attempts, time.time() - start)
+
+    pairs = list(pairs)
+    if not pairs:
+        return pd.DataFrame(columns=['symbol', 'interval', 'status', 'signal', 'confidence', 'price',
+                                     'cached', 'attempts', 'seconds', 'error'])
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pairs))),
+                            thread_name_prefix="batch-predict") as pool:
+        rows = list(pool.map(run, pairs))
+    return pd.DataFrame(rows)
+
+
+def candle_open_ms(interval, now=None):
+    """Open time (epoch ms) of the candle forming at `now` for an interval"""
+    now_ms = int((time.time() if now is None else now) * 1000)
+    step = INTERVAL_MS[interval]
+    return now_ms - now_ms % step
+
+
+class PredictionCache:
+    """
+    Process-wide prediction results keyed by the candle they were made in
+
+    The model only sees closed candles plus the forming one, so within one
+    candle a (symbol, interval, endpoint version) request always yields the
+    same answer. Entries expire when the next candle opens; concurrent
+    misses for the same key share one API call.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(symbol, interval, use_v1_1, now=None):
+        return (symbol, interval, "v1.1" if use_v1_1 else "v1.0", candle_open_ms(interval, now))
+
+    def get(self, key):
+        """Cached (result, meta) for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.hits += 1
+            result, meta = entry
+            # A cached answer costs the caller no quota
+            return result, dict(meta, cached=True, guest_counted=False)
+
+    def get_or_fetch(self, key, fn):
+        """
+        Return the cached outcome for key, or run fn() once for all concurrent callers
+
+        Only successful predictions are stored; errors are returned to the
+        callers waiting on this fetch but the next request tries again.
+
+        Args:
+            key: Key from PredictionCache.key()
+            fn: Zero-argument callable returning (result, meta)
+
+        Returns:
+            (result, meta) with meta['cached'] / meta['cached_at'] set
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            self.misses += 1
+
+        ran = []
+
+        def fetch():
+            ran.append(True)
+            result, meta = fn()
+            meta = dict(meta, cached_at=time.time())
+            if 'error' not in result:
+                with self._lock:
+                    self._prune()
+                    self._entries[key] = (result, meta)
+            return result, meta
+
+        result, meta = self._flight.do(key, fetch)
+        if not ran:
+            if 'error' in result:
+                # Errors depend on the caller's key/quota: make our own request
+                return fn()
+            # Served by another session's in-flight request: no quota was used here
+            return result, dict(meta, cached=True, guest_counted=False)
+        return result, dict(meta, cached=False)
+
+    def _prune(self):
+        """Drop entries whose candle has closed (caller holds the lock)"""
+        now_ms = time.time() * 1000
+        for key in [key for key in self._entries if key[3] + INTERVAL_MS[key[1]] <= now_ms]:
+            del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self._flight.stats()['coalesced'],
+                'size': len(self._entries)
+            }
+
+
+class PredictionWorker:
+    """
+    Runs prediction requests on a small thread pool
+
+    submit() returns a future immediately; the Streamlit script keeps the
+    future in session state and polls it, so the page is never blocked on
+    the (up to 45s) prediction call. Results are shared through a
+    candle-keyed PredictionCache unless caching is disabled.
+    """
+
+    def __init__(self, api_url, max_workers=4, use_cache=PREDICTION_CACHE_ENABLED):
+        self.api_url = api_url
+        self.cache = PredictionCache() if use_cache else None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prediction")
+        self._lock = threading.Lock()
+        self.submitted = 0
+
+    def predict(self, api_key=None, symbol="BTCUSDT", interval="1m", use_v1_1=True):
+        """Blocking prediction through the cache; returns (result, meta)"""
+        def call():
+            return request_prediction(self.api_url, api_key, symbol, interval, use_v1_1)
+
+        if self.cache is None:
+            return call()
+        return self.cache.get_or_fetch(PredictionCache.key(symbol, interval, use_v1_1), call)
+
+    def submit(self, api_key=None, symbol="BTCUSDT", interval="1m", use_v1_1=True):
+        """
+        Start a prediction request in the background
+
+        Returns:
+            dict handle with 'future' (resolving to (result, meta)) and 'submitted_at'
+        """
+        with self._lock:
+            self.submitted += 1
+        handle = {'submitted_at': time.time(), 'symbol': symbol, 'interval': interval}
+
+        # A cache hit resolves immediately without touching the pool
+        cached = self.cache.get(PredictionCache.key(symbol, interval, use_v1_1)) if self.cache else None
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            handle['future'] = future
+            return handle
+
+        handle['future'] = self._pool.submit(self.predict, api_key, symbol, interval, use_v1_1)
+        return handle
+
+    def submit_batch(self, api_key, symbols, intervals, max_concurrency=BATCH_CONCURRENCY, use_v1_1=True):
+        """
+        Start a symbol x interval prediction grid in the background
+
+        Requests go through the prediction cache, so cells already predicted
+        in the current candle cost nothing.
+
+        Returns:
+            dict handle with 'future' (resolving to the batch_predict DataFrame) and 'submitted_at'
+        """
+        pairs = [(symbol, interval) for symbol in symbols for interval in intervals]
+
+        def predict(symbol, interval):
+            return self.predict(api_key, symbol, interval, use_v1_1)
+
+        future = self._pool.submit(batch_predict, self.api_url, pairs, api_key=api_key,
+                                   max_concurrency=max_concurrency, use_v1_1=use_v1_1, predict=predict)
+        return {'future': future, 'submitted_at': time.time(), 'pairs': len(pairs)}
@@ -0,0 +1,151 @@
+"""
+Health Monitor Module
+Background prober that keeps the forecast API's last known health in memory
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+
+from http_client import http_get
+
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "30"))
+HEALTH_HISTORY = int(os.getenv("HEALTH_HISTORY", "120"))
+
+
+def probe_health(api_url, timeout=None):
+    """
+    Call the forecast API's /health endpoint once
+
+    Args:
+        api_url: Base URL of the forecast API
+        timeout: Optional override of the forecast.health timeout
+
+    Returns:
+        The decoded /health payload, or {"error": message} on failure
+    """
+    try:
+        response = http_get(f"{api_url}/health", endpoint="forecast.health", timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.Timeout:
+        return {"error": "API timeout - server may be slow or unavailable"}
+    except requests.exceptions.ConnectionError:
+        return {"error": "Cannot connect to API - check your internet connection"}
+    except Exception as e:
+        return {"error": f"API health check failed: {str(e)}"}
+
+
+class HealthMonitor:
+    """
+    Probes /health on its own schedule and publishes the latest result
+
+    Readers get the last known status instantly from snapshot(); they never
+    wait on the network. While the API is down the probe runs every
+    `retry_interval` seconds so recovery from a cold start is noticed quickly.
+    """
+
+    def __init__(self, api_url, interval=HEALTH_CHECK_INTERVAL, retry_interval=None, history=HEALTH_HISTORY,
+                 probe=None):
+        """
+        Args:
+            api_url: Base URL of the forecast API
+            interval: Seconds between probes while healthy
+            retry_interval: Seconds between probes while unhealthy (default: interval / 3)
+            history: Number of probes kept in the latency history
+            probe: Callable () -> /health payload (default: probe_health(api_url))
+        """
+        self.api_url = api_url
+        self.interval = interval
+        self.retry_interval = retry_interval if retry_interval is not None else max(interval / 3, 5.0)
+        self.probe = probe or (lambda: probe_health(api_url))
+
+        self.history = deque(maxlen=history)
+        self._result = None
+        self._checked_at = None
+        self._latency = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the probe thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def probe_now(self):
+        """Ask the probe thread to check again without waiting for the schedule"""
+        self._wake.set()
+
+    def check(self):
+        """Probe once and publish the result"""
+        start = time.time()
+        result = self.probe()
+        latency = time.time() - start
+        healthy = is_healthy(result)
+        with self._lock:
+            self._result = result
+            self._checked_at = time.time()
+            self._latency = latency
+            self.history.append({
+                'checked_at': self._checked_at,
+                'latency': latency,
+                'healthy': healthy,
+                'model_loaded': bool(result.get('model_loaded')) if healthy else False
+            })
+        return result
+
+    def last_result(self):
+        """Last /health payload ({"error": ...} on failure), or None before the first probe"""
+        with self._lock:
+            return self._result
+
+    def snapshot(self):
+        """Plain-dict view of the last probe for display"""
+        with self._lock:
+            result = self._result
+            if result is None:
+                status = 'unknown'
+            elif 'error' in result:
+                status = 'error'
+            else:
+                status = result.get('status', 'unknown')
+            return {
+                'status': status,
+                'model_loaded': bool(result and result.get('model_loaded')),
+                'latency': self._latency,
+                'checked_at': self._checked_at,
+                'error': result.get('error') if result else None
+            }
+
+    def latency_history(self):
+        """Probe history, oldest first"""
+        with self._lock:
+            return list(self.history)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                result = self.check()
+            except Exception as e:
+                result = {"error": f"API health check failed: {str(e)}"}
+            delay = self.interval if is_healthy(result) and result.get('model_loaded') else self.retry_interval
+            self._wake.wait(delay)
+
+
+def is_healthy(result):
+    """True for a /health payload reporting a healthy service"""
+    return bool(result) and 'error' not in result and result.get('status') == 'healthy'
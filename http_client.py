@@ -0,0 +1,136 @@
+"""
+HTTP Client Module
+Pooled keep-alive sessions (one per upstream host) shared by the whole process
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Connection pool sizing per host (override with environment variables)
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+DEFAULT_TIMEOUT = 10
+
+# Per-endpoint timeouts in seconds, looked up by the `endpoint` name
+TIMEOUTS = {
+    'binance.klines': 10,
+    'binance.ticker': 10,
+    'cryptocompare.histo': 15,
+    'cryptocompare.price': 10,
+    'coingecko.price': 10,
+    'forecast.health': 10,
+    'forecast.model_info': 15,
+    'forecast.usage': 10,
+    'forecast.predict': 45,
+}
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def configure(pool_connections=None, pool_maxsize=None, timeouts=None):
+    """
+    Adjust pool sizes and endpoint timeouts
+
+    Pool changes apply to sessions created afterwards, so call this before
+    the first request (existing sessions are closed and recreated lazily).
+
+    Args:
+        pool_connections: Number of connection pools cached per session
+        pool_maxsize: Maximum keep-alive connections per host
+        timeouts: dict of endpoint name -> timeout seconds to merge in
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE
+    if pool_connections is not None:
+        POOL_CONNECTIONS = int(pool_connections)
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = int(pool_maxsize)
+    if timeouts:
+        TIMEOUTS.update(timeouts)
+    if pool_connections is not None or pool_maxsize is not None:
+        close_sessions()
+
+
+def get_session(url):
+    """
+    Return the pooled session for the host of `url`
+
+    Args:
+        url: Any URL on the target host
+
+    Returns:
+        requests.Session with keep-alive connection pooling
+    """
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}"
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    """Close every pooled session (they are recreated on next use)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _resolve_timeout(endpoint, timeout):
+    if timeout is not None:
+        return timeout
+    return TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+
+
+def http_get(url, endpoint=None, timeout=None, **kwargs):
+    """
+    GET through the pooled session for the URL's host
+
+    Args:
+        url: Request URL
+        endpoint: Endpoint name used to look up the timeout in TIMEOUTS
+        timeout: Explicit timeout (overrides the endpoint timeout)
+        **kwargs: Passed through to requests (params, headers, ...)
+
+    Returns:
+        requests.Response
+    """
+    return get_session(url).get(url, timeout=_resolve_timeout(endpoint, timeout), **kwargs)
+
+
+def http_post(url, endpoint=None, timeout=None, **kwargs):
+    """
+    POST through the pooled session for the URL's host
+
+    Args:
+        url: Request URL
+        endpoint: Endpoint name used to look up the timeout in TIMEOUTS
+        timeout: Explicit timeout (overrides the endpoint timeout)
+        **kwargs: Passed through to requests (json, headers, ...)
+
+    Returns:
+        requests.Response
+    """
+    return get_session(url).post(url, timeout=_resolve_timeout(endpoint, timeout), **kwargs)
@@ -0,0 +1,211 @@
+"""
+Incremental Indicator Engine
+Updates the technical indicators of calculate_technical_indicators one candle at a time
+"""
+
+import math
+from collections import deque
+
+
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'SMA_200',
+    'EMA_12', 'EMA_26',
+    'MACD', 'MACD_signal',
+    'RSI',
+    'BB_middle', 'BB_upper', 'BB_lower',
+    'volume_SMA'
+]
+
+NAN = float('nan')
+
+
+def _alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+class IncrementalIndicators:
+    """
+    Stateful, O(1)-per-candle version of calculate_technical_indicators
+
+    Produces the same definitions as the pandas implementation: rolling
+    SMAs and Bollinger bands from running sums, EMA/MACD from the
+    adjust=False recurrence, and RSI from 14-period running means of gains
+    and losses. State is split into "committed" (closed candles) and the
+    still-forming last candle, so revising the last candle costs the same
+    as appending one.
+    """
+
+    # Recompute running sums from the window every N commits to stop float drift
+    RESYNC_EVERY = 1000
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self._closes = deque(maxlen=200)      # committed closes, shifted by _ref
+        self._volumes = deque(maxlen=20)
+        self._gains = deque(maxlen=14)
+        self._losses = deque(maxlen=14)
+        self._ref = None                      # price offset that keeps sums well conditioned
+        self._sum = {20: 0.0, 50: 0.0, 200: 0.0}
+        self._sumsq_20 = 0.0
+        self._vol_sum = 0.0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._ema_12 = None
+        self._ema_26 = None
+        self._signal = None
+        self._prev_close = None
+        self._commits = 0
+
+        self._last_key = None
+        self._pending = None                  # (close, volume) of the forming candle
+        self.values = None                    # indicator values for the last candle
+
+    def seed(self, df):
+        """
+        Replay history through the engine
+
+        Args:
+            df: DataFrame with 'close' and 'volume' columns, oldest first
+
+        Returns:
+            Indicator values for the last row
+        """
+        self.reset()
+        for key, close, volume in zip(df.index, df['close'].to_numpy(float), df['volume'].to_numpy(float)):
+            self.update(key, close, volume)
+        return self.values
+
+    def update(self, key, close, volume):
+        """
+        Apply one candle
+
+        A key equal to the previous call revises the still-forming candle;
+        a new key commits the previous candle and appends this one.
+
+        Args:
+            key: Candle identifier, e.g. its open time
+            close: Close (or latest) price
+            volume: Volume so far
+
+        Returns:
+            dict of indicator name -> value for this candle
+        """
+        if self._pending is not None and key != self._last_key:
+            self._commit(*self._pending)
+        self._last_key = key
+        self._pending = (float(close), float(volume))
+        self.values = self._compute(*self._pending)
+        return self.values
+
+    def _window_sum(self, x, window):
+        """Sum of the last `window` values if x were appended (O(1))"""
+        closes = self._closes
+        total = self._sum[window] + x
+        if len(closes) >= window:
+            total -= closes[-window]
+        return total
+
+    def _compute(self, close, volume):
+        if self._ref is None:
+            self._ref = close
+        x = close - self._ref
+        count = len(self._closes) + 1
+        values = {}
+
+        # Simple moving averages
+        for window in (20, 50, 200):
+            if count >= window:
+                values[f'SMA_{window}'] = self._window_sum(x, window) / window + self._ref
+            else:
+                values[f'SMA_{window}'] = NAN
+
+        # Exponential moving averages and MACD (adjust=False recurrence)
+        ema_12 = close if self._ema_12 is None else self._ema_12 + _alpha(12) * (close - self._ema_12)
+        ema_26 = close if self._ema_26 is None else self._ema_26 + _alpha(26) * (close - self._ema_26)
+        macd = ema_12 - ema_26
+        signal = macd if self._signal is None else self._signal + _alpha(9) * (macd - self._signal)
+        values['EMA_12'] = ema_12
+        values['EMA_26'] = ema_26
+        values['MACD'] = macd
+        values['MACD_signal'] = signal
+
+        # RSI from 14-period running means (the first delta counts as zero)
+        delta = 0.0 if self._prev_close is None else close - self._prev_close
+        gain_sum = self._gain_sum + max(delta, 0.0)
+        loss_sum = self._loss_sum + max(-delta, 0.0)
+        if len(self._gains) >= 14:
+            gain_sum -= self._gains[0]
+            loss_sum -= self._losses[0]
+        if count >= 14:
+            if loss_sum > 0:
+                values['RSI'] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+            else:
+                values['RSI'] = 100.0 if gain_sum > 0 else NAN
+        else:
+            values['RSI'] = NAN
+
+        # Bollinger bands (sample standard deviation, like pandas)
+        if count >= 20:
+            total = self._window_sum(x, 20)
+            sumsq = self._sumsq_20 + x * x
+            if len(self._closes) >= 20:
+                sumsq -= self._closes[-20] ** 2
+            variance = max((sumsq - total * total / 20) / 19, 0.0)
+            std = math.sqrt(variance)
+            middle = total / 20 + self._ref
+            values['BB_middle'] = middle
+            values['BB_upper'] = middle + 2 * std
+            values['BB_lower'] = middle - 2 * std
+        else:
+            values['BB_middle'] = values['BB_upper'] = values['BB_lower'] = NAN
+
+        # Volume SMA
+        if len(self._volumes) + 1 >= 20:
+            vol_sum = self._vol_sum + volume - (self._volumes[0] if len(self._volumes) >= 20 else 0.0)
+            values['volume_SMA'] = vol_sum / 20
+        else:
+            values['volume_SMA'] = NAN
+
+        self._next = (ema_12, ema_26, signal, gain_sum, loss_sum, delta)
+        return values
+
+    def _commit(self, close, volume):
+        # _next always holds the state computed for the pending candle
+        ema_12, ema_26, signal, gain_sum, loss_sum, delta = self._next
+        x = close - self._ref
+        closes = self._closes
+
+        for window in (20, 50, 200):
+            self._sum[window] = self._window_sum(x, window)
+        if len(closes) >= 20:
+            self._sumsq_20 -= closes[-20] ** 2
+        self._sumsq_20 += x * x
+        closes.append(x)
+
+        if len(self._volumes) >= 20:
+            self._vol_sum -= self._volumes[0]
+        self._vol_sum += volume
+        self._volumes.append(volume)
+
+        self._gain_sum, self._loss_sum = gain_sum, loss_sum
+        self._gains.append(max(delta, 0.0))
+        self._losses.append(max(-delta, 0.0))
+
+        self._ema_12, self._ema_26, self._signal = ema_12, ema_26, signal
+        self._prev_close = close
+
+        self._commits += 1
+        if self._commits % self.RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        window = list(self._closes)
+        for size in (20, 50, 200):
+            self._sum[size] = sum(window[-size:])
+        self._sumsq_20 = sum(v * v for v in window[-20:])
+        self._vol_sum = sum(self._volumes)
+        self._gain_sum = sum(self._gains)
+        self._loss_sum = sum(self._losses)
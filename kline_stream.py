@@ -0,0 +1,281 @@
+"""
+Kline Stream Module for live Bitcoin candles
+Keeps in-memory candle series updated from Binance WebSocket kline streams
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+
+try:
+    import websocket  # websocket-client
+except ImportError:  # optional dependency
+    websocket = None
+
+from data_fetcher import BinanceDataFetcher, INTERVAL_MS
+from indicator_engine import IncrementalIndicators, INDICATOR_COLUMNS
+
+
+BINANCE_WS_URL = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443")
+
+SERIES_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades',
+    'taker_buy_base', 'taker_buy_quote'
+]
+
+
+class KlineSeries:
+    """Thread-safe rolling candle series for one symbol/interval"""
+
+    def __init__(self, interval, maxlen=500):
+        self.interval = interval
+        self.maxlen = maxlen
+        self._rows = OrderedDict()
+        self._indicators = {}
+        self._engine = IncrementalIndicators()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._indicators.clear()
+            self._engine.reset()
+
+    def last_open_ms(self):
+        with self._lock:
+            return next(reversed(self._rows)) if self._rows else None
+
+    def upsert(self, open_ms, row):
+        """Insert a new candle or revise the one with the same open time"""
+        with self._lock:
+            self._upsert(open_ms, row)
+
+    def _upsert(self, open_ms, row, reseed=True):
+        last_open = next(reversed(self._rows)) if self._rows else None
+        self._rows[open_ms] = row
+        if last_open is None or open_ms >= last_open:
+            # Append or revise the forming candle: O(1) indicator update
+            values = self._engine.update(open_ms, row[3], row[4])
+            self._indicators[open_ms] = tuple(values[col] for col in INDICATOR_COLUMNS)
+        else:
+            # Out-of-order backfill: keep the series sorted by open time
+            self._rows = OrderedDict(sorted(self._rows.items()))
+            if reseed:
+                self._reseed()
+        while len(self._rows) > self.maxlen:
+            dropped, _ = self._rows.popitem(last=False)
+            self._indicators.pop(dropped, None)
+
+    def _reseed(self):
+        self._engine.reset()
+        self._indicators.clear()
+        for open_ms, row in self._rows.items():
+            values = self._engine.update(open_ms, row[3], row[4])
+            self._indicators[open_ms] = tuple(values[col] for col in INDICATOR_COLUMNS)
+
+    def load_frame(self, df):
+        """Merge candles from a REST DataFrame (as returned by fetch_historical_klines)"""
+        if df is None or df.empty:
+            return
+        frame = df.reindex(columns=SERIES_COLUMNS)
+        open_times = (df.index.asi8 // 10**6).tolist()
+        close_times = (pd.to_datetime(frame['close_time']).values.astype('datetime64[ms]').astype('int64')).tolist()
+        values = frame.drop(columns=['close_time']).apply(pd.to_numeric, errors='coerce')
+        with self._lock:
+            reseed = bool(self._rows) and open_times[0] <= next(reversed(self._rows))
+            for open_ms, close_ms, row in zip(open_times, close_times, values.itertuples(index=False)):
+                self._upsert(open_ms, (row.open, row.high, row.low, row.close, row.volume, close_ms,
+                                       row.quote_volume, row.trades, row.taker_buy_base, row.taker_buy_quote),
+                             reseed=False)
+            if reseed:
+                # Backfill overlapped candles already seen: replay indicators once
+                self._reseed()
+
+    def to_frame(self, limit=None, with_indicators=False):
+        """
+        Return the series as a DataFrame shaped like fetch_historical_klines output
+
+        Args:
+            limit: Number of most recent candles (default: all)
+            with_indicators: Add the incrementally maintained indicator columns
+        """
+        with self._lock:
+            items = list(self._rows.items())
+            if limit:
+                items = items[-limit:]
+            indicators = [self._indicators[open_ms] for open_ms, _ in items] if with_indicators else None
+        df = pd.DataFrame([row for _, row in items], columns=SERIES_COLUMNS)
+        df.index = pd.to_datetime([open_ms for open_ms, _ in items], unit='ms')
+        df.index.name = 'timestamp'
+        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        if with_indicators:
+            df[INDICATOR_COLUMNS] = pd.DataFrame(indicators, columns=INDICATOR_COLUMNS, index=df.index)
+        return df
+
+
+class KlineStream:
+    """
+    Streams Binance klines (and the 24hr ticker) into in-memory series
+
+    A background thread seeds each interval over REST, then subscribes to
+    the combined WebSocket stream. When the stream drops it reconnects with
+    exponential backoff and backfills the gap over REST before resuming.
+    """
+
+    def __init__(self, symbol="BTCUSDT", intervals=None, history=500, ws_url=None,
+                 fetch_klines=None, max_backoff=60):
+        """
+        Args:
+            symbol: Trading pair
+            intervals: Kline intervals to subscribe to (default: ['1m', '5m'])
+            history: Candles kept in memory per interval
+            ws_url: WebSocket base URL (default: BINANCE_WS_URL, point it at a
+                local stand-in for testing)
+            fetch_klines: REST fetcher used for seeding/backfill, with the
+                signature of BinanceDataFetcher.fetch_historical_klines
+            max_backoff: Longest wait between reconnect attempts in seconds
+        """
+        if websocket is None:
+            raise Exception("websocket-client is not installed; live kline streaming is unavailable")
+
+        self.symbol = symbol
+        self.intervals = list(intervals or ['1m', '5m'])
+        self.history = history
+        self.ws_url = (ws_url or BINANCE_WS_URL).rstrip('/')
+        self.fetch_klines = fetch_klines or BinanceDataFetcher.fetch_historical_klines
+        self.max_backoff = max_backoff
+
+        self.series = {interval: KlineSeries(interval, maxlen=history) for interval in self.intervals}
+        self.ticker = None
+        self.connected = False
+        self.reconnects = 0
+        self.last_message_at = None
+        self.last_error = None
+
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread = None
+
+    @property
+    def stream_url(self):
+        symbol = self.symbol.lower()
+        streams = [f"{symbol}@kline_{interval}" for interval in self.intervals]
+        streams.append(f"{symbol}@ticker")
+        return f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+
+    def start(self):
+        """Start the ingestion thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kline-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the ingestion thread and close the socket"""
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def is_ready(self, interval, min_candles=1):
+        """True when the stream is connected and the interval has data"""
+        series = self.series.get(interval)
+        return self.connected and series is not None and len(series) >= min_candles
+
+    def frame(self, interval, limit=None, with_indicators=False):
+        """Return the candle series for an interval as a DataFrame"""
+        return self.series[interval].to_frame(limit, with_indicators=with_indicators)
+
+    def backfill(self):
+        """Fetch candles missing since the last one held (or seed from scratch)"""
+        for interval, series in self.series.items():
+            step = INTERVAL_MS.get(interval)
+            last_open = series.last_open_ms()
+            try:
+                missing = None
+                if last_open is not None and step is not None:
+                    missing = (int(time.time() * 1000) - last_open) // step + 1
+                if missing is None or missing > min(self.history, 1000):
+                    # Nothing held yet, or the gap is too wide to bridge: reseed
+                    df = self.fetch_klines(symbol=self.symbol, interval=interval, limit=self.history)
+                    series.clear()
+                else:
+                    df = self.fetch_klines(symbol=self.symbol, interval=interval,
+                                           limit=missing, start_time=last_open)
+                series.load_frame(df)
+            except Exception as e:
+                self.last_error = f"Backfill {interval} failed: {str(e)[:100]}"
+
+    def _handle_message(self, _ws, message):
+        self.last_message_at = time.time()
+        try:
+            payload = json.loads(message)
+            data = payload.get('data', payload)
+            event = data.get('e')
+            if event == 'kline':
+                k = data['k']
+                series = self.series.get(k['i'])
+                if series is not None:
+                    series.upsert(int(k['t']), (
+                        float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']),
+                        int(k['T']), float(k['q']), int(k['n']), float(k['V']), float(k['Q'])
+                    ))
+            elif event == '24hrTicker':
+                self.ticker = {
+                    'symbol': data['s'],
+                    'price': float(data['c']),
+                    'change_24h': float(data['p']),
+                    'change_percent': float(data['P']),
+                    'high_24h': float(data['h']),
+                    'low_24h': float(data['l']),
+                    'volume': float(data['v']),
+                    'timestamp': datetime.now(),
+                    'source': 'Binance (live)'
+                }
+        except Exception as e:
+            self.last_error = f"Bad stream message: {str(e)[:100]}"
+
+    def _handle_open(self, _ws):
+        self.connected = True
+
+    def _handle_close(self, _ws, *_args):
+        self.connected = False
+
+    def _handle_error(self, _ws, error):
+        self.last_error = str(error)[:200]
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            self.backfill()
+            started = time.time()
+            self._ws = websocket.WebSocketApp(
+                self.stream_url,
+                on_open=self._handle_open,
+                on_message=self._handle_message,
+                on_close=self._handle_close,
+                on_error=self._handle_error
+            )
+            try:
+                self._ws.run_forever(ping_interval=30, ping_timeout=10)
+            except Exception as e:
+                # e.g. an invalid URL: keep the thread alive and retry with backoff
+                self.last_error = f"Stream failed: {str(e)[:150]}"
+            self.connected = False
+            if self._stop.is_set():
+                break
+
+            # A connection that stayed up for a while resets the backoff
+            if time.time() - started > self.max_backoff:
+                backoff = 1
+            self.reconnects += 1
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,294 @@
+"""
+Perf Trace Module
+Timing spans per Streamlit rerun, per-process latency histograms and structured JSON logs
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+PERF_TRACE_ENABLED = os.getenv("PERF_TRACE_ENABLED", "1") == "1"
+# Write one JSON line per rerun (and per background span) to stderr
+PERF_LOG = os.getenv("PERF_LOG", "0") == "1"
+# Finished reruns kept for the debug panel
+PERF_RECENT_RERUNS = int(os.getenv("PERF_RECENT_RERUNS", "20"))
+
+logger = logging.getLogger("perf_trace")
+if PERF_LOG and not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+# Histogram bucket upper bounds in ms: 0.05ms to ~10min, four buckets per doubling
+BUCKET_BOUNDS = [0.05 * 2 ** (i / 4) for i in range(96)]
+
+
+class Histogram:
+    """Log-bucketed latency histogram (approximate percentiles, exact count/mean/max)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (capped at the max)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class Span:
+    """One timed stage; attrs carry cache ('hit'/'miss'/...), source and other context"""
+
+    __slots__ = ('name', 'attrs', 'start', 'duration_ms', 'depth', 'thread')
+
+    def __init__(self, name, attrs, depth):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration_ms = None
+        self.depth = depth
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs):
+        """Add or overwrite attributes (e.g. cache='miss' once a fetch happens)"""
+        self.attrs.update(attrs)
+        return self
+
+    def to_dict(self):
+        return dict(self.attrs, name=self.name, ms=round(self.duration_ms or 0.0, 3), depth=self.depth)
+
+
+class Rerun:
+    """Spans collected on the script thread between begin_rerun() and end_rerun()"""
+
+    def __init__(self, rerun_id, label):
+        self.id = rerun_id
+        self.label = label
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.total_ms = None
+        self.status = "running"
+        self.spans = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self):
+        return {
+            'event': 'rerun',
+            'rerun_id': self.id,
+            'label': self.label,
+            'status': self.status,
+            'started': self.started,
+            'total_ms': round(self.total_ms if self.total_ms is not None else self.elapsed_ms(), 3),
+            'spans': [span.to_dict() for span in self.spans]
+        }
+
+
+class _Registry:
+    """Per-process histograms, cache/source counters and recent reruns"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._recent = []
+
+    def record(self, span):
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = Histogram()
+            histogram.record(span.duration_ms)
+            counters = self._counters.setdefault(span.name, {'cache': {}, 'source': {}, 'errors': 0})
+            for field in ('cache', 'source'):
+                value = span.attrs.get(field)
+                if value is not None:
+                    counters[field][value] = counters[field].get(value, 0) + 1
+            if 'error' in span.attrs:
+                counters['errors'] += 1
+
+    def finish(self, rerun):
+        with self._lock:
+            self._recent.append(rerun)
+            del self._recent[:-PERF_RECENT_RERUNS]
+
+    def snapshot(self):
+        with self._lock:
+            rows = []
+            for name, histogram in self._histograms.items():
+                counters = self._counters[name]
+                rows.append({
+                    'name': name,
+                    'count': histogram.count,
+                    'mean_ms': histogram.total_ms / histogram.count,
+                    'p50_ms': histogram.percentile(50),
+                    'p90_ms': histogram.percentile(90),
+                    'p99_ms': histogram.percentile(99),
+                    'max_ms': histogram.max_ms,
+                    'cache': dict(counters['cache']),
+                    'source': dict(counters['source']),
+                    'errors': counters['errors']
+                })
+            return sorted(rows, key=lambda row: row['name'])
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+
+_registry = _Registry()
+_local = threading.local()
+_rerun_ids = itertools.count(1)
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def begin_rerun(label="rerun"):
+    """
+    Start collecting spans for a script run on the current thread
+
+    A rerun that never reached end_rerun() (st.rerun(), st.stop() or an
+    exception) is closed as 'interrupted' first.
+
+    Returns:
+        The new Rerun (None when tracing is disabled)
+    """
+    if not PERF_TRACE_ENABLED:
+        return None
+    previous = getattr(_local, 'rerun', None)
+    if previous is not None and previous.total_ms is None:
+        _close(previous, "interrupted")
+    _local.stack = []
+    _local.rerun = Rerun(next(_rerun_ids), label)
+    return _local.rerun
+
+
+def end_rerun():
+    """
+    Finish the current thread's rerun, store it for the debug panel and log it
+
+    Returns:
+        The finished Rerun, or None if none was started
+    """
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None or rerun.total_ms is not None:
+        return None
+    _close(rerun, "ok")
+    return rerun
+
+
+def _close(rerun, status):
+    rerun.total_ms = rerun.elapsed_ms()
+    rerun.status = status
+    _registry.finish(rerun)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(rerun.to_dict(), default=str))
+
+
+def current_rerun():
+    """The rerun being collected on this thread (None outside a script run)"""
+    return getattr(_local, 'rerun', None)
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Time a block as a named span
+
+    Nested spans record their depth. Exceptions are tagged on the span
+    (attrs['error']) and re-raised. Spans on the script thread are added to
+    the current rerun; every span feeds the per-process histogram.
+
+    Args:
+        name: Stage name (histogram key)
+        **attrs: Initial attributes such as cache='hit' or source='Binance'
+
+    Yields:
+        The Span (call .set() to add attributes while it runs)
+    """
+    if not PERF_TRACE_ENABLED:
+        yield Span(name, attrs, 0)
+        return
+
+    stack = _stack()
+    current = Span(name, attrs, len(stack))
+    stack.append(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.attrs['error'] = type(e).__name__
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - start) * 1000
+        stack.pop()
+        _registry.record(current)
+        rerun = getattr(_local, 'rerun', None)
+        if rerun is not None and rerun.total_ms is None:
+            rerun.spans.append(current)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(dict(current.to_dict(), event='span', thread=current.thread), default=str))
+
+
+def annotate(**attrs):
+    """
+    Set attributes on the innermost open span of this thread (no-op without one)
+
+    Lets code deep inside a cached call report e.g. cache='miss' to the span
+    wrapped around it by the caller.
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1].attrs.update(attrs)
+
+
+def histograms():
+    """Per-process span statistics: count, mean/p50/p90/p99/max ms, cache and source counts"""
+    return _registry.snapshot()
+
+
+def recent_reruns():
+    """The most recent finished reruns across all sessions (oldest first)"""
+    return _registry.recent()
+
+
+def reset():
+    """Clear histograms and recent reruns"""
+    _registry.reset()
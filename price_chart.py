@@ -0,0 +1,267 @@
+"""
+Price Chart Module
+Builds the Plotly price chart and patches a built figure when only the forming candle moved
+"""
+
+from datetime import timedelta
+
+import plotly.graph_objects as go
+
+from chart_lod import apply_lod
+from chart_payload import candle_data, line_data
+
+
+INDICATOR_TRACE_COLUMNS = ['SMA_20', 'SMA_50', 'BB_upper', 'BB_lower']
+
+
+def create_price_chart(df, show_indicators=True, data_source="Binance", prediction_result=None):
+    """Create an interactive price chart with technical indicators and optional prediction overlay"""
+    fig = go.Figure()
+    
+    # Long windows are merged into wider bars / thinned lines (no-op for small windows)
+    candles, lines = apply_lod(df, INDICATOR_TRACE_COLUMNS if show_indicators else [])
+    
+    # Candlestick chart
+    fig.add_trace(go.Candlestick(
+        **candle_data(candles),
+        name='BTC Price',
+        increasing_line_color='#10b981',
+        decreasing_line_color='#ef4444'
+    ))
+    
+    if show_indicators and 'SMA_20' in df.columns:
+        # Add moving averages
+        fig.add_trace(go.Scatter(
+            **line_data(*lines['SMA_20']),
+            mode='lines',
+            name='SMA 20',
+            line=dict(color='#3b82f6', width=1.5),
+            opacity=0.7
+        ))
+        
+        fig.add_trace(go.Scatter(
+            **line_data(*lines['SMA_50']),
+            mode='lines',
+            name='SMA 50',
+            line=dict(color='#f59e0b', width=1.5),
+            opacity=0.7
+        ))
+        
+        # Add Bollinger Bands
+        fig.add_trace(go.Scatter(
+            **line_data(*lines['BB_upper']),
+            mode='lines',
+            name='BB Upper',
+            line=dict(color='#8b5cf6', width=1, dash='dash'),
+            opacity=0.5
+        ))
+        
+        fig.add_trace(go.Scatter(
+            **line_data(*lines['BB_lower']),
+            mode='lines',
+            name='BB Lower',
+            line=dict(color='#8b5cf6', width=1, dash='dash'),
+            opacity=0.5,
+            fill='tonexty',
+            fillcolor='rgba(139, 92, 246, 0.1)'
+        ))
+    
+    # Add prediction overlay if provided
+    if prediction_result:
+        add_prediction_overlay(fig, df, prediction_result)
+    
+    # Dynamic title based on data source
+    chart_title = f'Bitcoin Price Chart - Live Data ({data_source})'
+    if prediction_result:
+        chart_title += ' with AI Prediction Overlay'
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': chart_title,
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        xaxis_title='Time',
+        xaxis_type='date',
+        yaxis_title='Price (USD)',
+        template='plotly_white',
+        hovermode='x unified',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#374151', size=12),
+        xaxis_rangeslider_visible=False,
+        height=500,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+
+def add_prediction_overlay(fig, df, prediction_result):
+    """Add the prediction projection (or marker) anchored at the last candle"""
+    # Determine color and name based on prediction
+    suggestion = prediction_result.get('suggestion', {})
+    action = suggestion.get('action', None)
+    
+    if action == 'BUY':
+        pred_color = '#10b981'  # Green
+        pred_name = '▲ AI Prediction: BUY Signal'
+        pred_symbol = 'triangle-up'
+    elif action == 'SELL':
+        pred_color = '#ef4444'  # Red
+        pred_name = '▼ AI Prediction: SELL Signal'
+        pred_symbol = 'triangle-down'
+    elif action == 'HOLD':
+        pred_color = '#f59e0b'  # Orange
+        pred_name = '◯ AI Prediction: HOLD'
+        pred_symbol = 'diamond'
+    else:
+        # Fallback to legacy prediction_label
+        pred_label = prediction_result.get('prediction_label', '')
+        if 'Upward' in pred_label:
+            pred_color = '#10b981'
+            pred_name = '▲ AI Prediction: Upward'
+            pred_symbol = 'triangle-up'
+        elif 'Downward' in pred_label:
+            pred_color = '#ef4444'
+            pred_name = '▼ AI Prediction: Downward'
+            pred_symbol = 'triangle-down'
+        else:
+            pred_color = '#6b7280'
+            pred_name = '◯ AI Prediction: Neutral'
+            pred_symbol = 'circle'
+    
+    # Build hover text
+    hover_extra = f"<br>Confidence: {prediction_result.get('confidence', 0):.1%}"
+    if suggestion:
+        hover_extra += f"<br>Action: {action} ({suggestion.get('conviction', 'N/A')})"
+        hover_extra += f"<br>Risk: {suggestion.get('risk_level', 'N/A')}"
+    trend = prediction_result.get('trend', {})
+    if trend:
+        hover_extra += f"<br>Trend: {trend.get('short_term', 'N/A')} / {trend.get('long_term', 'N/A')}"
+    
+    # Check if we have next_periods for full overlay
+    if 'next_periods' in prediction_result:
+        # FULL OVERLAY WITH PROJECTION LINE
+        current_price = prediction_result['current_price']
+        last_time = df.index[-1]
+        
+        # Calculate average time interval
+        if len(df) >= 2:
+            time_intervals = [(df.index[i] - df.index[i-1]) for i in range(1, min(6, len(df)))]
+            avg_interval = sum(time_intervals, timedelta(0)) / len(time_intervals)
+        else:
+            avg_interval = timedelta(minutes=5)
+        
+        # Get the last closing price from the chart
+        last_chart_price = float(df['close'].iloc[-1])
+        
+        # Create prediction line starting from the last chart point
+        prediction_times = [last_time]
+        prediction_prices = [last_chart_price]
+        
+        # Add predicted future points
+        for period in prediction_result['next_periods']:
+            future_time = last_time + (avg_interval * period['period'])
+            prediction_times.append(future_time)
+            prediction_prices.append(period['estimated_price'])
+        
+        # Add prediction line
+        fig.add_trace(go.Scatter(
+            x=prediction_times,
+            y=prediction_prices,
+            mode='lines+markers',
+            name=pred_name,
+            line=dict(color=pred_color, width=3, dash='dash'),
+            marker=dict(size=10, symbol='star', color=pred_color),
+            opacity=0.9,
+            hovertemplate=f'<b>Predicted Price</b><br>$%{{y:,.2f}}<br>%{{x}}{hover_extra}<extra></extra>'
+        ))
+        
+        # Add confidence band
+        confidence = prediction_result.get('confidence', 0)
+        upper_band = [p * (1 + (1 - confidence) * 0.02) for p in prediction_prices]
+        lower_band = [p * (1 - (1 - confidence) * 0.02) for p in prediction_prices]
+        
+        fig.add_trace(go.Scatter(
+            x=prediction_times,
+            y=upper_band,
+            mode='lines',
+            name='Confidence Upper',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=prediction_times,
+            y=lower_band,
+            mode='lines',
+            name='Confidence Lower',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=f'rgba({"16, 185, 129" if pred_color == "#10b981" else "239, 68, 68" if pred_color == "#ef4444" else "245, 158, 11" if pred_color == "#f59e0b" else "107, 114, 128"}, 0.1)',
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+    else:
+        # SIMPLE OVERLAY - Just show marker at current price point
+        last_time = df.index[-1]
+        last_price = float(df['close'].iloc[-1])
+        
+        # Add a single marker showing the prediction
+        fig.add_trace(go.Scatter(
+            x=[last_time],
+            y=[last_price],
+            mode='markers',
+            name=pred_name,
+            marker=dict(
+                size=20,
+                symbol=pred_symbol,
+                color=pred_color,
+                line=dict(width=2, color='white')
+            ),
+            opacity=0.9,
+            hovertemplate=f'<b>AI Prediction</b><br>${{y:,.2f}}<br>{{x}}{hover_extra}<extra></extra>'
+        ))
+        
+        # Add annotation
+        fig.add_annotation(
+            x=last_time,
+            y=last_price,
+            text=f"{pred_name.split(':')[1].strip()}",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1,
+            arrowwidth=2,
+            arrowcolor=pred_color,
+            ax=50,
+            ay=-40,
+            bgcolor=pred_color,
+            font=dict(color='white', size=12),
+            bordercolor='white',
+            borderwidth=2,
+            borderpad=4,
+            opacity=0.9
+        )
+
+
+def chart_fingerprint(df):
+    """Cheap identity of a candle frame: length, first/last timestamp and the last candle's prices"""
+    last = df.iloc[-1]
+    return (len(df), df.index[0], df.index[-1], float(last['close']), float(last['high']), float(last['low']))
+
+
+def update_last_candle(fig, df, n_base, prediction_result=None):
+    """Patch a cached figure in place when only the forming candle changed"""
+    candles, lines = apply_lod(df, INDICATOR_TRACE_COLUMNS[:n_base - 1])
+    with fig.batch_update():
+        fig.data[0].update(**candle_data(candles))
+        for trace, column in zip(fig.data[1:n_base], INDICATOR_TRACE_COLUMNS):
+            trace.update(**line_data(*lines[column]))
+    if prediction_result:
+        # The overlay is anchored at the last close, so only it is rebuilt
+        fig.data = fig.data[:n_base]
+        fig.layout.annotations = ()
+        add_prediction_overlay(fig, df, prediction_result)
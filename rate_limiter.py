@@ -0,0 +1,105 @@
+"""
+Rate Limiter Module for upstream market data APIs
+Token-bucket limiter that tracks request weight (Binance style) across threads
+"""
+
+import threading
+import time
+
+
+class RateLimitTimeout(Exception):
+    """Raised when local weight could not be acquired in time (no request was sent)"""
+
+
+class WeightRateLimiter:
+    """
+    Token bucket measured in request weight
+
+    The bucket holds up to `capacity` weight and refills continuously over
+    `period` seconds. Callers acquire the weight of a request before sending
+    it. When the server reports how much weight it has already counted
+    (Binance's X-MBX-USED-WEIGHT-1M header), the bucket is corrected so
+    other processes sharing the same IP are accounted for too.
+    """
+
+    def __init__(self, name, capacity, period=60.0, used_weight_header=None, clock=time.monotonic):
+        self.name = name
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.used_weight_header = used_weight_header
+        # Monotonic seconds; injectable so tests can drive refills
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.capacity / self.period)
+
+    def acquire(self, weight=1, timeout=None):
+        """
+        Block until `weight` tokens are available and take them
+
+        Args:
+            weight: Request weight to reserve
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Raises:
+            RateLimitTimeout: If the weight cannot be acquired within timeout
+        """
+        weight = min(float(weight), self.capacity)
+        deadline = None if timeout is None else self.clock() + timeout
+
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                wait = (weight - self._tokens) * self.period / self.capacity
+                if deadline is not None:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        raise RateLimitTimeout(f"{self.name} rate limit: weight {weight:g} not available within {timeout}s")
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def update_from_headers(self, headers):
+        """
+        Reconcile the bucket with server-reported used weight
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        if not self.used_weight_header or headers is None:
+            return
+        used = headers.get(self.used_weight_header)
+        if used is None:
+            return
+        try:
+            used = float(used)
+        except (TypeError, ValueError):
+            return
+
+        with self._cond:
+            self._refill()
+            self._tokens = max(0.0, min(self._tokens, self.capacity - used))
+            self._cond.notify_all()
+
+    def available(self):
+        """Return the weight currently available without waiting"""
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+
+# Shared limiters, one per upstream. Capacities stay below the published
+# limits so a few concurrent Streamlit sessions cannot trip a ban.
+binance_limiter = WeightRateLimiter(
+    "Binance", capacity=1200, period=60.0, used_weight_header="X-MBX-USED-WEIGHT-1M"
+)
+cryptocompare_limiter = WeightRateLimiter("CryptoCompare", capacity=50, period=1.0)
+coingecko_limiter = WeightRateLimiter("CoinGecko", capacity=30, period=60.0)
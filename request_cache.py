@@ -0,0 +1,149 @@
+"""
+Request Cache Module
+Process-wide TTL caching and request coalescing shared by all Streamlit sessions
+"""
+
+import threading
+import time
+
+
+class _Call:
+    """An in-flight fetch that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight block and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run fn() for key, or wait for the identical call already in flight
+
+        Args:
+            key: Hashable request identity
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls)
+            }
+
+
+class TTLCache:
+    """
+    Short-lived cache of upstream responses with coalesced misses
+
+    Fresh entries are served directly; concurrent misses for the same key
+    trigger exactly one fetch via SingleFlight.
+    """
+
+    def __init__(self, ttl, name="cache"):
+        self.ttl = ttl
+        self.name = name
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry
+        return None
+
+    def get_or_fetch(self, key, fn):
+        """
+        Return the cached value for key, fetching it with fn() when stale
+
+        Args:
+            key: Hashable cache key
+            fn: Zero-argument callable producing the value
+
+        Returns:
+            (value, cached_at) where cached_at is the epoch time of the fetch
+        """
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+
+        def load():
+            # A leader that just finished may already have refreshed the entry
+            with self._lock:
+                entry = self._fresh(key)
+            if entry is not None:
+                return entry[1], entry[2]
+            value = fn()
+            fetched_at = time.time()
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, value, fetched_at)
+            return value, fetched_at
+
+        return self._flight.do(key, load)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters; 'fetches' is the number of upstream calls made"""
+        flight = self._flight.stats()
+        with self._lock:
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': flight['coalesced'],
+                'fetches': flight['executions'],
+                'size': len(self._entries)
+            }
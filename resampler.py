@@ -0,0 +1,106 @@
+"""
+Resampler Module
+Derives higher-timeframe candles from a base (e.g. 1m) candle series
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher import INTERVAL_MS
+
+
+# How each column combines when candles are merged
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'quote_volume': 'sum',
+    'trades': 'sum',
+    'taker_buy_base': 'sum',
+    'taker_buy_quote': 'sum'
+}
+
+
+def aggregate_groups(df, starts):
+    """
+    Merge consecutive rows into bars, one bar per group
+
+    Args:
+        df: Candle DataFrame (sorted by time)
+        starts: Sorted row positions where each group begins (first must be 0)
+
+    Returns:
+        dict of column name -> aggregated ndarray for the columns present
+    """
+    ends = np.append(starts[1:], len(df)) - 1
+    result = {}
+    for column, how in AGGREGATIONS.items():
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy()
+        if how == 'first':
+            result[column] = values[starts]
+        elif how == 'last':
+            result[column] = values[ends]
+        elif how == 'max':
+            result[column] = np.maximum.reduceat(values, starts)
+        elif how == 'min':
+            result[column] = np.minimum.reduceat(values, starts)
+        else:
+            result[column] = np.add.reduceat(values, starts)
+    return result
+
+
+def resample_klines(df, interval, base_interval="1m", drop_incomplete_first=True, now_ms=None):
+    """
+    Build `interval` candles from a base candle series
+
+    Bars are aligned to epoch multiples of the interval like Binance's
+    (so 4h bars start at 00:00, 04:00, ... UTC). The last bar may still be
+    forming, exactly like the exchange's current candle; it is kept and
+    flagged with df.attrs['partial_last'] when the base candles (closed by
+    now_ms) do not reach the end of that bar.
+
+    Args:
+        df: Base candles indexed by open timestamp (fetch_historical_klines format)
+        interval: Target interval (must be a multiple of base_interval)
+        base_interval: Interval of the input candles
+        drop_incomplete_first: Drop the first bar when the history starts
+            part-way through it (its open/volume would be wrong)
+        now_ms: Current time in epoch ms (default: now)
+
+    Returns:
+        DataFrame of `interval` candles with the same columns
+    """
+    step = INTERVAL_MS[interval]
+    base_step = INTERVAL_MS[base_interval]
+    if step % base_step:
+        raise Exception(f"Cannot build {interval} candles from {base_interval} candles")
+
+    if df.empty:
+        return df.copy()
+
+    open_ms = df.index.asi8 // 10**6
+    buckets = open_ms // step
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+
+    columns = aggregate_groups(df, starts)
+    bar_open = buckets[starts] * step
+    if 'close_time' in df.columns:
+        columns['close_time'] = pd.to_datetime(bar_open + step - 1, unit='ms')
+
+    out = pd.DataFrame(columns, index=pd.DatetimeIndex(pd.to_datetime(bar_open, unit='ms'), name='timestamp'))
+    out = out[[column for column in df.columns if column in out.columns]]
+
+    # The base series is final up to its last candle's close, or up to now while that candle forms
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    covered_until = min(open_ms[-1] + base_step, now_ms)
+    out.attrs['partial_last'] = bool(covered_until < bar_open[-1] + step)
+    if drop_incomplete_first and len(out) > 1 and open_ms[0] > bar_open[0]:
+        out = out.iloc[1:]
+    return out
@@ -0,0 +1,170 @@
+"""
+Source Race Module
+Hedged requests across redundant upstream data sources
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from circuit_breaker import get_breaker
+from rate_limiter import RateLimitTimeout
+
+
+def _hedge_delay_from_env():
+    value = os.getenv("SOURCE_HEDGE_DELAY", "1.0").strip().lower()
+    if value in ("", "off", "none", "sequential"):
+        return None
+    return float(value)
+
+
+# Seconds to wait before firing the next source (0 = all in parallel,
+# None = strictly sequential fallback)
+HEDGE_DELAY = _hedge_delay_from_env()
+
+# Stragglers keep running after a winner is found, so the race uses a
+# long-lived pool instead of blocking on executor shutdown
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="source-race")
+        return _pool
+
+
+class AllSourcesFailed(Exception):
+    """Raised when every candidate source failed; `errors` maps source name to exception"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(", ".join(f"{name}: {str(error)[:100]}" for name, error in errors.items()))
+
+
+class CircuitOpen(Exception):
+    """Recorded for a source that was skipped because its breaker is open"""
+
+
+def _local_throttle(error):
+    """True if the error (or one it was raised from) is our own limiter timing out"""
+    while error is not None:
+        if isinstance(error, RateLimitTimeout):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _guarded(fn, breaker):
+    """
+    Wrap a source call so its outcome is recorded on the breaker
+
+    Local rate-limiter timeouts never reached the upstream, so they give
+    back the probe slot instead of counting as a failure.
+    """
+    def call():
+        try:
+            result = fn()
+        except Exception as e:
+            if _local_throttle(e):
+                breaker.release()
+            else:
+                breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return result
+    return call
+
+
+def race_sources(candidates, hedge_delay=HEDGE_DELAY, use_breakers=True):
+    """
+    Return the first successful result from a list of sources
+
+    Sources are tried in order. In hedged mode the next source is fired
+    when the previous one fails or after `hedge_delay` seconds without an
+    answer, whichever comes first; the first valid result wins and
+    not-yet-started stragglers are cancelled (running ones are left to
+    finish in the background and their results discarded).
+
+    Sources whose circuit breaker is open are skipped without a request.
+
+    Args:
+        candidates: List of (name, callable) pairs in preference order
+        hedge_delay: Seconds before hedging to the next source; 0 fires
+            all sources at once, None falls back strictly sequentially
+        use_breakers: Consult and update the per-source circuit breakers
+
+    Returns:
+        (name, result) of the winning source
+
+    Raises:
+        AllSourcesFailed: If every source raised or was skipped
+    """
+    errors = {}
+    queue = list(candidates)
+    breakers = {}
+
+    def next_allowed():
+        """Pop the next source whose breaker lets it through (or None)"""
+        while queue:
+            name, fn = queue.pop(0)
+            if not use_breakers:
+                return name, fn
+            breaker = breakers[name] = get_breaker(name)
+            if breaker.allow():
+                return name, _guarded(fn, breaker)
+            errors[name] = CircuitOpen(f"circuit open, retry in {breaker.retry_in():.0f}s")
+        return None
+
+    def ordered_errors():
+        # Keep the error order matching the preference order
+        return {name: errors[name] for name, _ in candidates if name in errors}
+
+    if hedge_delay is None:
+        while True:
+            source = next_allowed()
+            if source is None:
+                raise AllSourcesFailed(ordered_errors())
+            name, fn = source
+            try:
+                return name, fn()
+            except Exception as e:
+                errors[name] = e
+
+    pool = _get_pool()
+    pending = {}
+
+    def launch():
+        source = next_allowed()
+        if source is not None:
+            name, fn = source
+            pending[pool.submit(fn)] = name
+
+    launch()
+    while queue and hedge_delay <= 0:
+        launch()
+
+    while pending:
+        done, _ = wait(pending, timeout=hedge_delay if queue else None, return_when=FIRST_COMPLETED)
+        if not done:
+            # The running sources are slow: hedge with the next one
+            launch()
+            continue
+
+        for future in done:
+            name = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[name] = e
+                # A failure is as good a signal as a timeout: fire the next source now
+                if queue:
+                    launch()
+                continue
+            for straggler, straggler_name in pending.items():
+                if straggler.cancel() and straggler_name in breakers:
+                    breakers[straggler_name].release()
+            return name, result
+
+    raise AllSourcesFailed(ordered_errors())
@@ -0,0 +1,54 @@
+"""
+Benchmark regression check: noise floors, min-of-N timings and calibration scaling
+"""
+
+from benchmarks.run import MIN_MEMORY_DELTA_KB, MIN_TIME_DELTA_MS, compare
+
+
+def stats(min_ms, peak_kb=100.0, median_ms=None):
+    return {'median_ms': median_ms if median_ms is not None else min_ms, 'min_ms': min_ms, 'peak_kb': peak_kb}
+
+
+def test_small_end_to_end_jitter_is_not_a_regression():
+    # The doubling seen on a noisy 60-candle run stays under the end-to-end floor
+    baseline = {'end_to_end/binance_klines/60': stats(1.788)}
+    results = {'end_to_end/binance_klines/60': stats(3.552)}
+    assert compare(results, baseline, 0.25) == []
+
+
+def test_slowdown_beyond_floor_and_tolerance_is_flagged():
+    baseline = {'indicators/numpy/100000': stats(20.0)}
+    results = {'indicators/numpy/100000': stats(30.0)}
+    assert compare(results, baseline, 0.25) == [('indicators/numpy/100000', 'min_ms', 20.0, 30.0)]
+
+
+def test_fastest_run_is_compared_not_the_median():
+    baseline = {'parse/binance_klines/100000': stats(100.0)}
+    results = {'parse/binance_klines/100000': stats(101.0, median_ms=200.0)}
+    assert compare(results, baseline, 0.25) == []
+
+
+def test_floor_depends_on_stage():
+    delta = (MIN_TIME_DELTA_MS['parse'] + MIN_TIME_DELTA_MS['end_to_end']) / 2
+    baseline = {'parse/x/60': stats(1.0), 'end_to_end/x/60': stats(1.0)}
+    results = {'parse/x/60': stats(1.0 + delta), 'end_to_end/x/60': stats(1.0 + delta)}
+    assert [name for name, *_ in compare(results, baseline, 0.25)] == ['parse/x/60']
+
+
+def test_calibration_scale_absorbs_a_slower_machine():
+    baseline = {'indicators/pandas/100000': stats(40.0)}
+    results = {'indicators/pandas/100000': stats(80.0)}
+    assert compare(results, baseline, 0.25, scale=2.0) == []
+    assert compare(results, baseline, 0.25, scale=1.0) == [('indicators/pandas/100000', 'min_ms', 40.0, 80.0)]
+
+
+def test_memory_growth_is_flagged_independent_of_scale():
+    baseline = {'parse/binance_klines/1000': stats(2.0, peak_kb=1000.0)}
+    results = {'parse/binance_klines/1000': stats(2.0, peak_kb=1000.0 + 4 * MIN_MEMORY_DELTA_KB + 300)}
+    assert compare(results, baseline, 0.25, scale=3.0) == [
+        ('parse/binance_klines/1000', 'peak_kb', 1000.0, 1000.0 + 4 * MIN_MEMORY_DELTA_KB + 300)
+    ]
+
+
+def test_cases_missing_from_the_baseline_are_skipped():
+    assert compare({'parse/new/60': stats(50.0)}, {}, 0.25) == []
@@ -0,0 +1,98 @@
+"""
+fetch_with_candle_store against a fake Binance that serves a forming candle
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_fetcher
+from benchmarks.fixtures import START_MS, STEP_MS, binance_klines, candle_walk
+from candle_store import CandleStore
+from data_fetcher import fetch_with_candle_store, parse_klines
+
+
+class FakeBinance:
+    """Klines up to the candle forming at server time; the forming candle's close is provisional"""
+
+    def __init__(self, server_ms):
+        self.server_ms = server_ms
+        self.walk = candle_walk(3000)
+        self.calls = []
+
+    def fetch(self, limit, start):
+        self.calls.append((limit, start))
+        current = (self.server_ms - START_MS) // STEP_MS
+        first = current - limit + 1 if start is None else (start - START_MS) // STEP_MS
+        last = min(first + limit - 1, current)
+        walk = {key: values[first:last + 1].copy() for key, values in self.walk.items()}
+        walk['close'][-1] = walk['open'][-1]  # still forming
+        return parse_klines(binance_klines(walk))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {'ms': START_MS + 1000 * STEP_MS + 20_000}
+    monkeypatch.setattr(data_fetcher.time, 'time', lambda: now['ms'] / 1000)
+    return now
+
+
+def stored_opens(store, start=START_MS, end=START_MS + 10**9):
+    return store.load('binance', 'BTCUSDT', '1m', start, end).index.asi8 // 10**6
+
+
+def test_empty_store_fetches_the_window_and_saves_closed_candles(clock):
+    store = CandleStore(":memory:")
+    upstream = FakeBinance(clock['ms'])
+    df = fetch_with_candle_store('binance', 'BTCUSDT', '1m', 100, upstream.fetch, store=store)
+    assert upstream.calls == [(100, None)]
+    assert len(df) == 100
+    opens = stored_opens(store)
+    assert len(opens) == 99
+    assert opens[-1] == df.index.asi8[-2] // 10**6
+
+
+def test_incremental_merge_fetches_only_new_candles(clock):
+    store = CandleStore(":memory:")
+    upstream = FakeBinance(clock['ms'])
+    fetch_with_candle_store('binance', 'BTCUSDT', '1m', 100, upstream.fetch, store=store)
+
+    clock['ms'] += 3 * STEP_MS
+    upstream.server_ms = clock['ms']
+    df = fetch_with_candle_store('binance', 'BTCUSDT', '1m', 100, upstream.fetch, store=store)
+    current_open = clock['ms'] - clock['ms'] % STEP_MS
+    # The previously forming candle and the three newer ones are fetched again
+    assert upstream.calls[-1] == (4, current_open - 3 * STEP_MS)
+    assert len(df) == 100
+    assert (np.diff(df.index.asi8 // 10**6) == STEP_MS).all()
+    assert df.index.asi8[-1] // 10**6 == current_open
+
+
+def test_forming_candle_is_not_saved_when_the_local_clock_runs_ahead(clock):
+    store = CandleStore(":memory:")
+    upstream = FakeBinance(clock['ms'])
+    server_open = upstream.server_ms - upstream.server_ms % STEP_MS
+    # Locally the server's forming candle already looks closed
+    clock['ms'] = server_open + STEP_MS + 30_000
+    fetch_with_candle_store('binance', 'BTCUSDT', '1m', 100, upstream.fetch, store=store)
+    assert server_open not in stored_opens(store)
+
+    # Once the server moved on, the candle is fetched again with its final values
+    upstream.server_ms = clock['ms']
+    df = fetch_with_candle_store('binance', 'BTCUSDT', '1m', 100, upstream.fetch, store=store)
+    final_close = upstream.walk['close'][(server_open - START_MS) // STEP_MS]
+    assert df.loc[pd.Timestamp(server_open, unit='ms'), 'close'] == pytest.approx(final_close, abs=0.01)
+    assert server_open in stored_opens(store)
+
+
+def test_store_output_matches_a_direct_fetch(clock):
+    store = CandleStore(":memory:")
+    upstream = FakeBinance(clock['ms'])
+    fetch_with_candle_store('binance', 'BTCUSDT', '1m', 200, upstream.fetch, store=store)
+    clock['ms'] += 2 * STEP_MS
+    upstream.server_ms = clock['ms']
+
+    served = fetch_with_candle_store('binance', 'BTCUSDT', '1m', 200, upstream.fetch, store=store)
+    direct = upstream.fetch(200, None)
+    assert served['trades'].dtype == np.int32
+    pd.testing.assert_frame_equal(served, direct, check_freq=False)
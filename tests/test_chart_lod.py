@@ -0,0 +1,69 @@
+"""
+Chart level of detail: candle merging and LTTB line reduction
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import candle_walk
+from chart_lod import downsample_candles, downsample_line, lttb
+
+
+def reference_lttb(x, y, threshold):
+    """Straightforward LTTB (Steinarsson, 2013) returning kept positions"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        if i == threshold - 3:
+            avg_start, avg_end = n - 1, n
+        avg_x = np.mean(x[avg_start:avg_end])
+        avg_y = np.mean(y[avg_start:avg_end])
+        lo = int(math.floor(i * every)) + 1
+        hi = int(math.floor((i + 1) * every)) + 1
+        best, best_j = -1.0, lo
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best:
+                best, best_j = area, j
+        kept.append(best_j)
+        a = best_j
+    kept.append(n - 1)
+    return kept
+
+
+@pytest.mark.parametrize("n, threshold", [(2_000, 800), (100_000, 500), (10, 3), (5, 10)])
+def test_lttb_matches_reference(n, threshold):
+    walk = candle_walk(n, seed=7)
+    x = walk['open_ms'].astype(np.float64)
+    y = walk['close']
+    assert lttb(x, y, threshold).tolist() == reference_lttb(x, y, threshold)
+
+
+def test_downsample_line_drops_leading_nans():
+    walk = candle_walk(3_000, seed=3)
+    series = pd.Series(walk['close'], index=pd.to_datetime(walk['open_ms'], unit='ms')).rolling(50).mean()
+    x, y = downsample_line(series, max_points=400)
+    assert len(x) == len(y) == 400
+    assert not np.isnan(y).any()
+    assert x[0] == series.index[49] and x[-1] == series.index[-1]
+
+
+def test_downsample_candles_matches_pandas_resample():
+    walk = candle_walk(5_000, seed=5)
+    df = pd.DataFrame({column: walk[column] for column in ('open', 'high', 'low', 'close')},
+                      index=pd.DatetimeIndex(pd.to_datetime(walk['open_ms'], unit='ms'), name='timestamp'))
+    merged = downsample_candles(df, max_bars=300)
+    span = math.ceil(len(df) / 300)
+    expected = df.resample(f"{span}min", origin='epoch').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'})
+    assert len(merged) <= 301
+    pd.testing.assert_frame_equal(merged, expected, check_freq=False)
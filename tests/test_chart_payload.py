@@ -0,0 +1,57 @@
+"""
+Compact chart payload decodes back to the original candles and lines
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from benchmarks.fixtures import candle_walk
+from chart_payload import PRICE_DECIMALS, candle_data, line_data
+
+
+def candles(count=500):
+    walk = candle_walk(count, seed=11)
+    return pd.DataFrame({column: walk[column] for column in ('open', 'high', 'low', 'close')},
+                        index=pd.DatetimeIndex(pd.to_datetime(walk['open_ms'], unit='ms'), name='timestamp'))
+
+
+def round_trip(fig):
+    return json.loads(pio.to_json(fig, validate=False))['data']
+
+
+def test_compact_candles_round_trip():
+    df = candles()
+    trace, = round_trip(go.Figure(go.Candlestick(**candle_data(df, compact=True))))
+    assert pd.to_datetime(trace['x'], unit='ms').equals(pd.DatetimeIndex(df.index.values))
+    for column in ('open', 'high', 'low', 'close'):
+        np.testing.assert_allclose(trace[column], df[column], atol=0.5 * 10 ** -PRICE_DECIMALS + 1e-9)
+
+
+def test_evenly_spaced_line_is_sent_as_x0_dx():
+    df = candles()
+    sma = df['close'].rolling(20).mean().dropna()
+    trace, = round_trip(go.Figure(go.Scatter(**line_data(sma.index, sma.to_numpy(), compact=True))))
+    assert 'x' not in trace
+    x = trace['x0'] + trace['dx'] * np.arange(len(trace['y']))
+    assert pd.to_datetime(x, unit='ms').equals(pd.DatetimeIndex(sma.index.values))
+    np.testing.assert_allclose(trace['y'], sma, atol=0.5 * 10 ** -PRICE_DECIMALS + 1e-9)
+
+
+def test_uneven_line_keeps_its_x_values():
+    df = candles()
+    index = df.index[[0, 1, 5, 9, 20]]
+    trace, = round_trip(go.Figure(go.Scatter(**line_data(index, df['close'].iloc[[0, 1, 5, 9, 20]].to_numpy(),
+                                                         compact=True))))
+    assert 'x0' not in trace
+    assert pd.to_datetime(trace['x'], unit='ms').equals(pd.DatetimeIndex(index.values))
+
+
+def test_full_precision_mode_is_unchanged():
+    df = candles(50)
+    trace, = round_trip(go.Figure(go.Candlestick(**candle_data(df, compact=False))))
+    np.testing.assert_array_equal(trace['close'], df['close'].to_numpy())
+    assert pd.to_datetime(trace['x']).equals(pd.DatetimeIndex(df.index.values))
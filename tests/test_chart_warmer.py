@@ -0,0 +1,57 @@
+"""
+ChartWarmer history lengths and stream skipping (no network)
+"""
+
+import time
+
+import pandas as pd
+
+from chart_warmer import ChartWarmer
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_longer_history_is_warmed_after_first_miss():
+    calls = []
+
+    def fetch(interval, limit):
+        calls.append((interval, limit))
+        return pd.DataFrame({'close': range(limit)})
+
+    warmer = ChartWarmer(['5m'], limit=60, max_limit=1000, fetch=fetch).start()
+    try:
+        assert wait_for(lambda: warmer.get('5m', 60) is not None)
+        assert warmer.get('5m', 500) is None
+        assert wait_for(lambda: warmer.get('5m', 500) is not None)
+        assert len(warmer.get('5m', 500)) == 500
+        assert len(warmer.get('5m', 60)) == 60
+        # Beyond max_limit is never warmed
+        assert warmer.get('5m', 5000) is None
+        assert calls == [('5m', 60), ('5m', 500)]
+    finally:
+        warmer.stop()
+
+
+def test_intervals_covered_by_the_stream_are_skipped():
+    calls = []
+
+    def fetch(interval, limit):
+        calls.append((interval, limit))
+        return pd.DataFrame({'close': range(limit)})
+
+    warmer = ChartWarmer(['1m', '5m'], limit=60, fetch=fetch,
+                         skip=lambda interval, limit: interval == '1m').start()
+    try:
+        assert wait_for(lambda: warmer.get('5m') is not None)
+        time.sleep(0.1)
+        assert warmer.get('1m') is None
+        assert calls == [('5m', 60)]
+    finally:
+        warmer.stop()
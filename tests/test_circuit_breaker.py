@@ -0,0 +1,130 @@
+"""
+CircuitBreaker state transitions and how race_sources feeds it
+"""
+
+import itertools
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker
+from rate_limiter import WeightRateLimiter
+from source_race import AllSourcesFailed, CircuitOpen, race_sources
+
+_names = itertools.count()
+
+
+class FakeTime:
+    now = 1_700_000_000.0
+
+    @classmethod
+    def time(cls):
+        return cls.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, 'time', FakeTime)
+    return FakeTime
+
+
+def unique_name():
+    return f"test-source-{next(_names)}"
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("A", failure_threshold=3, cooldown=60)
+    breaker.record_failure(ValueError("1"))
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure(ValueError("down"))
+        assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure(ValueError("down"))
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.total_skipped == 1
+    assert breaker.retry_in() == pytest.approx(60)
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = CircuitBreaker("A", failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    # A probe that was never sent gives its slot back
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_probe_success_closes(clock):
+    breaker = CircuitBreaker("A", failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens_for_another_cooldown(clock):
+    breaker = CircuitBreaker("A", failure_threshold=3, cooldown=60)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure(ValueError("still down"))
+    assert breaker.state == OPEN
+    assert breaker.last_error == "still down"
+    clock.now += 30
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_race_skips_sources_with_an_open_breaker():
+    name = unique_name()
+    breaker = get_breaker(name)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    calls = []
+    with pytest.raises(AllSourcesFailed) as info:
+        race_sources([(name, lambda: calls.append(1))], hedge_delay=None)
+    assert calls == []
+    assert isinstance(info.value.errors[name], CircuitOpen)
+
+
+def test_local_limiter_timeouts_do_not_open_the_breaker():
+    name = unique_name()
+    limiter = WeightRateLimiter("Test", capacity=1, period=600)
+    limiter.acquire(1)
+
+    def throttled():
+        # Wrapped like the fetchers do, with the limiter timeout as context
+        try:
+            limiter.acquire(1, timeout=0)
+        except Exception as e:
+            raise Exception(f"Failed to fetch: {e}")
+
+    for _ in range(5):
+        with pytest.raises(AllSourcesFailed):
+            race_sources([(name, throttled)], hedge_delay=None)
+    breaker = get_breaker(name)
+    assert breaker.state == CLOSED
+    assert breaker.total_failures == 0
+
+
+def test_upstream_failures_open_the_breaker():
+    name = unique_name()
+
+    def failing():
+        raise Exception("HTTP 500")
+
+    for _ in range(get_breaker(name).failure_threshold):
+        with pytest.raises(AllSourcesFailed):
+            race_sources([(name, failing)], hedge_delay=None)
+    assert get_breaker(name).state == OPEN
@@ -0,0 +1,171 @@
+"""
+Forecast client and prediction worker against the simulator's forecast routes
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import forecast_client
+from benchmarks.simulator import UpstreamSimulator
+from forecast_client import PredictionCache, PredictionWorker, request_prediction
+
+
+def start_simulator(routes=None):
+    sim = UpstreamSimulator({"routes": routes or {}}).start()
+    return sim, sim.env()['FORECAST_API_URL']
+
+
+@pytest.fixture
+def simulator():
+    sim, api_url = start_simulator()
+    yield sim, api_url
+    sim.stop()
+
+
+def test_successful_keyed_prediction_reports_quota(simulator):
+    sim, api_url = simulator
+    result, meta = request_prediction(api_url, "sim-user", "BTCUSDT", "1m")
+    assert 'error' not in result
+    assert meta['status_code'] == 200
+    assert not meta['fell_back'] and not meta['guest_counted']
+    assert meta['quota']['limit'] == 10
+    assert meta['quota']['remaining'] == 9
+
+
+def test_v1_1_validation_error_falls_back_to_v1_0():
+    sim, api_url = start_simulator({"forecast.predict.v1_1": {"errors": [
+        {"rate": 1, "status": 500, "detail": "1 validation error for PredictionResponse"}]}})
+    with sim:
+        result, meta = request_prediction(api_url, "sim-admin", "BTCUSDT", "1m", use_v1_1=True)
+        stats = sim.stats()
+    assert 'error' not in result
+    assert meta['fell_back'] and meta['status_code'] == 200
+    assert stats['forecast.predict.v1_1']['requests'] == 1
+    assert stats['forecast.predict']['requests'] == 1
+
+
+def test_other_server_errors_do_not_fall_back():
+    sim, api_url = start_simulator({"forecast.predict.v1_1": {"errors": [
+        {"rate": 1, "status": 500, "detail": "Model not loaded"}]}})
+    with sim:
+        result, meta = request_prediction(api_url, "sim-admin")
+    assert not meta['fell_back']
+    assert result['error'].startswith("HTTP error: 500")
+
+
+def test_invalid_key_maps_to_auth_error(simulator):
+    _, api_url = simulator
+    result, meta = request_prediction(api_url, "not-a-key")
+    assert result == {"error": "Invalid API key", "auth_error": True}
+    assert meta['status_code'] == 401
+
+
+def test_guest_limit_maps_to_guest_limit(simulator):
+    _, api_url = simulator
+    outcomes = [request_prediction(api_url, None) for _ in range(4)]
+    assert all('error' not in result and meta['guest_counted'] for result, meta in outcomes[:3])
+    result, meta = outcomes[3]
+    assert result['guest_limit'] and "Free trial limit" in result['error']
+    # The backend counts a refused guest request too
+    assert meta['status_code'] == 403 and meta['guest_counted']
+
+
+def test_other_403_maps_to_auth_error():
+    sim, api_url = start_simulator({"forecast.predict": {"errors": [
+        {"rate": 1, "status": 403, "detail": "API key disabled"}]}})
+    with sim:
+        result, _ = request_prediction(api_url, "sim-user")
+    assert result == {"error": "API key disabled", "auth_error": True}
+
+
+def test_rate_limit_maps_to_rate_limit_with_retry_after():
+    sim, api_url = start_simulator({"forecast.predict": {"errors": [
+        {"rate": 1, "status": 429, "retry_after": 7, "detail": "Rate limit exceeded (10/minute)"}]}})
+    with sim:
+        result, meta = request_prediction(api_url, "sim-user")
+    assert result == {"error": "Rate limit exceeded (10/minute)", "rate_limit": True}
+    assert meta['retry_after'] == 7
+
+
+def test_worker_handle_lifecycle(simulator):
+    _, api_url = simulator
+    worker = PredictionWorker(api_url, max_workers=2)
+    handle = worker.submit("sim-admin", "BTCUSDT", "5m")
+    assert {'future', 'submitted_at', 'symbol', 'interval'} <= set(handle)
+    result, meta = handle['future'].result(timeout=10)
+    assert 'error' not in result and meta['cached'] is False
+
+    # The same candle is answered from the cache without touching the pool
+    again = worker.submit("sim-admin", "BTCUSDT", "5m")
+    assert again['future'].done()
+    cached_result, cached_meta = again['future'].result()
+    assert cached_result == result and cached_meta['cached'] and not cached_meta['guest_counted']
+    assert worker.submitted == 2
+
+
+def test_worker_batch_handle(simulator):
+    _, api_url = simulator
+    worker = PredictionWorker(api_url)
+    handle = worker.submit_batch("sim-admin", ["BTCUSDT", "ETHUSDT"], ["1m", "5m"])
+    assert handle['pairs'] == 4
+    grid = handle['future'].result(timeout=20)
+    assert len(grid) == 4
+    assert (grid['status'] == 'ok').all()
+
+
+def test_worker_surfaces_errors_through_the_future(simulator):
+    _, api_url = simulator
+    worker = PredictionWorker(api_url, use_cache=False)
+    result, _ = worker.submit("not-a-key")['future'].result(timeout=10)
+    assert result['auth_error']
+
+
+def test_cache_key_rolls_over_when_a_candle_opens():
+    candle = 1_700_000_100  # a 5m boundary in seconds
+    assert candle % 300 == 0
+    key = PredictionCache.key("BTCUSDT", "5m", True, now=candle)
+    assert PredictionCache.key("BTCUSDT", "5m", True, now=candle + 299.9) == key
+    assert PredictionCache.key("BTCUSDT", "5m", True, now=candle + 300) != key
+    assert PredictionCache.key("BTCUSDT", "5m", False, now=candle) != key
+    assert PredictionCache.key("BTCUSDT", "1m", True, now=candle) != key
+
+
+def test_closed_candle_entries_are_pruned(monkeypatch):
+    cache = PredictionCache()
+    clock = {'now': 1_700_000_100.0}
+    monkeypatch.setattr(forecast_client, 'time', SimpleNamespace(time=lambda: clock['now']))
+    old_key = PredictionCache.key("BTCUSDT", "1m", True)
+    cache.get_or_fetch(old_key, lambda: ({'signal': 'old'}, {}))
+    clock['now'] += 60
+    new_key = PredictionCache.key("BTCUSDT", "1m", True)
+    assert new_key != old_key
+    result, meta = cache.get_or_fetch(new_key, lambda: ({'signal': 'new'}, {}))
+    assert result == {'signal': 'new'} and meta['cached'] is False
+    assert cache.get(old_key) is None
+    assert cache.stats()['size'] == 1
+
+
+def test_errors_are_not_cached():
+    cache = PredictionCache()
+    key = PredictionCache.key("BTCUSDT", "1m", True)
+    outcomes = iter([({'error': "Rate limit exceeded", 'rate_limit': True}, {}), ({'signal': 'up'}, {})])
+    result, _ = cache.get_or_fetch(key, lambda: next(outcomes))
+    assert result['rate_limit']
+    assert cache.get(key) is None
+    result, meta = cache.get_or_fetch(key, lambda: next(outcomes))
+    assert result == {'signal': 'up'} and meta['cached'] is False
+    assert cache.get(key)[0] == {'signal': 'up'}
+
+
+def test_concurrent_identical_predictions_make_one_api_call():
+    sim, api_url = start_simulator({"forecast.predict.v1_1": {"latency": 300}})
+    with sim:
+        worker = PredictionWorker(api_url, max_workers=4)
+        handles = [worker.submit("sim-admin", "BTCUSDT", "1h") for _ in range(4)]
+        outcomes = [handle['future'].result(timeout=10) for handle in handles]
+        requests_made = sim.stats()['forecast.predict.v1_1']['requests']
+    assert requests_made == 1
+    assert all(result == outcomes[0][0] for result, _ in outcomes)
+    # One caller paid for the request, the others were served from it
+    assert sorted(meta['cached'] for _, meta in outcomes) == [False, True, True, True]
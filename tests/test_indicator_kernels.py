@@ -0,0 +1,45 @@
+"""
+NumPy indicator kernels against the pandas reference implementation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import candle_walk
+from data_fetcher import BinanceDataFetcher
+from indicator_kernels import compute_indicators
+
+
+def candle_frame(count, seed=1):
+    walk = candle_walk(count, seed=seed)
+    return pd.DataFrame({'close': walk['close'], 'volume': walk['volume']},
+                        index=pd.to_datetime(walk['open_ms'], unit='ms'))
+
+
+@pytest.mark.parametrize("count", [1, 30, 250, 10_000])
+def test_numpy_backend_matches_pandas(count):
+    df = candle_frame(count)
+    expected = BinanceDataFetcher.calculate_technical_indicators(df, backend="pandas")
+    actual = BinanceDataFetcher.calculate_technical_indicators(df, backend="numpy")
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-7, equal_nan=True, err_msg=column)
+
+
+def test_float32_kernel_stays_close():
+    df = candle_frame(5_000)
+    exact = compute_indicators(df['close'].to_numpy(), df['volume'].to_numpy())
+    single = compute_indicators(df['close'].to_numpy(), df['volume'].to_numpy(), dtype=np.float32)
+    for name, values in single.items():
+        assert values.dtype == np.float32
+        np.testing.assert_allclose(values, exact[name], rtol=1e-4, atol=1e-2, equal_nan=True, err_msg=name)
+
+
+def test_missing_prices_use_the_pandas_path():
+    df = candle_frame(300)
+    df.iloc[100, df.columns.get_loc('close')] = np.nan
+    expected = BinanceDataFetcher.calculate_technical_indicators(df, backend="pandas")
+    actual = BinanceDataFetcher.calculate_technical_indicators(df, backend="numpy")
+    pd.testing.assert_frame_equal(actual, expected)
@@ -0,0 +1,66 @@
+"""
+get_bitcoin_data request coalescing is keyed on every fetch argument
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import data_fetcher
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replace the source race with one that blocks until released and counts calls"""
+    state = {'calls': 0, 'release': threading.Event(), 'lock': threading.Lock()}
+
+    def fake_race(candidates, hedge_delay):
+        with state['lock']:
+            state['calls'] += 1
+        state['release'].wait(5)
+        return "Binance", pd.DataFrame({'close': [1.0, 2.0]})
+
+    monkeypatch.setattr(data_fetcher, 'race_sources', fake_race)
+    monkeypatch.setattr(data_fetcher, 'kline_flight', data_fetcher.SingleFlight())
+    return state
+
+
+def call_concurrently(kwargs_list, state):
+    results = [None] * len(kwargs_list)
+
+    def caller(i, kwargs):
+        results[i] = data_fetcher.get_bitcoin_data(interval="5m", limit=2, with_indicators=False, **kwargs)
+
+    threads = [threading.Thread(target=caller, args=item) for item in enumerate(kwargs_list)]
+    for thread in threads:
+        thread.start()
+    stats = data_fetcher.kline_flight.stats
+    deadline = time.time() + 5
+    while stats()['executions'] + stats()['coalesced'] < len(kwargs_list) and time.time() < deadline:
+        time.sleep(0.005)
+    state['release'].set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_identical_calls_share_one_fetch(upstream):
+    results = call_concurrently([{}, {}, {}], upstream)
+    assert upstream['calls'] == 1
+    assert data_fetcher.kline_flight.stats()['coalesced'] == 2
+    # Each caller gets its own copy
+    assert results[0] is not results[1]
+    assert all(df.attrs['source'] == "Binance" for df in results)
+
+
+@pytest.mark.parametrize("kwargs", [
+    [{'use_store': True}, {'use_store': False}],
+    [{'hedge_delay': 1.0}, {'hedge_delay': 0}],
+    [{'hedge_delay': 1.0}, {'hedge_delay': None}],
+])
+def test_calls_differing_in_fetch_options_are_not_merged(upstream, kwargs):
+    call_concurrently(kwargs, upstream)
+    assert upstream['calls'] == 2
+    assert data_fetcher.kline_flight.stats()['coalesced'] == 0
@@ -0,0 +1,86 @@
+"""
+KlineStream against the local WebSocket stand-in in benchmarks/simulator.py
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("websocket")
+
+from benchmarks.simulator import UpstreamSimulator
+from data_fetcher import BinanceDataFetcher, INTERVAL_MS
+from indicator_engine import INDICATOR_COLUMNS
+from kline_stream import KlineStream
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    sim = UpstreamSimulator({"routes": {"binance.ws": {"ws_push_interval": 0.1}}}).start()
+    monkeypatch.setattr(BinanceDataFetcher, "BASE_URL", sim.env()['BINANCE_API_URL'])
+    yield sim
+    sim.stop()
+
+
+def test_reconnects_after_drop(simulator):
+    stream = KlineStream(intervals=['1m'], history=100, ws_url=simulator.ws_url, max_backoff=2).start()
+    try:
+        assert wait_for(lambda: stream.connected and stream.ticker)
+        assert simulator.drop_streams() == 1
+        assert wait_for(lambda: stream.reconnects == 1 and stream.connected)
+        assert wait_for(lambda: simulator.stream_count() == 1)
+        assert len(stream.series['1m']) == 100
+    finally:
+        stream.stop()
+
+
+def test_gap_is_backfilled_and_indicators_match(simulator):
+    step = INTERVAL_MS['1m']
+    seeded_until = int(time.time() * 1000) - 5 * step
+    calls = []
+
+    def fetch_klines(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            # The seed happened five candles ago, before the connection went down
+            kwargs['end_time'] = seeded_until
+        return BinanceDataFetcher.fetch_historical_klines(**kwargs)
+
+    # The first connection attempt is refused, so the stream backs off and backfills
+    simulator.set_scenario({"routes": {"binance.ws": {
+        "ws_push_interval": 0.1, "outages": [{"start": 0, "end": 0.5, "status": 451}]}}})
+    stream = KlineStream(intervals=['1m'], history=300, ws_url=simulator.ws_url, fetch_klines=fetch_klines,
+                         max_backoff=2).start()
+    try:
+        assert wait_for(lambda: stream.connected and stream.reconnects >= 1)
+        assert wait_for(lambda: stream.series['1m'].last_open_ms() >= int(time.time() * 1000) // step * step - step)
+
+        backfill = calls[1]
+        assert backfill['start_time'] <= seeded_until
+        assert backfill['limit'] >= 6
+
+        df = stream.frame('1m', with_indicators=True)
+        opens = df.index.asi8 // 10**6
+        assert (np.diff(opens) == step).all(), "series has a gap"
+
+        # Incrementally maintained indicators equal a batch recompute over the same candles
+        expected = BinanceDataFetcher.calculate_technical_indicators(df.drop(columns=INDICATOR_COLUMNS))
+        for column in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(df[column].to_numpy(), expected[column].to_numpy(),
+                                       rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+
+        # Candles held by the stream match the REST history
+        rest = BinanceDataFetcher.fetch_historical_klines(limit=len(df) - 1, end_time=int(opens[-2]))
+        np.testing.assert_allclose(df['close'].iloc[:-1].to_numpy(), rest['close'].to_numpy())
+    finally:
+        stream.stop()
@@ -0,0 +1,59 @@
+"""
+Typed parse_klines against the original DataFrame(...).astype(...) decoding
+"""
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import binance_klines, candle_walk
+from data_fetcher import parse_klines
+
+
+def reference_parse(rows):
+    """The decoding fetch_historical_klines used before parse_klines"""
+    df = pd.DataFrame(rows, columns=[
+        'timestamp', 'open', 'high', 'low', 'close', 'volume',
+        'close_time', 'quote_volume', 'trades',
+        'taker_buy_base', 'taker_buy_quote', 'ignore'
+    ])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+    for col in ['open', 'high', 'low', 'close', 'volume', 'quote_volume', 'taker_buy_base', 'taker_buy_quote']:
+        df[col] = df[col].astype(float)
+    df.set_index('timestamp', inplace=True)
+    return df.drop(columns='ignore')
+
+
+def test_columns_and_dtypes():
+    df = parse_klines(binance_klines(candle_walk(50)))
+    assert 'ignore' not in df.columns
+    assert df.index.name == 'timestamp'
+    assert df.index.dtype == 'datetime64[ns]'
+    assert df['close_time'].dtype == 'datetime64[ns]'
+    assert df['trades'].dtype == np.int32
+    for column in ('open', 'high', 'low', 'close', 'volume', 'quote_volume', 'taker_buy_base', 'taker_buy_quote'):
+        assert df[column].dtype == np.float64, column
+
+
+def test_values_match_the_reference_parse():
+    rows = binance_klines(candle_walk(1000))
+    expected = reference_parse(rows)
+    actual = parse_klines(rows)
+    pd.testing.assert_frame_equal(actual, expected.astype({'trades': np.int32}))
+
+
+def test_float32_prices():
+    rows = binance_klines(candle_walk(1000))
+    expected = reference_parse(rows)
+    actual = parse_klines(rows, price_dtype=np.float32)
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        assert actual[column].dtype == np.float32
+        np.testing.assert_allclose(actual[column], expected[column], rtol=1e-6)
+    pd.testing.assert_index_equal(actual.index, expected.index)
+
+
+def test_empty_payload():
+    df = parse_klines([])
+    assert df.empty
+    assert 'ignore' not in df.columns
+    assert df['trades'].dtype == np.int32
@@ -0,0 +1,153 @@
+"""
+Perf trace spans, annotations, rerun lifecycle and histogram percentiles
+"""
+
+import threading
+
+import pytest
+
+import perf_trace
+from perf_trace import (Histogram, annotate, begin_rerun, current_rerun, end_rerun, histograms,
+                        recent_reruns, span)
+
+
+@pytest.fixture(autouse=True)
+def fresh_trace(monkeypatch):
+    """Tracing on, empty registry and no rerun/span stack left over from another test"""
+    monkeypatch.setattr(perf_trace, 'PERF_TRACE_ENABLED', True)
+    monkeypatch.setattr(perf_trace, '_local', threading.local())
+    perf_trace.reset()
+    yield
+    perf_trace.reset()
+
+
+def test_nested_spans_record_depth():
+    rerun = begin_rerun("test")
+    with span("outer") as outer:
+        with span("middle") as middle:
+            with span("inner") as inner:
+                pass
+        with span("sibling") as sibling:
+            pass
+    with span("after") as after:
+        pass
+    end_rerun()
+
+    assert (outer.depth, middle.depth, inner.depth, sibling.depth, after.depth) == (0, 1, 2, 1, 0)
+    # Spans are added as they finish
+    assert [s.name for s in rerun.spans] == ["inner", "middle", "sibling", "outer", "after"]
+    assert all(s.duration_ms is not None and s.duration_ms >= 0 for s in rerun.spans)
+
+
+def test_annotate_sets_the_innermost_open_span():
+    annotate(cache='ignored')  # No open span: no-op
+    with span("outer", source='Binance') as outer:
+        with span("inner") as inner:
+            annotate(cache='miss')
+        annotate(cache='hit')
+
+    assert inner.attrs == {'cache': 'miss'}
+    assert outer.attrs == {'source': 'Binance', 'cache': 'hit'}
+    rows = {row['name']: row for row in histograms()}
+    assert rows['inner']['cache'] == {'miss': 1}
+    assert rows['outer']['cache'] == {'hit': 1}
+    assert rows['outer']['source'] == {'Binance': 1}
+
+
+def test_exception_is_tagged_and_reraised():
+    with pytest.raises(ValueError):
+        with span("failing") as failing:
+            raise ValueError("boom")
+    assert failing.attrs['error'] == 'ValueError'
+    # The stack unwound, so the next span is top level again
+    with span("next") as following:
+        pass
+    assert following.depth == 0
+    row, = [row for row in histograms() if row['name'] == 'failing']
+    assert row['errors'] == 1
+
+
+def test_begin_rerun_closes_an_interrupted_rerun():
+    first = begin_rerun("first")
+    with span("before_stop"):
+        pass
+    # st.stop() / st.rerun(): the script never reaches end_rerun()
+    second = begin_rerun("second")
+
+    assert first.status == "interrupted"
+    assert first.total_ms is not None
+    assert recent_reruns() == [first]
+    assert current_rerun() is second
+
+    with span("after_restart") as after:
+        pass
+    assert [s.name for s in first.spans] == ["before_stop"]
+    assert second.spans == [after]
+
+    assert end_rerun() is second
+    assert second.status == "ok"
+    assert end_rerun() is None
+    assert recent_reruns() == [first, second]
+
+
+def test_begin_rerun_drops_spans_left_open_by_the_interrupted_rerun():
+    begin_rerun("first")
+    stuck = span("stuck")
+    stuck.__enter__()
+    begin_rerun("second")
+    with span("fresh") as fresh:
+        pass
+    assert fresh.depth == 0
+
+
+def test_spans_on_other_threads_stay_out_of_the_rerun():
+    rerun = begin_rerun("test")
+
+    def background():
+        with span("background"):
+            pass
+    worker = threading.Thread(target=background)
+    worker.start()
+    worker.join()
+    end_rerun()
+
+    assert rerun.spans == []
+    assert [row['name'] for row in histograms()] == ["background"]
+
+
+def test_histogram_percentiles_are_bucket_upper_bounds():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+
+    for ms in range(1, 101):
+        histogram.record(float(ms))
+
+    # Four buckets per doubling: the reported bound is at most 2 ** 0.25 above the true value
+    for q, exact in ((50, 50.0), (90, 90.0), (99, 99.0)):
+        value = histogram.percentile(q)
+        assert exact <= value <= exact * 2 ** 0.25, q
+    assert histogram.percentile(100) == 100.0
+    assert histogram.count == 100
+    assert histogram.max_ms == 100.0
+    assert histogram.total_ms == sum(range(1, 101))
+
+
+def test_histogram_percentile_is_capped_at_the_max():
+    histogram = Histogram()
+    histogram.record(3.0)
+    assert histogram.percentile(50) == 3.0
+    assert histogram.percentile(99) == 3.0
+
+
+def test_histograms_rows():
+    for _ in range(3):
+        with span("stage", cache='hit'):
+            pass
+    with span("stage", cache='miss'):
+        pass
+    row, = histograms()
+    assert row['name'] == "stage"
+    assert row['count'] == 4
+    assert row['cache'] == {'hit': 3, 'miss': 1}
+    assert row['errors'] == 0
+    assert row['p50_ms'] <= row['p90_ms'] <= row['p99_ms'] <= row['max_ms']
@@ -0,0 +1,87 @@
+"""
+A patched price chart matches one built from scratch after the forming candle moves
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import binance_klines, candle_walk
+from chart_lod import LOD_MAX_BARS
+from data_fetcher import BinanceDataFetcher, parse_klines
+from price_chart import INDICATOR_TRACE_COLUMNS, chart_fingerprint, create_price_chart, update_last_candle
+
+
+def frames(count):
+    """Two frames with the same candles except the forming one, indicators included"""
+    raw = parse_klines(binance_klines(candle_walk(count, seed=7)))
+    before = BinanceDataFetcher.calculate_technical_indicators(raw.copy())
+    moved = raw.copy()
+    close = moved['close'].iloc[-1] * 1.004
+    moved.iloc[-1, moved.columns.get_loc('close')] = close
+    moved.iloc[-1, moved.columns.get_loc('high')] = max(moved['high'].iloc[-1], close)
+    after = BinanceDataFetcher.calculate_technical_indicators(moved)
+    return before, after
+
+
+def assert_same(actual, expected, path="fig"):
+    """Recursive to_dict() comparison that handles the NumPy arrays in trace data"""
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict), path
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_same(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_same(a, e, f"{path}[{i}]")
+    elif isinstance(expected, np.ndarray):
+        np.testing.assert_array_equal(actual, expected, err_msg=path)
+    else:
+        assert actual == expected, path
+
+
+PREDICTIONS = {
+    'none': None,
+    'marker': {
+        'suggestion': {'action': 'BUY', 'conviction': 'high', 'risk_level': 'low'},
+        'confidence': 0.7
+    },
+    'projection': {
+        'suggestion': {'action': 'SELL', 'conviction': 'medium', 'risk_level': 'medium'},
+        'confidence': 0.6,
+        'trend': {'short_term': 'down', 'long_term': 'up'},
+        'current_price': 37_000.0,
+        'next_periods': [{'period': p, 'estimated_price': 37_000.0 - 10 * p} for p in (1, 2, 3)]
+    }
+}
+
+
+@pytest.mark.parametrize("count", [200, LOD_MAX_BARS * 3], ids=["raw", "lod"])
+@pytest.mark.parametrize("prediction", list(PREDICTIONS))
+def test_patched_figure_equals_rebuilt(count, prediction):
+    prediction_result = PREDICTIONS[prediction]
+    before, after = frames(count)
+    assert chart_fingerprint(before)[:3] == chart_fingerprint(after)[:3]
+    assert chart_fingerprint(before) != chart_fingerprint(after)
+
+    fig = create_price_chart(before, prediction_result=prediction_result)
+    update_last_candle(fig, after, 1 + len(INDICATOR_TRACE_COLUMNS), prediction_result)
+    expected = create_price_chart(after, prediction_result=prediction_result)
+
+    assert_same(fig.to_dict(), expected.to_dict())
+
+
+def test_patched_figure_without_indicators():
+    before, after = frames(200)
+    fig = create_price_chart(before, show_indicators=False)
+    update_last_candle(fig, after, 1)
+    assert_same(fig.to_dict(), create_price_chart(after, show_indicators=False).to_dict())
+
+
+def test_patch_actually_moves_the_last_candle():
+    before, after = frames(200)
+    fig = create_price_chart(before)
+    stale = fig.to_dict()
+    update_last_candle(fig, after, 1 + len(INDICATOR_TRACE_COLUMNS))
+    with pytest.raises(AssertionError):
+        assert_same(fig.to_dict(), stale)
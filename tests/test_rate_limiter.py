@@ -0,0 +1,74 @@
+"""
+WeightRateLimiter refill, server weight sync and blocking
+"""
+
+import threading
+import time
+
+import pytest
+
+from rate_limiter import RateLimitTimeout, WeightRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_refills_in_proportion_to_elapsed_time():
+    clock = FakeClock()
+    limiter = WeightRateLimiter("Test", capacity=1200, period=60.0, clock=clock)
+    limiter.acquire(1000)
+    assert limiter.available() == pytest.approx(200)
+    clock.now += 15
+    assert limiter.available() == pytest.approx(500)
+    clock.now += 600
+    assert limiter.available() == pytest.approx(1200)
+
+
+def test_used_weight_header_lowers_the_bucket():
+    clock = FakeClock()
+    limiter = WeightRateLimiter("Test", capacity=1200, used_weight_header="X-MBX-USED-WEIGHT-1M", clock=clock)
+    limiter.acquire(10)
+    # Another process on the same IP has used most of the minute's weight
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "1100"})
+    assert limiter.available() == pytest.approx(100)
+    # The server never raises the bucket above the local count
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "5"})
+    assert limiter.available() == pytest.approx(100)
+    # Used weight above capacity empties it
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "5000"})
+    assert limiter.available() == 0
+
+
+@pytest.mark.parametrize("headers", [None, {}, {"X-MBX-USED-WEIGHT-1M": "n/a"}, {"Other": "900"}])
+def test_missing_or_malformed_headers_are_ignored(headers):
+    limiter = WeightRateLimiter("Test", capacity=1200, used_weight_header="X-MBX-USED-WEIGHT-1M",
+                                clock=FakeClock())
+    limiter.update_from_headers(headers)
+    assert limiter.available() == 1200
+
+
+def test_timeout_when_over_capacity():
+    limiter = WeightRateLimiter("Test", capacity=10, period=60.0)
+    limiter.acquire(10)
+    started = time.monotonic()
+    with pytest.raises(RateLimitTimeout, match="rate limit"):
+        limiter.acquire(5, timeout=0.1)
+    assert time.monotonic() - started >= 0.1
+
+
+def test_blocks_until_refilled():
+    limiter = WeightRateLimiter("Test", capacity=10, period=0.5)
+    limiter.acquire(10)
+    done = threading.Event()
+    waiter = threading.Thread(target=lambda: (limiter.acquire(5), done.set()))
+    started = time.monotonic()
+    waiter.start()
+    assert not done.wait(0.1)
+    assert done.wait(2.0)
+    # 5 of 10 weight refills in a quarter of the period
+    assert time.monotonic() - started >= 0.2
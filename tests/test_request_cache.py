@@ -0,0 +1,148 @@
+"""
+SingleFlight coalescing and TTLCache expiry
+"""
+
+import threading
+import time
+
+import pytest
+
+import request_cache
+from request_cache import SingleFlight, TTLCache
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def run_concurrently(flight, key, fn, count):
+    """Start count callers for key while the first is held in flight; returns (threads, results, errors)"""
+    results, errors = [None] * count, [None] * count
+
+    def caller(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_execute_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {'price': 1}
+
+    threads, results, errors = run_concurrently(flight, 'ticker', fetch, 8)
+    assert wait_for(lambda: flight.stats()['coalesced'] == 7)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert errors == [None] * 8
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'executions': 1, 'coalesced': 7, 'in_flight': 0}
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    error = ValueError("upstream down")
+
+    def fetch():
+        release.wait(5)
+        raise error
+
+    threads, results, errors = run_concurrently(flight, 'ticker', fetch, 5)
+    assert wait_for(lambda: flight.stats()['coalesced'] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert all(e is error for e in errors)
+
+
+def test_different_keys_are_not_merged():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.stats()['executions'] == 2
+
+
+class FakeTime:
+    now = 1000.0
+
+    @classmethod
+    def monotonic(cls):
+        return cls.now
+
+    @classmethod
+    def time(cls):
+        return 1_700_000_000.0 + cls.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(request_cache, 'time', FakeTime)
+    return FakeTime
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=5)
+    values = iter(range(10))
+    first, fetched_at = cache.get_or_fetch('k', lambda: next(values))
+    clock.now += 4.9
+    assert cache.get_or_fetch('k', lambda: next(values)) == (first, fetched_at)
+    clock.now += 0.2
+    second, refetched_at = cache.get_or_fetch('k', lambda: next(values))
+    assert (first, second) == (0, 1)
+    assert refetched_at > fetched_at
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['fetches']) == (1, 2, 2)
+
+
+def test_errors_are_not_cached(clock):
+    cache = TTLCache(ttl=5)
+
+    def failing():
+        raise ValueError("down")
+
+    with pytest.raises(ValueError):
+        cache.get_or_fetch('k', failing)
+    assert cache.get_or_fetch('k', lambda: 'ok')[0] == 'ok'
+    assert cache.stats()['size'] == 1
+
+
+def test_concurrent_misses_fetch_once():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('k', fetch)[0]))
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    assert wait_for(lambda: cache.stats()['coalesced'] == 5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == [42] * 6
@@ -0,0 +1,73 @@
+"""
+resample_klines against pandas resampling and its forming-bar flag
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from resampler import AGGREGATIONS, resample_klines
+
+MINUTE_MS = 60_000
+
+
+def minute_candles(start_ms, count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 10, count))
+    open_ = np.append(close[0], close[:-1])
+    open_ms = start_ms + MINUTE_MS * np.arange(count)
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 5, count),
+        'low': np.minimum(open_, close) - rng.uniform(0, 5, count),
+        'close': close,
+        'volume': rng.uniform(1, 10, count),
+        'close_time': pd.to_datetime(open_ms + MINUTE_MS - 1, unit='ms'),
+        'quote_volume': rng.uniform(1e4, 1e5, count),
+        'trades': rng.integers(10, 100, count),
+        'taker_buy_base': rng.uniform(0, 1, count),
+        'taker_buy_quote': rng.uniform(0, 1e4, count)
+    }, index=pd.DatetimeIndex(pd.to_datetime(open_ms, unit='ms'), name='timestamp'))
+    return df
+
+
+def test_partial_last_while_bar_is_forming():
+    bar_open = 1_700_000_100_000 // 300_000 * 300_000
+    # Three of five minutes of the last 5m bar exist; the third is still forming
+    df = minute_candles(bar_open - 10 * MINUTE_MS, 13)
+    now_ms = bar_open + 2 * MINUTE_MS + 30_000
+    assert resample_klines(df, '5m', now_ms=now_ms).attrs['partial_last']
+
+
+def test_last_bar_complete_once_its_last_minute_closed():
+    bar_open = 1_700_000_100_000 // 300_000 * 300_000
+    df = minute_candles(bar_open - 10 * MINUTE_MS, 15)
+    # The last 1m candle is still forming: the 5m bar is not final yet
+    assert resample_klines(df, '5m', now_ms=bar_open + 4 * MINUTE_MS + 1).attrs['partial_last']
+    # ... and once it closed the bar is complete
+    assert not resample_klines(df, '5m', now_ms=bar_open + 5 * MINUTE_MS).attrs['partial_last']
+
+
+@pytest.mark.parametrize("interval, rule", [('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('4h', '4h')])
+def test_matches_pandas_resample(interval, rule):
+    # Start part-way through a 4h bar so the incomplete first bar is dropped
+    df = minute_candles(1_700_000_040_000, 3_000, seed=4)
+    out = resample_klines(df, interval, now_ms=int(df.index.asi8[-1] // 10**6) + MINUTE_MS)
+    expected = df.drop(columns='close_time').resample(rule, origin='epoch').agg(AGGREGATIONS)
+    expected = expected[expected.index >= df.index[0]]
+    expected['close_time'] = expected.index + pd.Timedelta(rule) - pd.Timedelta(milliseconds=1)
+    expected = expected[df.columns]
+    assert out.attrs['partial_last'] == (df.index[-1] + pd.Timedelta('1min') < out.index[-1] + pd.Timedelta(rule))
+    pd.testing.assert_frame_equal(out, expected, check_freq=False, check_dtype=False)
+
+
+def test_keeps_incomplete_first_bar_when_asked():
+    df = minute_candles(1_700_000_040_000, 30)
+    out = resample_klines(df, '15m', drop_incomplete_first=False)
+    assert out.index[0] < df.index[0]
+    assert out['volume'].sum() == pytest.approx(df['volume'].sum())
+
+
+def test_rejects_non_multiple_intervals():
+    with pytest.raises(Exception):
+        resample_klines(minute_candles(1_700_000_040_000, 10), '1m', base_interval='5m')
@@ -0,0 +1,27 @@
+"""
+The upstream simulator agrees with the client's view of the upstream APIs
+"""
+
+import requests
+
+from benchmarks.simulator import UpstreamSimulator
+from data_fetcher import BinanceDataFetcher
+
+
+def test_klines_weight_matches_the_client():
+    with UpstreamSimulator({}) as sim:
+        url = f"{sim.env()['BINANCE_API_URL']}/klines"
+        used = 0
+        for limit in (50, 200, 600, 1000):
+            response = requests.get(url, params={'symbol': 'BTCUSDT', 'interval': '1m', 'limit': limit}, timeout=5)
+            assert len(response.json()) == limit
+            previous, used = used, int(response.headers['X-MBX-USED-WEIGHT-1M'])
+            # The weight window restarts on each minute boundary
+            assert used - previous == BinanceDataFetcher.KLINES_WEIGHT or used == BinanceDataFetcher.KLINES_WEIGHT
+
+
+def test_env_points_the_live_stream_at_the_simulator():
+    with UpstreamSimulator({}) as sim:
+        env = sim.env()
+        assert env['BINANCE_WS_URL'] == sim.ws_url
+        assert env['BINANCE_WS_URL'].startswith("ws://127.0.0.1:")
@@ -0,0 +1,112 @@
+"""
+race_sources hedging, winner selection and failure handling
+"""
+
+import threading
+import time
+
+import pytest
+
+import data_fetcher
+import source_race
+from source_race import AllSourcesFailed, race_sources
+
+
+class Source:
+    """Callable source that records when it started, sleeps, then returns or raises"""
+
+    def __init__(self, value=None, delay=0.0, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.started = None
+        self.finished = threading.Event()
+
+    def __call__(self):
+        self.started = time.monotonic()
+        time.sleep(self.delay)
+        self.finished.set()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def race(sources, hedge_delay):
+    started = time.monotonic()
+    result = race_sources(sources, hedge_delay=hedge_delay, use_breakers=False)
+    return result, started
+
+
+def test_hedge_fires_after_delay():
+    primary, backup = Source('a', delay=0.5), Source('b')
+    (name, value), started = race([("A", primary), ("B", backup)], hedge_delay=0.1)
+    assert (name, value) == ("B", 'b')
+    assert 0.1 <= backup.started - started < 0.3
+
+
+def test_fast_primary_never_hedges():
+    primary, backup = Source('a', delay=0.01), Source('b')
+    (name, value), _ = race([("A", primary), ("B", backup)], hedge_delay=0.5)
+    assert (name, value) == ("A", 'a')
+    assert backup.started is None
+
+
+def test_first_success_wins_and_stragglers_are_ignored():
+    slow, fast = Source('slow', delay=0.3), Source('fast', delay=0.05)
+    (name, value), _ = race([("A", slow), ("B", fast)], hedge_delay=0)
+    assert (name, value) == ("B", 'fast')
+    # The straggler still finishes in the background without affecting the result
+    assert slow.finished.wait(1.0)
+
+
+def test_failure_hedges_immediately():
+    failing, backup = Source(delay=0.05, error=ValueError("down")), Source('b')
+    (name, value), started = race([("A", failing), ("B", backup)], hedge_delay=5.0)
+    assert (name, value) == ("B", 'b')
+    assert backup.started - started < 1.0
+
+
+def test_all_sources_failed_lists_errors_in_preference_order():
+    sources = [("A", Source(delay=0.1, error=ValueError("a down"))),
+               ("B", Source(error=KeyError("b down"))),
+               ("C", Source(delay=0.05, error=RuntimeError("c down")))]
+    with pytest.raises(AllSourcesFailed) as info:
+        race_sources(sources, hedge_delay=0, use_breakers=False)
+    assert list(info.value.errors) == ["A", "B", "C"]
+    assert isinstance(info.value.errors["B"], KeyError)
+
+
+def test_zero_delay_starts_every_source_at_once():
+    sources = [Source('a', delay=0.1), Source('b', delay=0.2), Source('c', delay=0.2)]
+    (name, _), started = race([(s.value.upper(), s) for s in sources], hedge_delay=0)
+    assert name == "A"
+    assert all(s.started - started < 0.1 for s in sources)
+
+
+def test_sequential_mode_only_falls_back_after_failure():
+    failing, backup, unused = Source(delay=0.2, error=ValueError("down")), Source('b', delay=0.1), Source('c')
+    (name, value), started = race([("A", failing), ("B", backup), ("C", unused)], hedge_delay=None)
+    assert (name, value) == ("B", 'b')
+    assert backup.started - started >= 0.2
+    assert unused.started is None
+
+
+@pytest.mark.parametrize("value, expected", [("off", None), ("sequential", None), ("", None),
+                                             ("0", 0.0), ("2.5", 2.5)])
+def test_hedge_delay_env(monkeypatch, value, expected):
+    monkeypatch.setenv("SOURCE_HEDGE_DELAY", value)
+    assert source_race._hedge_delay_from_env() == expected
+
+
+@pytest.mark.parametrize("limit, expected", [(500, 1.0), (1000, 1.0), (1500, 2.0), (2000, 2.0)])
+def test_paged_chart_fetches_scale_the_hedge_delay(monkeypatch, limit, expected):
+    seen = []
+
+    def fake_race(candidates, hedge_delay):
+        seen.append(hedge_delay)
+        raise AllSourcesFailed({})
+
+    monkeypatch.setattr(data_fetcher, 'race_sources', fake_race)
+    with pytest.raises(Exception):
+        data_fetcher.get_bitcoin_data(limit=limit, hedge_delay=1.0, coalesce=False, use_store=False)
+    assert seen == [expected]
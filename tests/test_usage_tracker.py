@@ -0,0 +1,99 @@
+"""
+Rate-limit header parsing and UsageTracker local updates / reconciliation
+"""
+
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from usage_tracker import UsageTracker, parse_rate_limit_headers
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, None),
+    ({'Content-Type': 'application/json'}, None),
+    ({'X-RateLimit-Limit': '10', 'X-RateLimit-Remaining': '7', 'X-RateLimit-Reset': '42'},
+     {'limit': 10, 'remaining': 7, 'reset': 42}),
+    ({'x-ratelimit-remaining': '3'}, {'remaining': 3}),
+    ({'RateLimit-Remaining': '5', 'RateLimit-Reset': '12.7'}, {'remaining': 5, 'reset': 12}),
+    ({'X-RateLimit-Remaining': 'unlimited', 'X-RateLimit-Limit': '10'}, {'limit': 10}),
+    ({'X-RateLimit-Remaining': '', 'X-RateLimit-Reset': 'soon'}, None),
+    # A malformed X- header falls back to the draft-standard spelling
+    ({'X-RateLimit-Remaining': 'n/a', 'RateLimit-Remaining': '4'}, {'remaining': 4}),
+    ({'X-RateLimit-Remaining': '6', 'RateLimit-Remaining': '4'}, {'remaining': 6}),
+])
+def test_parse_rate_limit_headers(headers, expected):
+    assert parse_rate_limit_headers(CaseInsensitiveDict(headers)) == expected
+
+
+class FakeServer:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, api_key):
+        self.calls += 1
+        return dict(self.responses[min(self.calls, len(self.responses)) - 1]) if self.responses else None
+
+
+def test_local_decrement_without_headers():
+    server = FakeServer({'user_type': 'authenticated', 'calls_remaining': 10})
+    tracker = UsageTracker("http://api", ttl=300, reconcile_delay=300, fetch=server)
+    assert tracker.get("key")['calls_remaining'] == 10
+    tracker.record_prediction("key")
+    tracker.record_prediction("key", count=2)
+    assert tracker.get("key")['calls_remaining'] == 7
+    assert server.calls == 1
+
+
+def test_headers_override_the_local_count():
+    server = FakeServer({'user_type': 'authenticated', 'calls_remaining': 10})
+    tracker = UsageTracker("http://api", ttl=300, reconcile_delay=300, fetch=server)
+    tracker.get("key")
+    tracker.record_prediction("key", rate_limit={'limit': 10, 'remaining': 4})
+    assert tracker.get("key")['calls_remaining'] == 4
+
+
+def test_admin_and_unknown_keys_are_not_decremented():
+    server = FakeServer({'user_type': 'admin'})
+    tracker = UsageTracker("http://api", ttl=300, reconcile_delay=300, fetch=server)
+    tracker.get("admin")
+    tracker.record_prediction("admin")
+    assert 'calls_remaining' not in tracker.get("admin")
+    # Never read: nothing to update
+    tracker.record_prediction("other")
+    assert tracker.stats()['keys'] == 1
+
+
+def test_reconcile_overwrites_the_local_decrement():
+    # Another session spent calls too: the server knows better than the local count
+    server = FakeServer({'user_type': 'authenticated', 'calls_remaining': 10},
+                        {'user_type': 'authenticated', 'calls_remaining': 2})
+    tracker = UsageTracker("http://api", ttl=300, reconcile_delay=0, fetch=server)
+    tracker.get("key")
+    tracker.record_prediction("key")
+    # The stale read returns the local value and reconciles in the background
+    assert tracker.get("key")['calls_remaining'] == 9
+    assert wait_for(lambda: tracker.stats()['fetches'] == 2)
+    assert tracker.get("key")['calls_remaining'] == 2
+    assert tracker.stats()['background_fetches'] == 1
+    assert tracker.stats()['local_updates'] == 0
+
+
+def test_invalid_keys_are_not_cached():
+    server = FakeServer()
+    tracker = UsageTracker("http://api", fetch=server)
+    assert tracker.get("bad") is None
+    assert tracker.get("bad") is None
+    assert server.calls == 2
+    assert tracker.get(None) is None
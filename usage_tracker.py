@@ -0,0 +1,178 @@
+"""
+Usage Tracker Module
+Per-API-key usage cache updated locally after predictions and reconciled in the background
+"""
+
+import os
+import threading
+import time
+
+from http_client import http_get
+from perf_trace import annotate
+from request_cache import SingleFlight
+
+
+# Seconds a server usage reading is trusted before a background refresh
+USAGE_CACHE_TTL = float(os.getenv("USAGE_CACHE_TTL", "60"))
+# Seconds after a local-only update before reconciling with the server
+USAGE_RECONCILE_DELAY = float(os.getenv("USAGE_RECONCILE_DELAY", "15"))
+
+
+def fetch_usage(api_url, api_key):
+    """
+    Read usage for an API key from /api-keys/usage
+
+    Returns:
+        Usage dict, or None if the key is invalid or the API is unreachable
+    """
+    try:
+        headers = {}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        response = http_get(f"{api_url}/api-keys/usage", endpoint="forecast.usage", headers=headers)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except Exception:
+        return None
+
+
+def parse_rate_limit_headers(headers):
+    """
+    Rate-limit state from X-RateLimit-* / RateLimit-* response headers
+
+    Returns:
+        dict with 'limit', 'remaining' and 'reset' (ints, when sent), or None
+    """
+    state = {}
+    for field in ('limit', 'remaining', 'reset'):
+        for name in (f"X-RateLimit-{field.title()}", f"RateLimit-{field.title()}"):
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                state[field] = int(float(value))
+                break
+            except ValueError:
+                # Malformed: try the other header spelling
+                continue
+    return state or None
+
+
+class UsageTracker:
+    """
+    Process-wide usage cache, one entry per API key
+
+    Reads return the cached entry immediately. An entry older than its
+    deadline is still served while a background thread reconciles it with
+    the server. Predictions update the cached counters locally (from
+    rate-limit headers when the API sends them, otherwise by decrementing
+    calls_remaining), so no extra request sits on the prediction path.
+    """
+
+    def __init__(self, api_url, ttl=USAGE_CACHE_TTL, reconcile_delay=USAGE_RECONCILE_DELAY, fetch=None):
+        """
+        Args:
+            api_url: Base URL of the forecast API
+            ttl: Seconds a server reading is trusted
+            reconcile_delay: Seconds after a local update before reconciling
+            fetch: Callable (api_key) -> usage dict or None (default: fetch_usage)
+        """
+        self.api_url = api_url
+        self.ttl = ttl
+        self.reconcile_delay = reconcile_delay
+        self.fetch = fetch or (lambda api_key: fetch_usage(api_url, api_key))
+
+        # api_key -> {'usage': dict, 'fetched_at': epoch, 'reconcile_at': epoch, 'local_updates': int}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.fetches = 0
+        self.background_fetches = 0
+
+    def refresh(self, api_key):
+        """Fetch usage from the server now (blocking) and cache it; None if invalid"""
+        annotate(cache='miss')
+
+        def load():
+            usage = self.fetch(api_key)
+            now = time.time()
+            with self._lock:
+                self.fetches += 1
+                if usage is not None:
+                    self._entries[api_key] = {
+                        'usage': usage,
+                        'fetched_at': now,
+                        'reconcile_at': now + self.ttl,
+                        'local_updates': 0
+                    }
+            return usage
+        return self._flight.do(api_key, load)
+
+    def get(self, api_key):
+        """
+        Cached usage for a key
+
+        Only the very first read for a key blocks on the server; later reads
+        return immediately and a stale entry is reconciled in the background.
+
+        Returns:
+            Usage dict (a copy), or None if the key is invalid/unreachable
+        """
+        if not api_key:
+            return None
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is not None:
+                usage = dict(entry['usage'])
+                stale = time.time() >= entry['reconcile_at']
+        if entry is None:
+            return self.refresh(api_key)
+        if stale:
+            self._reconcile_in_background(api_key)
+        return usage
+
+    def record_prediction(self, api_key, rate_limit=None, count=1):
+        """
+        Update the cached counters after predictions without a server round trip
+
+        Args:
+            api_key: Key the predictions were made with
+            rate_limit: parse_rate_limit_headers() result from the last response
+            count: Number of predictions the API served
+        """
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is None:
+                return
+            usage = entry['usage']
+            if rate_limit and 'remaining' in rate_limit:
+                usage['calls_remaining'] = rate_limit['remaining']
+            elif usage.get('user_type', 'authenticated') == 'authenticated' and \
+                    isinstance(usage.get('calls_remaining'), (int, float)):
+                usage['calls_remaining'] = max(0, usage['calls_remaining'] - count)
+            entry['local_updates'] += count
+            entry['reconcile_at'] = min(entry['reconcile_at'], time.time() + self.reconcile_delay)
+
+    def invalidate(self, api_key):
+        with self._lock:
+            self._entries.pop(api_key, None)
+
+    def _reconcile_in_background(self, api_key):
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is None:
+                return
+            # Push the deadline out so one stale entry triggers one refresh
+            entry['reconcile_at'] = time.time() + self.ttl
+            self.background_fetches += 1
+        threading.Thread(target=self.refresh, args=(api_key,), name="usage-reconcile", daemon=True).start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'keys': len(self._entries),
+                'fetches': self.fetches,
+                'background_fetches': self.background_fetches,
+                'local_updates': sum(entry['local_updates'] for entry in self._entries.values())
+            }